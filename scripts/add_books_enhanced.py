@@ -14,11 +14,52 @@ HOW TO USE:
 2. Run this script:
    python add_books_enhanced.py
 
+   Big books? Spread the pages over several processes:
+   python add_books_enhanced.py --workers 8
+
+   Extracted pages are cached in 'book_extraction_cache.sqlite', so a rerun
+   only extracts new or changed books. Use --no-cache to extract everything.
+
+   Want to know which pages are slow? Write per-page timings to a CSV:
+   python add_books_enhanced.py --no-cache --profile extraction_profile.csv
+
 3. Upload the generated CSV to Supabase
 """
 
 import os
 import csv
+import time
+import hashlib
+import sqlite3
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+# Pages per task when running with --workers. Small enough that slow pages
+# (big tables) even out across processes, big enough that opening the PDF
+# in each task stays cheap.
+PAGES_PER_TASK = 16
+
+# Bump a version whenever that extractor's output changes, so cached pages
+# from the old code are not reused.
+EXTRACTOR_VERSIONS = {
+    'pypdf2': 1,
+    'pdfplumber': 2,
+    'pdfplumber-full': 1,
+}
+
+# Table prefilter thresholds. pdfplumber's default table finder builds cells
+# from ruling lines, so a page needs at least two horizontal and two vertical
+# rules, with some characters inside the ruled area, to yield a real table.
+MIN_TABLE_RULES = 2
+MIN_TABLE_CHARS = 4
+
+DEFAULT_CACHE_FILE = "book_extraction_cache.sqlite"
+
+def page_content(page):
+    """Combine a page record's text and markdown tables into CSV content."""
+    if page['tables']:
+        return (page['text'] + "\n" + page['tables']).strip()
+    return page['text'].strip()
 
 def extract_with_basic_method():
     """Fallback to basic PyPDF2 if enhanced libraries aren't available."""
@@ -28,77 +69,319 @@ def extract_with_basic_method():
 
     from PyPDF2 import PdfReader
 
-    def extract_text_from_pdf(pdf_path):
+    def extract_text_from_pdf(pdf_path, page_indices=None):
         reader = PdfReader(pdf_path)
-        pages_text = []
+        if page_indices is None:
+            page_indices = range(len(reader.pages))
 
-        for page_num, page in enumerate(reader.pages, 1):
-            text = page.extract_text()
-            if text.strip():
-                pages_text.append({
-                    'page_number': page_num,
-                    'content': text.strip()
-                })
+        for index in page_indices:
+            yield {
+                'page_number': index + 1,
+                'text': reader.pages[index].extract_text() or "",
+                'tables': ""
+            }
 
-        return pages_text
+    def count_pages(pdf_path):
+        return len(PdfReader(pdf_path).pages)
 
+    extract_text_from_pdf.extractor = 'pypdf2'
+    extract_text_from_pdf.count_pages = count_pages
     return extract_text_from_pdf
 
-def extract_with_enhanced_method():
+def tables_to_markdown(tables):
+    """Format pdfplumber tables as markdown TABLE blocks."""
+    table_texts = []
+    for table in tables:
+        # Convert table to markdown format
+        if table and len(table) > 0:
+            # Header row
+            header = " | ".join(str(cell or "") for cell in table[0])
+            separator = " | ".join("---" for _ in table[0])
+
+            # Data rows
+            rows = []
+            for row in table[1:]:
+                if row:
+                    rows.append(" | ".join(str(cell or "") for cell in row))
+
+            # Combine into markdown table
+            markdown_table = f"\n\nTABLE:\n{header}\n{separator}\n" + "\n".join(rows) + "\n\n"
+            table_texts.append(markdown_table)
+
+    return "".join(table_texts)
+
+def looks_like_table_page(page):
+    """
+    Cheap check whether page.extract_tables() could find a table.
+
+    Counts ruling lines from the page's lines and rects (curves are skipped:
+    on textbook pages they are almost always plots), then checks that the
+    ruled area actually contains a grid of characters.
+    """
+    horizontal = vertical = 0
+    ruled = []
+
+    for line in page.lines:
+        if abs(line['top'] - line['bottom']) < 1:
+            horizontal += 1
+        elif abs(line['x0'] - line['x1']) < 1:
+            vertical += 1
+        ruled.append(line)
+
+    for rect in page.rects:
+        horizontal += 2
+        vertical += 2
+        ruled.append(rect)
+
+    if horizontal < MIN_TABLE_RULES or vertical < MIN_TABLE_RULES:
+        return False
+
+    # Character-grid density: text inside the bounding box of the rules
+    x0 = min(obj['x0'] for obj in ruled)
+    x1 = max(obj['x1'] for obj in ruled)
+    top = min(obj['top'] for obj in ruled)
+    bottom = max(obj['bottom'] for obj in ruled)
+
+    inside = 0
+    for char in page.chars:
+        if x0 <= char['x0'] and char['x1'] <= x1 and top <= char['top'] and char['bottom'] <= bottom:
+            inside += 1
+            if inside >= MIN_TABLE_CHARS:
+                return True
+
+    return False
+
+def extract_page_record(page, page_number, table_prefilter=True):
+    """Extract text and markdown tables from a single pdfplumber page."""
+    started = time.perf_counter()
+
+    # Extract text
+    text = page.extract_text() or ""
+    text_done = time.perf_counter()
+
+    # Only run the (expensive) table finder on pages that may hold a table
+    candidate = looks_like_table_page(page) if table_prefilter else True
+    prefilter_done = time.perf_counter()
+
+    # Try to extract tables, formatted as markdown
+    tables = page.extract_tables() if candidate else []
+    tables_done = time.perf_counter()
+
+    return {
+        'page_number': page_number,
+        'text': text,
+        'tables': tables_to_markdown(tables) if tables else "",
+        'profile': {
+            'text_seconds': text_done - started,
+            'prefilter_seconds': prefilter_done - text_done,
+            'tables_seconds': tables_done - prefilter_done,
+            'table_candidate': candidate,
+            'tables_found': len(tables),
+        }
+    }
+
+def extract_page_range(task):
+    """
+    Worker: open the PDF once and extract the given page indices.
+
+    Runs in a child process, so it takes a plain
+    (pdf_path, page_indices, table_prefilter) tuple and returns plain dicts.
+    """
+    import pdfplumber
+
+    pdf_path, page_indices, table_prefilter = task
+
+    with pdfplumber.open(pdf_path) as pdf:
+        return [extract_page_record(pdf.pages[index], index + 1, table_prefilter)
+                for index in page_indices]
+
+def split_page_ranges(page_indices, pages_per_task=PAGES_PER_TASK):
+    """Split a list of page indices into consecutive tasks."""
+    return [page_indices[start:start + pages_per_task]
+            for start in range(0, len(page_indices), pages_per_task)]
+
+def extract_with_enhanced_method(workers=1, table_prefilter=True):
     """Use pdfplumber for better table extraction."""
     try:
         import pdfplumber
         print("✅ Using ENHANCED extraction (pdfplumber)")
         print("   This will better preserve tables and structure!\n")
 
-        def extract_text_from_pdf(pdf_path):
-            pages_text = []
+        def count_pages(pdf_path):
+            with pdfplumber.open(pdf_path) as pdf:
+                return len(pdf.pages)
 
+        def extract_text_from_pdf(pdf_path, page_indices=None):
             with pdfplumber.open(pdf_path) as pdf:
-                for page_num, page in enumerate(pdf.pages, 1):
-                    # Extract text
-                    text = page.extract_text() or ""
-
-                    # Try to extract tables
-                    tables = page.extract_tables()
-
-                    # If tables exist, format them as markdown
-                    if tables:
-                        table_texts = []
-                        for table in tables:
-                            # Convert table to markdown format
-                            if table and len(table) > 0:
-                                # Header row
-                                header = " | ".join(str(cell or "") for cell in table[0])
-                                separator = " | ".join("---" for _ in table[0])
-
-                                # Data rows
-                                rows = []
-                                for row in table[1:]:
-                                    if row:
-                                        rows.append(" | ".join(str(cell or "") for cell in row))
-
-                                # Combine into markdown table
-                                markdown_table = f"\n\nTABLE:\n{header}\n{separator}\n" + "\n".join(rows) + "\n\n"
-                                table_texts.append(markdown_table)
-
-                        # Add tables to text
-                        text = text + "\n" + "".join(table_texts)
-
-                    if text.strip():
-                        pages_text.append({
-                            'page_number': page_num,
-                            'content': text.strip()
-                        })
-
-            return pages_text
-
-        return extract_text_from_pdf
+                if page_indices is None:
+                    page_indices = range(len(pdf.pages))
+
+                for index in page_indices:
+                    yield extract_page_record(pdf.pages[index], index + 1, table_prefilter)
+
+        def extract_text_from_pdf_parallel(pdf_path, page_indices=None):
+            if page_indices is None:
+                page_indices = range(count_pages(pdf_path))
+
+            tasks = [(pdf_path, chunk, table_prefilter) for chunk in split_page_ranges(list(page_indices))]
+
+            # map() yields results in task order, so pages come back in order
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for chunk in pool.map(extract_page_range, tasks):
+                    yield from chunk
+
+        extract_func = extract_text_from_pdf
+        if workers > 1:
+            print(f"⚡ Parallel mode: {workers} worker processes\n")
+            extract_func = extract_text_from_pdf_parallel
+
+        if not table_prefilter:
+            print("🐢 Table prefilter off: running table extraction on every page\n")
+
+        # Prefiltered and full extraction may differ, so cache them separately
+        extract_func.extractor = 'pdfplumber' if table_prefilter else 'pdfplumber-full'
+        extract_func.count_pages = count_pages
+        return extract_func
 
     except ImportError:
         return None
 
-def create_csv_from_books(books_folder="Books used", output_file="new_books_data_enhanced.csv"):
+def file_sha256(path):
+    """Hash a file's content, so renamed-but-identical PDFs still hit the cache."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class PageCache:
+    """
+    Persistent SQLite cache of extracted pages.
+
+    Pages are keyed by (PDF content hash, page number, extractor, extractor
+    version). Empty pages are cached too, so they are never re-extracted.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_FILE):
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS books (
+                pdf_hash TEXT NOT NULL,
+                extractor TEXT NOT NULL,
+                extractor_version INTEGER NOT NULL,
+                page_count INTEGER NOT NULL,
+                PRIMARY KEY (pdf_hash, extractor, extractor_version)
+            );
+            CREATE TABLE IF NOT EXISTS pages (
+                pdf_hash TEXT NOT NULL,
+                page_number INTEGER NOT NULL,
+                extractor TEXT NOT NULL,
+                extractor_version INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                tables TEXT NOT NULL,
+                PRIMARY KEY (pdf_hash, extractor, extractor_version, page_number)
+            );
+        """)
+
+    def page_count(self, pdf_hash, extractor):
+        row = self.conn.execute(
+            "SELECT page_count FROM books WHERE pdf_hash = ? AND extractor = ? AND extractor_version = ?",
+            (pdf_hash, extractor, EXTRACTOR_VERSIONS[extractor])
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_page_count(self, pdf_hash, extractor, page_count):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO books VALUES (?, ?, ?, ?)",
+            (pdf_hash, extractor, EXTRACTOR_VERSIONS[extractor], page_count)
+        )
+        self.conn.commit()
+
+    def get_pages(self, pdf_hash, extractor):
+        """Return {page_number: page record} for every cached page of a book."""
+        rows = self.conn.execute(
+            "SELECT page_number, text, tables FROM pages "
+            "WHERE pdf_hash = ? AND extractor = ? AND extractor_version = ?",
+            (pdf_hash, extractor, EXTRACTOR_VERSIONS[extractor])
+        )
+        return {page_number: {'page_number': page_number, 'text': text, 'tables': tables}
+                for page_number, text, tables in rows}
+
+    def put_pages(self, pdf_hash, extractor, pages):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)",
+            [(pdf_hash, page['page_number'], extractor, EXTRACTOR_VERSIONS[extractor],
+              page['text'], page['tables']) for page in pages]
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+def extract_book_cached(extract_func, pdf_path, cache):
+    """
+    Extract a book through the page cache.
+
+    Only pages missing from the cache are extracted; they are written back
+    in batches as they arrive, so an interrupted run keeps its progress.
+    Returns (page records in page order, number of freshly extracted pages).
+    """
+    extractor = extract_func.extractor
+    pdf_hash = file_sha256(pdf_path)
+
+    page_count = cache.page_count(pdf_hash, extractor)
+    if page_count is None:
+        page_count = extract_func.count_pages(pdf_path)
+        cache.set_page_count(pdf_hash, extractor, page_count)
+
+    cached = cache.get_pages(pdf_hash, extractor)
+    missing = [index for index in range(page_count) if index + 1 not in cached]
+
+    batch = []
+    for page in extract_func(pdf_path, missing):
+        cached[page['page_number']] = page
+        batch.append(page)
+        if len(batch) >= PAGES_PER_TASK:
+            cache.put_pages(pdf_hash, extractor, batch)
+            batch = []
+    if batch:
+        cache.put_pages(pdf_hash, extractor, batch)
+
+    return [cached[number] for number in sorted(cached)], len(missing)
+
+PROFILE_FIELDS = ['book_name', 'page_number', 'total_seconds', 'text_seconds', 'prefilter_seconds',
+                  'tables_seconds', 'table_candidate', 'tables_found']
+
+def write_profile(profile_rows, profile_file, top_n=10):
+    """Write per-page extraction timings to CSV and print the hot spots."""
+    with open(profile_file, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=PROFILE_FIELDS)
+        writer.writeheader()
+        writer.writerows(profile_rows)
+
+    print(f"\n⏱️  Wrote timings for {len(profile_rows)} pages to '{profile_file}'")
+
+    book_totals = {}
+    for row in profile_rows:
+        totals = book_totals.setdefault(row['book_name'], {'seconds': 0.0, 'tables_seconds': 0.0,
+                                                           'pages': 0, 'candidates': 0})
+        totals['seconds'] += row['total_seconds']
+        totals['tables_seconds'] += row['tables_seconds']
+        totals['pages'] += 1
+        totals['candidates'] += row['table_candidate']
+
+    print(f"\n   By book:")
+    for book_name, totals in sorted(book_totals.items(), key=lambda item: -item[1]['seconds']):
+        print(f"     - {book_name}: {totals['seconds']:.1f}s over {totals['pages']} pages "
+              f"(tables {totals['tables_seconds']:.1f}s, {totals['candidates']} table candidates)")
+
+    print(f"\n   Slowest pages:")
+    for row in sorted(profile_rows, key=lambda r: -r['total_seconds'])[:top_n]:
+        print(f"     - {row['book_name']} p.{row['page_number']}: {row['total_seconds']:.3f}s "
+              f"(text {row['text_seconds']:.3f}s, tables {row['tables_seconds']:.3f}s)")
+
+def create_csv_from_books(books_folder="Books used", output_file="new_books_data_enhanced.csv", workers=1,
+                          cache_file=DEFAULT_CACHE_FILE, table_prefilter=True, profile_file=None):
     """Create CSV with enhanced extraction."""
 
     print(f"\n{'='*80}")
@@ -106,7 +389,7 @@ def create_csv_from_books(books_folder="Books used", output_file="new_books_data
     print(f"{'='*80}\n")
 
     # Try enhanced method first, fallback to basic
-    extract_func = extract_with_enhanced_method()
+    extract_func = extract_with_enhanced_method(workers=workers, table_prefilter=table_prefilter)
     if extract_func is None:
         extract_func = extract_with_basic_method()
 
@@ -124,7 +407,12 @@ def create_csv_from_books(books_folder="Books used", output_file="new_books_data
 
     print(f"📚 Found {len(pdf_files)} PDF file(s)\n")
 
+    cache = PageCache(cache_file) if cache_file else None
+    if cache:
+        print(f"🗄️  Using page cache '{cache_file}'\n")
+
     all_data = []
+    profile_rows = []
 
     for pdf_file in pdf_files:
         pdf_path = os.path.join(books_folder, pdf_file)
@@ -133,20 +421,42 @@ def create_csv_from_books(books_folder="Books used", output_file="new_books_data
         print(f"  Processing: {pdf_file}")
 
         try:
-            pages = extract_func(pdf_path)
-
-            for page in pages:
-                all_data.append({
-                    'book_name': book_name,
-                    'page_number': page['page_number'],
-                    'content': page['content']
-                })
-
-            print(f"    ✓ Extracted {len(pages)} pages")
+            if cache:
+                records, extracted = extract_book_cached(extract_func, pdf_path, cache)
+            else:
+                records = list(extract_func(pdf_path))
+                extracted = len(records)
+
+            pages = 0
+            for page in records:
+                content = page_content(page)
+                if content:
+                    all_data.append({
+                        'book_name': book_name,
+                        'page_number': page['page_number'],
+                        'content': content
+                    })
+                    pages += 1
+
+                # Only freshly extracted pdfplumber pages carry timings
+                if 'profile' in page:
+                    timings = page['profile']
+                    profile_rows.append({
+                        'book_name': book_name,
+                        'page_number': page['page_number'],
+                        'total_seconds': (timings['text_seconds'] + timings['prefilter_seconds']
+                                          + timings['tables_seconds']),
+                        **timings
+                    })
+
+            print(f"    ✓ Extracted {pages} pages ({len(records) - extracted} from cache)")
 
         except Exception as e:
             print(f"    ✗ Error: {str(e)}")
 
+    if cache:
+        cache.close()
+
     if all_data:
         print(f"\n📝 Writing {len(all_data)} chunks to '{output_file}'...")
 
@@ -163,11 +473,35 @@ def create_csv_from_books(books_folder="Books used", output_file="new_books_data
 
         print(f"\n📤 Next steps:")
         print(f"   1. Compare file size with old CSV (should be larger if tables extracted)")
-        print(f"   2. Upload '{output_file}' to Supabase")
-        print(f"   3. Your answers will now include table data!")
+        print(f"   2. Optional: python chunk_book_pages.py --input '{output_file}' to split pages into passages")
+        print(f"   3. Upload '{output_file}' (or the passages CSV) to Supabase")
+        print(f"   4. Your answers will now include table data!")
     else:
         print(f"\n❌ No data extracted. Please check your PDF files.")
 
+    if profile_file:
+        if profile_rows:
+            write_profile(profile_rows, profile_file)
+        else:
+            print(f"\n⏱️  No freshly extracted pages to profile (cached pages have no timings, try --no-cache)")
+
 if __name__ == "__main__":
-    create_csv_from_books()
+    parser = argparse.ArgumentParser(description="Extract textbook pages into a CSV for Supabase")
+    parser.add_argument("--books-folder", default="Books used")
+    parser.add_argument("--output", default="new_books_data_enhanced.csv")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for page extraction (default: 1 = serial)")
+    parser.add_argument("--cache-file", default=DEFAULT_CACHE_FILE,
+                        help=f"SQLite page cache (default: {DEFAULT_CACHE_FILE})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Extract every page from scratch without reading or writing the cache")
+    parser.add_argument("--no-table-prefilter", action="store_true",
+                        help="Run table extraction on every page instead of only likely-table pages")
+    parser.add_argument("--profile", metavar="CSV",
+                        help="Write per-page extraction timings to this CSV and print the slowest pages")
+    args = parser.parse_args()
+
+    create_csv_from_books(args.books_folder, args.output, workers=args.workers,
+                          cache_file=None if args.no_cache else args.cache_file,
+                          table_prefilter=not args.no_table_prefilter, profile_file=args.profile)
     print(f"\n{'='*80}\n")
@@ -0,0 +1,310 @@
+"""
+Columnar export of user_answers and group-by accuracy reports off the database.
+
+Questions like "accuracy by topic, company and difficulty per cohort" were
+ad-hoc SQL against the live database. This tool copies the answers out once
+and answers them from local arrays:
+
+- export: streams user_answers (one REPEATABLE READ snapshot) into a .npz
+  store laid out as a star schema of flat columns:
+    answers    question and user numbers, correct, time spent, hints used,
+               answer day and difficulty_at_time, one entry per answer
+    questions  topic, company, question_type, category and difficulty
+    users      experience level and cohort (signup month)
+  Text columns are dictionary-encoded: an integer code per row plus one
+  dictionary of distinct values per column. Questions and users are numbered
+  by id in SQL, so no UUIDs are transferred per answer.
+- report: loads the store and computes every report in one pass. Each
+  answer's group is a mixed-radix number over the codes of all dimensions
+  the reports use, np.unique collapses the answers to the cells that occur,
+  and np.bincount sums answers, correct answers, time and hints per cell.
+  Each report then adds up cells, not answers. Reports are written as CSV.
+
+Dimensions: topic, company, question_type, category, difficulty (the
+question's label now), difficulty_at_time, level, cohort, month (of the
+answer). Questions with several topics ('a|b|c') count under the first, so
+every report adds up to the same totals. Anonymous answers are in the
+'(anonymous)' level and cohort, missing values are '(none)'.
+
+Archived months aren't in user_answers, so exports only cover live ones.
+
+HOW TO USE:
+1. Install dependencies:
+   pip install numpy "psycopg[binary]"
+
+2. Export (direct database connection string), e.g. nightly:
+   python answer_analytics.py export --dsn postgresql://postgres@localhost/postgres --store answers.npz
+
+3. Report, without touching the database:
+   python answer_analytics.py report --store answers.npz --output-dir reports
+   python answer_analytics.py report --store answers.npz --by topic,company,difficulty,cohort
+"""
+
+import os
+import csv
+import time
+import argparse
+
+import numpy as np
+import psycopg
+
+DEFAULT_DSN = os.environ.get("DATABASE_URL", "postgresql://postgres@localhost/postgres")
+DEFAULT_STORE = "answers.npz"
+DEFAULT_OUTPUT_DIR = "reports"
+DEFAULT_BATCH_SIZE = 200000
+
+NONE = '(none)'
+ANONYMOUS = '(anonymous)'
+
+QUESTION_COLUMNS = ['topic', 'company', 'question_type', 'category', 'difficulty']
+USER_COLUMNS = ['level', 'cohort']
+
+# Report name -> dimensions, all computed by one `report` run
+DEFAULT_REPORTS = {
+    'accuracy_by_topic_and_cohort': ('topic', 'cohort'),
+    'accuracy_by_company_and_difficulty': ('company', 'difficulty'),
+    'accuracy_by_question_type_and_level': ('question_type', 'level'),
+    'accuracy_by_month_and_difficulty_at_time': ('month', 'difficulty_at_time'),
+}
+
+QUESTIONS_SQL = """
+    SELECT topics, company, question_type, category, difficulty
+    FROM interview_questions
+    ORDER BY id
+"""
+
+USERS_SQL = """
+    SELECT experience_level, to_char(created_at AT TIME ZONE 'UTC', 'YYYY-MM')
+    FROM user_profiles
+    ORDER BY id
+"""
+
+# Numbers match the row positions of QUESTIONS_SQL / USERS_SQL in the same snapshot
+ANSWERS_SQL = """
+    WITH q AS (SELECT id, (row_number() OVER (ORDER BY id) - 1)::INT as n FROM interview_questions),
+         u AS (SELECT id, (row_number() OVER (ORDER BY id) - 1)::INT as n FROM user_profiles)
+    SELECT
+        COALESCE(q.n, -1), COALESCE(u.n, -1), a.is_correct, a.time_spent_seconds,
+        COALESCE(a.hints_used, 0),
+        (a.created_at AT TIME ZONE 'UTC')::DATE - DATE '1970-01-01',
+        a.difficulty_at_time
+    FROM user_answers a
+    LEFT JOIN q ON q.id = a.question_id
+    LEFT JOIN u ON u.id = a.user_id
+    WHERE a.is_correct IS NOT NULL
+"""
+
+class Dictionary:
+    """Dictionary encoding for one text column: value -> small integer code."""
+
+    def __init__(self, values=()):
+        self.values = list(values)
+        self.codes = {value: code for code, value in enumerate(self.values)}
+
+    def encode(self, values):
+        codes = self.codes
+        encoded = np.empty(len(values), dtype=np.int32)
+        for i, value in enumerate(values):
+            value = NONE if value is None or value == '' else value
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(self.values)
+                self.values.append(value)
+            encoded[i] = code
+        return encoded
+
+def first_topic(topics):
+    return (topics or '').split('|')[0].strip()
+
+def export(dsn=DEFAULT_DSN, store=DEFAULT_STORE, batch_size=DEFAULT_BATCH_SIZE):
+    started = time.perf_counter()
+    dictionaries = {name: Dictionary() for name in QUESTION_COLUMNS + USER_COLUMNS + ['difficulty_at_time']}
+    columns = {}
+
+    with psycopg.connect(dsn) as conn:
+        conn.isolation_level = psycopg.IsolationLevel.REPEATABLE_READ  # One snapshot for all three queries
+        with conn.cursor() as cur:
+            cur.execute(QUESTIONS_SQL)
+            questions = cur.fetchall()
+            topics, companies, types, categories, difficulties = zip(*questions) if questions else ([],) * 5
+            for name, values in zip(QUESTION_COLUMNS, ([first_topic(t) for t in topics], companies, types,
+                                                       categories, difficulties)):
+                columns[f'question_{name}'] = dictionaries[name].encode(values)
+
+            cur.execute(USERS_SQL)
+            users = cur.fetchall()
+            levels, cohorts = zip(*users) if users else ([], [])
+            columns['user_level'] = dictionaries['level'].encode(levels)
+            columns['user_cohort'] = dictionaries['cohort'].encode(cohorts)
+        print(f"📚 {len(questions)} questions, {len(users)} users")
+
+        batches = []
+        total = 0
+        with conn.cursor(name='answer_analytics_export') as cur:
+            cur.itersize = batch_size
+            cur.execute(ANSWERS_SQL)
+            while rows := cur.fetchmany(batch_size):
+                question, user, correct, time_spent, hints, day, difficulty_at_time = zip(*rows)
+                batches.append({
+                    'question': np.array(question, dtype=np.int32),
+                    'user': np.array(user, dtype=np.int32),
+                    'correct': np.array(correct, dtype=bool),
+                    'time_spent': np.array([np.nan if t is None else t for t in time_spent], dtype=np.float32),
+                    'hints': np.array(hints, dtype=np.int16),
+                    'day': np.array(day, dtype=np.int32),
+                    'difficulty_at_time': dictionaries['difficulty_at_time'].encode(difficulty_at_time),
+                })
+                total += len(rows)
+                print(f"   ... {total} answers")
+
+    for name in ['question', 'user', 'correct', 'time_spent', 'hints', 'day', 'difficulty_at_time']:
+        columns[f'answer_{name}'] = (np.concatenate([batch[name] for batch in batches]) if batches
+                                     else np.zeros(0, dtype=np.int32))
+    for name, dictionary in dictionaries.items():
+        columns[f'dictionary_{name}'] = np.array(dictionary.values, dtype=str)
+
+    temp_path = f"{store}.tmp.npz"
+    np.savez_compressed(temp_path, **columns)
+    os.replace(temp_path, store)
+    print(f"\n✅ Exported {total} answers to '{store}' ({os.path.getsize(store) / 1e6:.1f} MB) "
+          f"in {time.perf_counter() - started:.2f}s")
+
+class AnswerStore:
+    """The exported columns, with each dimension resolved to one code per answer."""
+
+    def __init__(self, path):
+        with np.load(path, allow_pickle=False) as data:
+            self.columns = {name: data[name] for name in data.files}
+        self.answers = len(self.columns['answer_question'])
+
+    def dimension(self, name):
+        """(codes per answer, values) for a dimension."""
+        question = self.columns['answer_question']
+        user = self.columns['answer_user']
+
+        if name in QUESTION_COLUMNS:
+            values = self.columns[f'dictionary_{name}'].tolist()
+            if NONE not in values:
+                values.append(NONE)
+            codes = self.columns[f'question_{name}']
+            return np.where(question >= 0, codes[np.maximum(question, 0)], values.index(NONE)), values
+        if name in USER_COLUMNS:
+            values = self.columns[f'dictionary_{name}'].tolist() + [ANONYMOUS]
+            codes = self.columns[f'user_{name}']
+            return np.where(user >= 0, codes[np.maximum(user, 0)], len(values) - 1), values
+        if name == 'difficulty_at_time':
+            return self.columns['answer_difficulty_at_time'], self.columns['dictionary_difficulty_at_time'].tolist()
+        if name == 'month':
+            months = self.columns['answer_day'].astype('datetime64[D]').astype('datetime64[M]')
+            values, codes = np.unique(months, return_inverse=True)
+            return codes, [str(month) for month in values]
+        raise ValueError(f"Unknown dimension '{name}'")
+
+def group_reports(answer_store, reports):
+    """
+    {report name: (dimensions, rows)} with rows of
+    (*dimension values, answered, correct, time_sum, timed, hints), in one pass.
+    """
+    dimensions = sorted({name for dims in reports.values() for name in dims})
+    codes, values = zip(*(answer_store.dimension(name) for name in dimensions)) if dimensions else ((), ())
+    sizes = [len(v) for v in values]
+    if np.prod(sizes, dtype=np.float64) >= 2 ** 62:
+        raise ValueError("Too many dimension values for one group key")
+
+    # One key per answer over every dimension, collapsed to the cells that occur
+    key = np.zeros(answer_store.answers, dtype=np.int64)
+    for code, size in zip(codes, sizes):
+        key = key * size + code
+    cells, cell_of = np.unique(key, return_inverse=True)
+
+    time_spent = answer_store.columns['answer_time_spent']
+    timed = ~np.isnan(time_spent)
+    totals = {
+        'answered': np.bincount(cell_of, minlength=len(cells)),
+        'correct': np.bincount(cell_of, weights=answer_store.columns['answer_correct'], minlength=len(cells)),
+        'time_sum': np.bincount(cell_of, weights=np.where(timed, time_spent, 0), minlength=len(cells)),
+        'timed': np.bincount(cell_of, weights=timed, minlength=len(cells)),
+        'hints': np.bincount(cell_of, weights=answer_store.columns['answer_hints'], minlength=len(cells)),
+    }
+
+    # Decode each cell's code per dimension
+    cell_codes = {}
+    remainder = cells
+    for name, size in reversed(list(zip(dimensions, sizes))):
+        remainder, cell_codes[name] = np.divmod(remainder, size)
+
+    results = {}
+    for report, dims in reports.items():
+        report_key = np.zeros(len(cells), dtype=np.int64)
+        for name in dims:
+            report_key = report_key * sizes[dimensions.index(name)] + cell_codes[name]
+        groups, group_of = np.unique(report_key, return_inverse=True)
+        sums = {name: np.bincount(group_of, weights=total, minlength=len(groups)) for name, total in totals.items()}
+
+        labels = []
+        remainder = groups
+        for name in reversed(dims):
+            size = sizes[dimensions.index(name)]
+            remainder, code = np.divmod(remainder, size)
+            labels.append([values[dimensions.index(name)][c] for c in code.tolist()])
+        labels.reverse()
+
+        rows = [(*dim_values, int(answered), int(correct), time_sum, int(timed_count), int(hints))
+                for *dim_values, answered, correct, time_sum, timed_count, hints
+                in zip(*labels, *(sums[name].tolist() for name in totals))]
+        results[report] = (dims, rows)
+    return results
+
+def write_report(path, dims, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow([*dims, 'answered', 'correct', 'accuracy_percent', 'avg_time_seconds', 'avg_hints'])
+        for *dim_values, answered, correct, time_sum, timed, hints in rows:
+            writer.writerow([*dim_values, answered, correct, round(100 * correct / answered, 2),
+                             round(time_sum / timed, 1) if timed else '', round(hints / answered, 2)])
+
+def report(store=DEFAULT_STORE, output_dir=DEFAULT_OUTPUT_DIR, by=None, show=5):
+    started = time.perf_counter()
+    answer_store = AnswerStore(store)
+    print(f"📂 Loaded {answer_store.answers} answers from '{store}' ({time.perf_counter() - started:.2f}s)")
+
+    reports = {'accuracy_by_' + '_and_'.join(by): tuple(by)} if by else DEFAULT_REPORTS
+    started = time.perf_counter()
+    results = group_reports(answer_store, reports)
+    print(f"📊 {len(results)} reports in {time.perf_counter() - started:.2f}s\n")
+
+    os.makedirs(output_dir, exist_ok=True)
+    for name, (dims, rows) in results.items():
+        path = os.path.join(output_dir, f"{name}.csv")
+        write_report(path, dims, rows)
+        print(f"💾 {path}: {len(rows)} groups")
+        for *dim_values, answered, correct, _, _, _ in sorted(rows, key=lambda row: -row[len(dims)])[:show]:
+            print(f"   {' | '.join(map(str, dim_values))[:60]:60s} {answered:9d} answers  "
+                  f"{100 * correct / answered:5.1f}% correct")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Columnar user_answers export and NumPy group-by reports")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_cmd = commands.add_parser("export", help="Copy answers and dimensions into a .npz store")
+    export_cmd.add_argument("--dsn", default=DEFAULT_DSN)
+    export_cmd.add_argument("--store", default=DEFAULT_STORE)
+    export_cmd.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+
+    report_cmd = commands.add_parser("report", help="Group-by accuracy reports from the store")
+    report_cmd.add_argument("--store", default=DEFAULT_STORE)
+    report_cmd.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR)
+    report_cmd.add_argument("--by", type=lambda value: value.split(','),
+                            help="Comma-separated dimensions for one report instead of the defaults")
+    args = parser.parse_args()
+
+    print("\n" + "="*80)
+    print(f"  📊 Answer Analytics: {args.command}")
+    print("="*80 + "\n")
+
+    if args.command == "export":
+        export(args.dsn, args.store, args.batch_size)
+    else:
+        report(args.store, args.output_dir, args.by)
+
+    print("\n" + "="*80 + "\n")
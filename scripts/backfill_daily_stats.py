@@ -0,0 +1,114 @@
+"""
+Build user_daily_stats from the existing user_answers history.
+
+get_recommended_difficulty() reads the daily tallies in user_daily_stats,
+which triggers on user_answers keep current (supabase/setup.sql, which
+also seeds the table when it is first run). Answers loaded with triggers
+disabled (e.g. a bulk restore) need a backfill. This job recomputes the tallies
+with one GROUP BY over user_answers, reports how many rows differ from
+the table, and swaps the rebuilt rows in.
+
+Everything runs in one transaction holding a SHARE lock on user_answers.
+New answers wait until it commits, and readers are never blocked. --since
+limits the rebuild to recent UTC days. Days whose answers were archived
+(user_answers_archives) are never rebuilt, since there's nothing left to
+count them from.
+
+HOW TO USE:
+1. Install dependencies:
+   pip install "psycopg[binary]"
+
+2. Run it (direct database connection string):
+   python backfill_daily_stats.py --dsn postgresql://postgres@localhost/postgres
+   python backfill_daily_stats.py --dsn ... --since 2025-01-01
+   python backfill_daily_stats.py --dsn ... --dry-run      (only count differences)
+"""
+
+import os
+import sys
+import time
+import argparse
+from datetime import date
+
+import psycopg
+
+DEFAULT_DSN = os.environ.get("DATABASE_URL", "postgresql://postgres@localhost/postgres")
+
+REBUILD_SQL = """
+    CREATE TEMP TABLE rebuilt_daily_stats ON COMMIT DROP AS
+    SELECT
+        ua.user_id,
+        (ua.created_at AT TIME ZONE 'UTC')::DATE as day,
+        COALESCE(iq.question_type, '') as question_type,
+        COALESCE(ua.difficulty_at_time, '') as difficulty,
+        COUNT(*)::INT as answered,
+        (COUNT(*) FILTER (WHERE ua.is_correct))::INT as correct
+    FROM user_answers ua
+    LEFT JOIN interview_questions iq ON iq.id = ua.question_id
+    WHERE ua.user_id IS NOT NULL
+      AND ua.created_at >= %s::TIMESTAMP AT TIME ZONE 'UTC'
+    GROUP BY 1, 2, 3, 4
+"""
+
+DIFF_SQL = """
+    SELECT COUNT(*)
+    FROM rebuilt_daily_stats r
+    FULL OUTER JOIN (SELECT * FROM user_daily_stats WHERE day >= %s) s
+        USING (user_id, day, question_type, difficulty)
+    WHERE (r.answered, r.correct) IS DISTINCT FROM (s.answered, s.correct)
+"""
+
+def backfill(dsn=DEFAULT_DSN, since=None, dry_run=False):
+    """Returns the number of daily rows that were (or would be) wrong."""
+    started = time.perf_counter()
+
+    with psycopg.connect(dsn) as conn:
+        with conn.cursor() as cur:
+            cur.execute("LOCK TABLE user_answers IN SHARE MODE")
+
+            cur.execute("SELECT (MAX(range_end) AT TIME ZONE 'UTC')::DATE FROM user_answers_archives")
+            archived_until = cur.fetchone()[0] or date.min
+            if since and since < archived_until:
+                print(f"📦 Answers before {archived_until} are archived, rebuilding from there")
+            since = max(since or date.min, archived_until)
+
+            cur.execute(REBUILD_SQL, (since,))
+            cur.execute("SELECT COUNT(*), COALESCE(SUM(answered), 0) FROM rebuilt_daily_stats")
+            rows, answers = cur.fetchone()
+            built = time.perf_counter()
+            print(f"🧮 Aggregated {answers} answers into {rows} user-day rows in {built - started:.2f}s")
+
+            cur.execute(DIFF_SQL, (since,))
+            wrong = cur.fetchone()[0]
+            print(f"   - {wrong} rows missing, stale or extra in user_daily_stats")
+
+            if dry_run or wrong == 0:
+                conn.rollback()
+                print(f"\n✅ Nothing written ({'dry run' if dry_run else 'already up to date'})")
+                return wrong
+
+            cur.execute("DELETE FROM user_daily_stats WHERE day >= %s", (since,))
+            deleted = cur.rowcount
+            cur.execute("INSERT INTO user_daily_stats SELECT * FROM rebuilt_daily_stats ORDER BY 1, 2, 3, 4")
+            inserted = cur.rowcount
+            cur.execute("ANALYZE user_daily_stats")
+
+        print(f"\n✅ Replaced {deleted} rows with {inserted} in {time.perf_counter() - built:.2f}s "
+              f"(total {time.perf_counter() - started:.2f}s)")
+    return wrong
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild user_daily_stats from user_answers")
+    parser.add_argument("--dsn", default=DEFAULT_DSN)
+    parser.add_argument("--since", type=date.fromisoformat, help="Only rebuild UTC days from this date (YYYY-MM-DD)")
+    parser.add_argument("--dry-run", action="store_true", help="Count differences without writing")
+    args = parser.parse_args()
+
+    print("\n" + "="*80)
+    print("  📅 Daily Stats Backfill")
+    print("="*80 + "\n")
+
+    wrong = backfill(args.dsn, args.since, args.dry_run)
+
+    print("\n" + "="*80 + "\n")
+    sys.exit(1 if args.dry_run and wrong else 0)
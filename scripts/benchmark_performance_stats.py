@@ -0,0 +1,201 @@
+"""
+Benchmark: trigger-maintained user_performance_stats vs. aggregating on read.
+
+Fills a local Postgres (with supabase/setup.sql applied) with synthetic
+answers, then compares:
+- read:   one user's stats through the old aggregate-over-user_answers view
+          query vs. the summary-backed user_performance_stats view
+- recommended difficulty: get_recommended_difficulty()'s old 7-day scan
+          of user_answers vs. summing the user_daily_stats rows
+- write:  single-row answer inserts (what the app does) with the summary
+          triggers enabled vs. disabled, to show what the triggers cost
+
+HOW TO USE:
+1. Install dependencies:
+   pip install "psycopg[binary]"
+
+2. Run it against a scratch database (it inserts --answers rows):
+   python benchmark_performance_stats.py --dsn postgresql://postgres@localhost/bench --answers 2000000
+   python benchmark_performance_stats.py --dsn ... --answers 0   (reuse data from a previous run)
+"""
+
+import os
+import time
+import random
+import argparse
+import statistics
+
+import psycopg
+
+from benchmark_search_rpc import percentile
+
+DEFAULT_DSN = os.environ.get("DATABASE_URL", "postgresql://postgres@localhost/postgres")
+INSERT_BATCH = 200000
+
+# One user who practiced a lot this week: the old 7-day scan reads all of these
+HEAVY_USER_ID = '00000000-0000-0000-0000-00000000beef'
+HEAVY_RECENT_ANSWERS = 50000
+
+# The view as it was before the summary table
+AGGREGATE_ON_READ_SQL = """
+    SELECT
+        user_id,
+        COUNT(*) as total_questions_answered,
+        SUM(CASE WHEN is_correct THEN 1 ELSE 0 END) as total_correct,
+        ROUND(AVG(CASE WHEN is_correct THEN 1 ELSE 0 END) * 100, 2) as overall_accuracy_percent,
+        AVG(time_spent_seconds) as avg_time_per_question,
+        MAX(created_at) as last_practice_date,
+        ROUND(AVG(CASE WHEN difficulty_at_time = 'easy' AND is_correct THEN 1.0 ELSE 0.0 END) * 100, 2) as easy_accuracy,
+        ROUND(AVG(CASE WHEN difficulty_at_time = 'medium' AND is_correct THEN 1.0 ELSE 0.0 END) * 100, 2) as medium_accuracy,
+        ROUND(AVG(CASE WHEN difficulty_at_time = 'hard' AND is_correct THEN 1.0 ELSE 0.0 END) * 100, 2) as hard_accuracy
+    FROM user_answers
+    WHERE user_id = %s
+    GROUP BY user_id
+"""
+
+SUMMARY_SQL = "SELECT * FROM user_performance_stats WHERE user_id = %s"
+
+# get_recommended_difficulty() before user_daily_stats
+SCAN_LAST_7_DAYS_SQL = """
+    SELECT AVG(CASE WHEN is_correct THEN 1.0 ELSE 0.0 END), COUNT(*)
+    FROM user_answers
+    WHERE user_id = %s AND created_at > NOW() - INTERVAL '7 days'
+"""
+
+RECOMMENDED_SQL = "SELECT get_recommended_difficulty(%s)"
+
+def generate_answers(conn, answers, users):
+    """Insert synthetic users, questions and answers, server-side, in INSERT_BATCH chunks."""
+    with conn.cursor() as cur:
+        cur.execute("SELECT COUNT(*) FROM user_profiles")
+        missing_users = max(0, users - cur.fetchone()[0])
+        cur.execute("INSERT INTO user_profiles (experience_level) SELECT 'mid' FROM generate_series(1, %s)",
+                    (missing_users,))
+        cur.execute("SELECT COUNT(*) FROM interview_questions")
+        if cur.fetchone()[0] == 0:
+            cur.execute("INSERT INTO interview_questions (question_text, difficulty) "
+                        "SELECT 'Benchmark question ' || g, (ARRAY['easy','medium','hard'])[1 + g % 3] "
+                        "FROM generate_series(1, 1000) g")
+        conn.commit()
+
+        started = time.perf_counter()
+        for offset in range(0, answers, INSERT_BATCH):
+            size = min(INSERT_BATCH, answers - offset)
+            cur.execute("""
+                WITH u AS (SELECT array_agg(id) ids FROM user_profiles),
+                     q AS (SELECT array_agg(id) ids FROM interview_questions)
+                INSERT INTO user_answers (user_id, question_id, is_correct, time_spent_seconds,
+                                          difficulty_at_time, created_at)
+                SELECT u.ids[1 + floor(random() * array_length(u.ids, 1))::int],
+                       q.ids[1 + floor(random() * array_length(q.ids, 1))::int],
+                       random() < 0.65,
+                       (random() * 300)::int,
+                       (ARRAY['easy','medium','hard'])[1 + floor(random() * 3)::int],
+                       NOW() - random() * INTERVAL '365 days'
+                FROM generate_series(1, %s), u, q
+            """, (size,))
+            conn.commit()
+            print(f"   ... {offset + size} answers ({time.perf_counter() - started:.1f}s)")
+
+        cur.execute("INSERT INTO user_profiles (id, experience_level) VALUES (%s, 'mid') ON CONFLICT DO NOTHING",
+                    (HEAVY_USER_ID,))
+        cur.execute("""
+            INSERT INTO user_answers (user_id, is_correct, time_spent_seconds, difficulty_at_time, created_at)
+            SELECT %s, random() < 0.7, 60, 'medium', NOW() - random() * INTERVAL '6 days'
+            FROM generate_series(1, %s)
+        """, (HEAVY_USER_ID, HEAVY_RECENT_ANSWERS))
+        conn.commit()
+
+        cur.execute("ANALYZE user_answers")
+        cur.execute("ANALYZE user_performance_summary")
+        cur.execute("ANALYZE user_daily_stats")
+        conn.commit()
+
+def time_reads(cur, sql, user_ids):
+    timings = []
+    for user_id in user_ids:
+        started = time.perf_counter()
+        cur.execute(sql, (user_id,))
+        cur.fetchall()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+def time_inserts(conn, user_ids, question_id, count, triggers=True):
+    """Single-row inserts, one statement each, rolled back afterwards."""
+    timings = []
+    with conn.cursor() as cur:
+        if not triggers:
+            cur.execute("ALTER TABLE user_answers DISABLE TRIGGER user_answers_summary_insert")
+            cur.execute("ALTER TABLE user_answers DISABLE TRIGGER user_answers_daily_insert")
+        for _ in range(count):
+            started = time.perf_counter()
+            cur.execute("INSERT INTO user_answers (user_id, question_id, is_correct, time_spent_seconds, "
+                        "difficulty_at_time) VALUES (%s, %s, %s, %s, %s)",
+                        (random.choice(user_ids), question_id, random.random() < 0.6, 30, 'medium'))
+            timings.append(time.perf_counter() - started)
+    conn.rollback()
+    return timings
+
+def report(name, timings):
+    ms = [t * 1000 for t in timings]
+    print(f"   {name:18s} p50 {percentile(ms, 50):8.3f} ms | p95 {percentile(ms, 95):8.3f} ms | "
+          f"p99 {percentile(ms, 99):8.3f} ms | mean {statistics.mean(ms):8.3f} ms")
+
+def run_benchmark(dsn=DEFAULT_DSN, answers=2000000, users=2000, reads=500, inserts=2000):
+    with psycopg.connect(dsn) as conn:
+        if answers:
+            print(f"📥 Inserting {answers} answers for {users} users...")
+            generate_answers(conn, answers, users)
+
+        with conn.cursor() as cur:
+            cur.execute("SELECT COUNT(*), COUNT(DISTINCT user_id) FROM user_answers")
+            total, distinct_users = cur.fetchone()
+            print(f"\n📚 user_answers has {total} rows for {distinct_users} users")
+
+            cur.execute("SELECT user_id FROM user_performance_summary")
+            user_ids = [row[0] for row in cur.fetchall()]
+            cur.execute("SELECT id FROM interview_questions LIMIT 1")
+            question_id = cur.fetchone()[0]
+            sample = [random.choice(user_ids) for _ in range(reads)]
+
+            print(f"\n⏱️  One user's stats ({reads} reads):")
+            old = time_reads(cur, AGGREGATE_ON_READ_SQL, sample)
+            new = time_reads(cur, SUMMARY_SQL, sample)
+            report("aggregate on read", old)
+            report("summary table", new)
+            print(f"   -> {statistics.median(old) / max(statistics.median(new), 1e-9):.1f}x faster at the median")
+
+            print(f"\n⏱️  Recommended difficulty ({reads} calls):")
+            old = time_reads(cur, SCAN_LAST_7_DAYS_SQL, sample)
+            new = time_reads(cur, RECOMMENDED_SQL, sample)
+            report("7-day answer scan", old)
+            report("daily stats", new)
+
+            heavy = [HEAVY_USER_ID] * min(reads, 100)
+            print(f"\n⏱️  Recommended difficulty, user with {HEAVY_RECENT_ANSWERS} answers this week:")
+            report("7-day answer scan", time_reads(cur, SCAN_LAST_7_DAYS_SQL, heavy))
+            report("daily stats", time_reads(cur, RECOMMENDED_SQL, heavy))
+
+        conn.commit()
+        print(f"\n⏱️  Single-row answer inserts ({inserts} each, rolled back):")
+        without = time_inserts(conn, user_ids, question_id, inserts, triggers=False)
+        with_triggers = time_inserts(conn, user_ids, question_id, inserts, triggers=True)
+        report("no triggers", without)
+        report("with triggers", with_triggers)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the summary-backed user_performance_stats")
+    parser.add_argument("--dsn", default=DEFAULT_DSN)
+    parser.add_argument("--answers", type=int, default=2000000, help="Synthetic answers to insert first")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--reads", type=int, default=500)
+    parser.add_argument("--inserts", type=int, default=2000)
+    args = parser.parse_args()
+
+    print("\n" + "="*80)
+    print("  🏎️  Performance Stats Benchmark")
+    print("="*80 + "\n")
+
+    run_benchmark(args.dsn, args.answers, args.users, args.reads, args.inserts)
+
+    print("\n" + "="*80 + "\n")
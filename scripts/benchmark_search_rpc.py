@@ -0,0 +1,129 @@
+"""
+Load test: search_documents() RPC vs. one ILIKE query per keyword.
+
+Runs the same queries through both search paths against a Postgres
+database that has supabase/setup.sql applied, and prints latency
+percentiles for each:
+- ilike: what search() in the app used to do. extract_search_keywords()
+  gives the keywords (untimed, the app does this in the browser), then one
+  `content ILIKE '%keyword%' LIMIT 50` query per keyword, in sequence.
+- rpc:   a single `search_documents(query, 50)` call.
+
+HOW TO USE:
+1. Install dependencies:
+   pip install "psycopg[binary]"
+
+2. Point it at a local Postgres with supabase/setup.sql applied. --load
+   fills documents from the passages CSV first:
+   python benchmark_search_rpc.py --dsn postgresql://postgres@localhost/postgres --load book_chunks.csv
+
+3. Queries come from the merged questions CSV (--queries N of them, skipping
+   ones longer than --max-query-chars, which look nothing like a search box)
+"""
+
+import os
+import csv
+import sys
+import time
+import argparse
+import statistics
+
+import psycopg
+
+from question_keys import DEFAULT_QUESTIONS_FILE, load_questions
+
+DEFAULT_DSN = os.environ.get("DATABASE_URL", "postgresql://postgres@localhost/postgres")
+RESULT_LIMIT = 50
+
+def load_documents(conn, chunks_file):
+    """Replace the documents table contents with the passages CSV."""
+    csv.field_size_limit(sys.maxsize)
+    with open(chunks_file, 'r', encoding='utf-8', newline='') as f:
+        rows = [(r['book_name'], int(r['page_number']), r['content'], r.get('chunk_id'),
+                 int(r['chunk_index']) if r.get('chunk_index') else None)
+                for r in csv.DictReader(f)]
+
+    with conn.cursor() as cur:
+        cur.execute("TRUNCATE documents")
+        cur.executemany(
+            "INSERT INTO documents (book_name, page_number, content, chunk_id, chunk_index) "
+            "VALUES (%s, %s, %s, %s, %s)", rows)
+        cur.execute("ANALYZE documents")
+    conn.commit()
+    print(f"📥 Loaded {len(rows)} passages into documents")
+
+def search_ilike(cur, query):
+    cur.execute("SELECT extract_search_keywords(%s)", (query,))
+    keywords = cur.fetchone()[0] or []
+
+    started = time.perf_counter()
+    rows = {}
+    for keyword in keywords:
+        cur.execute("SELECT * FROM documents WHERE content ILIKE %s LIMIT %s",
+                    (f"%{keyword}%", RESULT_LIMIT))
+        for row in cur.fetchall():
+            rows[row[0]] = row
+    return time.perf_counter() - started, len(rows)
+
+def search_rpc(cur, query):
+    started = time.perf_counter()
+    cur.execute("SELECT * FROM search_documents(%s, %s)", (query, RESULT_LIMIT))
+    rows = cur.fetchall()
+    return time.perf_counter() - started, len(rows)
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def report(name, timings, hits):
+    ms = [t * 1000 for t in timings]
+    print(f"   {name:6s} p50 {percentile(ms, 50):8.2f} ms | p95 {percentile(ms, 95):8.2f} ms | "
+          f"p99 {percentile(ms, 99):8.2f} ms | mean {statistics.mean(ms):8.2f} ms | "
+          f"avg hits {statistics.mean(hits):.1f}")
+
+def run_benchmark(dsn=DEFAULT_DSN, questions_file=DEFAULT_QUESTIONS_FILE, query_count=200,
+                  repeat=3, chunks_file=None, max_query_chars=200):
+    with psycopg.connect(dsn) as conn:
+        if chunks_file:
+            load_documents(conn, chunks_file)
+
+        with conn.cursor() as cur:
+            cur.execute("SELECT COUNT(*) FROM documents")
+            print(f"📚 documents has {cur.fetchone()[0]} rows")
+
+            queries = [q['question_text'] for q in load_questions(questions_file)
+                       if len(q['question_text']) <= max_query_chars][:query_count]
+            print(f"🔍 Running {len(queries)} queries x {repeat} rounds per path...\n")
+
+            results = {'ilike': ([], []), 'rpc': ([], [])}
+            for _ in range(repeat):
+                for query in queries:
+                    for name, search in (('ilike', search_ilike), ('rpc', search_rpc)):
+                        elapsed, hits = search(cur, query)
+                        results[name][0].append(elapsed)
+                        results[name][1].append(hits)
+
+            print("⏱️  Latency per search:")
+            for name, (timings, hits) in results.items():
+                report(name, timings, hits)
+
+            speedup = statistics.median(results['ilike'][0]) / max(statistics.median(results['rpc'][0]), 1e-9)
+            print(f"\n✅ RPC median is {speedup:.1f}x faster than sequential ILIKE")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark search_documents() against per-keyword ILIKE")
+    parser.add_argument("--dsn", default=DEFAULT_DSN)
+    parser.add_argument("--questions", default=DEFAULT_QUESTIONS_FILE)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-query-chars", type=int, default=200)
+    parser.add_argument("--load", metavar="CHUNKS_CSV", help="Load documents from this passages CSV first")
+    args = parser.parse_args()
+
+    print("\n" + "="*80)
+    print("  🏎️  Search RPC Load Test")
+    print("="*80 + "\n")
+
+    run_benchmark(args.dsn, args.questions, args.queries, args.repeat, args.load, args.max_query_chars)
+
+    print("\n" + "="*80 + "\n")
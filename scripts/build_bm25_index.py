@@ -0,0 +1,240 @@
+"""
+Build a BM25 inverted index over book passages and query it locally.
+
+The app's search() sends one `ilike '%keyword%'` query per keyword, and each
+one scans the whole documents table. This script tokenizes the passages
+from chunk_book_pages.py once and builds a compact BM25 index:
+- Postings for every term are sorted passage numbers stored as deltas
+  (uint32), next to their term frequencies (uint16), all packed into flat
+  NumPy arrays with one offset per term.
+- A query only decodes the postings of its own terms, so top-k lookups
+  take milliseconds.
+
+HOW TO USE:
+1. Install dependencies:
+   pip install numpy
+
+2. Build the index from the passages CSV:
+   python build_bm25_index.py build --chunks book_chunks.csv
+
+3. Try some queries:
+   python build_bm25_index.py query "what is a p-value" -k 5
+
+4. Export for the app (plain JSON, same layout as the .npz):
+   python build_bm25_index.py export --json book_bm25_index.json
+"""
+
+import re
+import csv
+import sys
+import json
+import time
+import argparse
+from collections import Counter
+
+import numpy as np
+
+DEFAULT_INDEX_FILE = "book_bm25_index.npz"
+
+# Same stop words as extractKeywords() in interview-coach-app.html
+STOP_WORDS = {
+    'what', 'is', 'are', 'the', 'a', 'an', 'how', 'why', 'when', 'where',
+    'who', 'which', 'does', 'do', 'can', 'could', 'would', 'should',
+    'tell', 'me', 'about', 'explain', 'describe', 'define', 'of', 'in', 'on'
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+def tokenize(text):
+    """Lowercase word tokens, dropping stop words and words of 1-2 letters (like the app)."""
+    return [token for token in TOKEN_PATTERN.findall(text.lower())
+            if len(token) > 2 and token not in STOP_WORDS]
+
+def load_passages(chunks_file):
+    """
+    Load (passage_id, text) pairs from a passages or whole-page CSV.
+
+    Whole-page CSVs (no chunk_id column) get 'book_name:page_number' IDs.
+    """
+    csv.field_size_limit(sys.maxsize)
+    passages = []
+
+    with open(chunks_file, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            passage_id = row.get('chunk_id') or f"{row['book_name']}:{row['page_number']}"
+            passages.append((passage_id, row['content']))
+
+    return passages
+
+class BM25Index:
+    """BM25 inverted index with delta-encoded postings in flat NumPy arrays."""
+
+    def __init__(self, terms, offsets, doc_deltas, term_freqs, doc_lengths, doc_ids, k1=1.2, b=0.75):
+        self.terms = terms                # sorted term strings
+        self.offsets = offsets            # postings of term i: [offsets[i], offsets[i + 1])
+        self.doc_deltas = doc_deltas      # uint32 gaps between consecutive passage numbers
+        self.term_freqs = term_freqs      # uint16 term count in that passage
+        self.doc_lengths = doc_lengths    # tokens per passage
+        self.doc_ids = doc_ids            # passage number -> chunk_id
+        self.k1 = k1
+        self.b = b
+
+        self.term_ids = {term: i for i, term in enumerate(terms)}
+        self.avg_length = float(doc_lengths.mean()) if len(doc_lengths) else 0.0
+        doc_freqs = np.diff(offsets)
+        n = len(doc_lengths)
+        self.idf = np.log1p((n - doc_freqs + 0.5) / (doc_freqs + 0.5)).astype(np.float32)
+        self.length_norm = (k1 * (1 - b + b * doc_lengths / max(self.avg_length, 1e-9))).astype(np.float32)
+
+    @classmethod
+    def build(cls, passages, k1=1.2, b=0.75):
+        """Build an index from (passage_id, text) pairs."""
+        postings = {}
+        doc_lengths = []
+        doc_ids = []
+
+        for doc_number, (passage_id, text) in enumerate(passages):
+            tokens = tokenize(text)
+            doc_lengths.append(len(tokens))
+            doc_ids.append(passage_id)
+            for term, count in Counter(tokens).items():
+                postings.setdefault(term, []).append((doc_number, count))
+
+        terms = sorted(postings)
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        for i, term in enumerate(terms):
+            offsets[i + 1] = offsets[i] + len(postings[term])
+
+        doc_deltas = np.empty(offsets[-1], dtype=np.uint32)
+        term_freqs = np.empty(offsets[-1], dtype=np.uint16)
+        for i, term in enumerate(terms):
+            docs, counts = zip(*postings[term])
+            start, end = offsets[i], offsets[i + 1]
+            # Passage numbers are ascending, so store the first one and then gaps
+            doc_deltas[start:end] = np.diff(docs, prepend=0)
+            term_freqs[start:end] = np.minimum(counts, np.iinfo(np.uint16).max)
+
+        return cls(terms, offsets, doc_deltas, term_freqs,
+                   np.array(doc_lengths, dtype=np.uint32), doc_ids, k1, b)
+
+    def postings(self, term):
+        """Return (passage numbers, term frequencies) for a term."""
+        term_id = self.term_ids.get(term)
+        if term_id is None:
+            return None, None
+        start, end = self.offsets[term_id], self.offsets[term_id + 1]
+        docs = np.cumsum(self.doc_deltas[start:end], dtype=np.int64)
+        return docs, self.term_freqs[start:end]
+
+    def score_terms(self, terms):
+        """BM25 scores of every passage for a list of query terms."""
+        scores = np.zeros(len(self.doc_ids), dtype=np.float32)
+
+        for term in set(terms):
+            docs, freqs = self.postings(term)
+            if docs is None:
+                continue
+            freqs = freqs.astype(np.float32)
+            # Each passage appears once per term, so plain fancy-index += is safe
+            scores[docs] += self.idf[self.term_ids[term]] * freqs * (self.k1 + 1) / (freqs + self.length_norm[docs])
+
+        return scores
+
+    def search(self, query, k=10):
+        """Return the top-k (chunk_id, score) pairs for a free-text query."""
+        scores = self.score_terms(tokenize(query))
+        return top_k(scores, k, self.doc_ids)
+
+    def save(self, path=DEFAULT_INDEX_FILE):
+        np.savez_compressed(path,
+                            terms=np.array(self.terms), offsets=self.offsets,
+                            doc_deltas=self.doc_deltas, term_freqs=self.term_freqs,
+                            doc_lengths=self.doc_lengths, doc_ids=np.array(self.doc_ids),
+                            params=np.array([self.k1, self.b]))
+
+    @classmethod
+    def load(cls, path=DEFAULT_INDEX_FILE):
+        with np.load(path) as data:
+            k1, b = data['params']
+            return cls(data['terms'].tolist(), data['offsets'], data['doc_deltas'], data['term_freqs'],
+                       data['doc_lengths'], data['doc_ids'].tolist(), float(k1), float(b))
+
+    def export_json(self, path):
+        """Write the index as plain JSON the app can load."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'k1': self.k1,
+                'b': self.b,
+                'avg_length': self.avg_length,
+                'doc_ids': self.doc_ids,
+                'doc_lengths': self.doc_lengths.tolist(),
+                'terms': self.terms,
+                'offsets': self.offsets.tolist(),
+                'doc_deltas': self.doc_deltas.tolist(),
+                'term_freqs': self.term_freqs.tolist(),
+            }, f, separators=(',', ':'))
+
+def top_k(scores, k, doc_ids):
+    """Top-k (doc_id, score) pairs with a positive score, best first."""
+    if k <= 0:
+        return []
+    candidates = np.flatnonzero(scores > 0)
+    if len(candidates) > k:
+        candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+    ranked = candidates[np.argsort(-scores[candidates], kind='stable')]
+    return [(doc_ids[i], float(scores[i])) for i in ranked]
+
+def build_index(chunks_file="book_chunks.csv", index_file=DEFAULT_INDEX_FILE):
+    print(f"📂 Loading passages from '{chunks_file}'...")
+    passages = load_passages(chunks_file)
+
+    if not passages:
+        print(f"❌ No passages found in '{chunks_file}'")
+        return
+
+    started = time.perf_counter()
+    index = BM25Index.build(passages)
+    index.save(index_file)
+    elapsed = time.perf_counter() - started
+
+    print(f"✅ Indexed {len(passages)} passages in {elapsed:.1f}s -> '{index_file}'")
+    print(f"\n📊 Index Statistics:")
+    print(f"   - Terms: {len(index.terms)}")
+    print(f"   - Postings: {len(index.doc_deltas)}")
+    print(f"   - Average passage length: {index.avg_length:.0f} tokens")
+
+def query_index(query, k=10, index_file=DEFAULT_INDEX_FILE):
+    index = BM25Index.load(index_file)
+
+    started = time.perf_counter()
+    results = index.search(query, k)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    print(f"🔍 '{query}' -> {len(results)} results in {elapsed_ms:.2f} ms\n")
+    for rank, (doc_id, score) in enumerate(results, 1):
+        print(f"  {rank:2d}. {doc_id}  (score {score:.2f})")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="BM25 index over book passages")
+    parser.add_argument("--index", default=DEFAULT_INDEX_FILE)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_cmd = commands.add_parser("build", help="Build the index from a passages CSV")
+    build_cmd.add_argument("--chunks", default="book_chunks.csv")
+
+    query_cmd = commands.add_parser("query", help="Run a top-k query")
+    query_cmd.add_argument("query")
+    query_cmd.add_argument("-k", type=int, default=10)
+
+    export_cmd = commands.add_parser("export", help="Export the index as JSON for the app")
+    export_cmd.add_argument("--json", default="book_bm25_index.json")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build_index(args.chunks, args.index)
+    elif args.command == "query":
+        query_index(args.query, args.k, args.index)
+    elif args.command == "export":
+        BM25Index.load(args.index).export_json(args.json)
+        print(f"✅ Exported '{args.index}' to '{args.json}'")
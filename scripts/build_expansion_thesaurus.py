@@ -0,0 +1,232 @@
+"""
+Build a keyword expansion thesaurus from the book passages and questions.
+
+The app's semanticExpansions map has seven hand-written entries. This
+script learns expansions from the corpus itself: terms that occur near
+each other much more often than chance (positive pointwise mutual
+information over a sliding window) are treated as related.
+
+Co-occurrence counts are accumulated as a sparse term x term matrix. Each
+term keeps its top-k partners by count x PMI (plain PMI overrates pairs
+seen only a handful of times), so the output stays small:
+- search_expansions.json: {"term": ["related", ...]}, the same shape as
+  semanticExpansions, for the app
+- search_expansions.sql: upserts into the search_expansions table used by
+  the search_documents() RPC (supabase/setup.sql)
+
+HOW TO USE:
+1. Install dependencies:
+   pip install numpy scipy
+
+2. Run this script (after chunk_book_pages.py):
+   python build_expansion_thesaurus.py
+   python build_expansion_thesaurus.py --window 8 --top-k 4
+
+3. Run search_expansions.sql in the Supabase SQL Editor and put
+   search_expansions.json next to interview-coach-app.html
+"""
+
+import os
+import json
+import time
+import argparse
+from collections import Counter
+
+import numpy as np
+from scipy.sparse import coo_matrix
+
+from build_bm25_index import tokenize, load_passages
+from question_keys import DEFAULT_QUESTIONS_FILE, load_questions
+
+DEFAULT_WINDOW = 5
+DEFAULT_TOP_K = 5
+MIN_TERM_COUNT = 5
+MIN_PAIR_COUNT = 3
+MAX_VOCABULARY = 20000
+
+# Terms in more than this share of passages relate to everything. Measured
+# over the book passages only: the many short question strings would make
+# almost every term look rare.
+MAX_DOC_RATIO = 0.2
+
+# Function words pass the ratio above in passages about anything, and as
+# expansions they become ILIKE '%not%' searches in the app. tokenize() has
+# already dropped the app's own stop words and anything under 3 letters.
+ENGLISH_STOP_WORDS = frozenset('''
+    about above after again against all almost along already also although always among and another
+    any anyone anything are around because been before being below between both but came cannot come
+    did different does doing done down during each either else enough even ever every few first for
+    four from further get gets getting give given gives go goes going got had has have having her here
+    hers herself him himself his however into its itself just last least less let like made make makes
+    many may might more most much must near need needs neither never new next nine nor not nothing now
+    off often once one ones only onto other others otherwise our ours ourselves out over own part per
+    perhaps put rather same see seen seven several she since six some something sometimes still such
+    take taken ten than that their theirs them themselves then there therefore these they thing things
+    third this those though three through thus together too toward towards two under until upon use
+    used uses using very via want was way ways well were what whatever whether while whole whom whose
+    will with within without yet you your yours yourself
+'''.split())
+
+# Context distribution smoothing: raising partner counts to 0.75 stops rare
+# partners from getting huge PMI just for being rare
+CONTEXT_SMOOTHING = 0.75
+
+# Hand-written entries from the app win over learned ones
+APP_EXPANSIONS = {
+    'neural': ['network', 'neuron', 'deep learning', 'backpropagation'],
+    'gradient': ['descent', 'backpropagation', 'optimization'],
+    'decision': ['tree', 'forest', 'classification'],
+    'machine': ['learning', 'ml', 'model', 'algorithm'],
+    'deep': ['learning', 'neural', 'network'],
+    'regression': ['linear', 'logistic', 'prediction'],
+    'classification': ['supervised', 'model', 'predict']
+}
+
+def load_texts(chunks_file, questions_file):
+    """(passage texts, question texts)"""
+    passages, questions = [], []
+
+    if os.path.exists(chunks_file):
+        passages = [text for _, text in load_passages(chunks_file)]
+    else:
+        print(f"  ⚠️  File not found: {chunks_file}")
+
+    if os.path.exists(questions_file):
+        questions = [f"{q['question_text']} {q.get('answer_text') or ''}" for q in load_questions(questions_file)]
+    else:
+        print(f"  ⚠️  File not found: {questions_file}")
+
+    return passages, questions
+
+def cooccurrence_matrix(token_lists, vocabulary, window):
+    """Symmetric sparse counts of term pairs within `window` tokens of each other."""
+    left_parts, right_parts = [], []
+
+    for tokens in token_lists:
+        ids = np.array([vocabulary.get(token, -1) for token in tokens], dtype=np.int32)
+        ids = ids[ids >= 0]
+        for offset in range(1, window + 1):
+            if len(ids) <= offset:
+                break
+            left, right = ids[:-offset], ids[offset:]
+            distinct = left != right
+            left_parts.append(left[distinct])
+            right_parts.append(right[distinct])
+
+    size = len(vocabulary)
+    if not left_parts:
+        return coo_matrix((size, size), dtype=np.float32).tocsr()
+
+    left = np.concatenate(left_parts)
+    right = np.concatenate(right_parts)
+    ones = np.ones(len(left), dtype=np.float32)
+    counts = coo_matrix((ones, (left, right)), shape=(size, size)).tocsr()  # duplicates are summed
+    return (counts + counts.T).tocsr()
+
+def top_pmi_partners(counts, top_k, min_pair_count=MIN_PAIR_COUNT):
+    """For every term row, the top-k (partner id, PMI) pairs with PMI > 0, ranked by count x PMI."""
+    total = counts.sum()
+    marginals = np.asarray(counts.sum(axis=1)).ravel()
+    context = marginals ** CONTEXT_SMOOTHING
+    context_total = context.sum()
+    partners = {}
+
+    for term_id in range(counts.shape[0]):
+        start, end = counts.indptr[term_id], counts.indptr[term_id + 1]
+        if start == end:
+            continue
+        others = counts.indices[start:end]
+        pair_counts = counts.data[start:end]
+
+        keep = pair_counts >= min_pair_count
+        if not keep.any():
+            continue
+        others, pair_counts = others[keep], pair_counts[keep]
+
+        pmi = np.log((pair_counts / total) / ((marginals[term_id] / total) * (context[others] / context_total)))
+        positive = pmi > 0
+        if not positive.any():
+            continue
+        others, pmi, pair_counts = others[positive], pmi[positive], pair_counts[positive]
+
+        order = np.argsort(-(pair_counts * pmi), kind='stable')[:top_k]
+        partners[term_id] = list(zip(others[order].tolist(), pmi[order].tolist()))
+
+    return partners
+
+def sql_literal(text):
+    return "'" + text.replace("'", "''") + "'"
+
+def write_sql(expansions, sql_file):
+    """Upserts for the search_expansions table."""
+    with open(sql_file, 'w', encoding='utf-8') as f:
+        f.write("-- Generated by scripts/build_expansion_thesaurus.py\n")
+        f.write("INSERT INTO search_expansions (term, related) VALUES\n")
+        rows = [f"    ({sql_literal(term)}, ARRAY[{', '.join(sql_literal(r) for r in related)}]::TEXT[])"
+                for term, related in sorted(expansions.items())]
+        f.write(",\n".join(rows))
+        f.write("\nON CONFLICT (term) DO UPDATE SET related = EXCLUDED.related;\n")
+
+def build_thesaurus(chunks_file="book_chunks.csv", questions_file=DEFAULT_QUESTIONS_FILE,
+                    json_file="search_expansions.json", sql_file="search_expansions.sql",
+                    window=DEFAULT_WINDOW, top_k=DEFAULT_TOP_K):
+    print(f"📂 Loading passages and questions...")
+    passages, questions = load_texts(chunks_file, questions_file)
+    if not passages and not questions:
+        print("❌ Nothing to learn from!")
+        return
+
+    started = time.perf_counter()
+    passage_tokens = [tokenize(text) for text in passages]
+    token_lists = passage_tokens + [tokenize(text) for text in questions]
+
+    # Numbers and page furniture ("chapter5") make poor expansions. Stop words
+    # are left out of the vocabulary, so they are neither terms nor partners.
+    term_counts = Counter(token for tokens in token_lists for token in tokens
+                          if token.isalpha() and token not in ENGLISH_STOP_WORDS)
+    ratio_docs = passage_tokens or token_lists  # Questions only if there are no passages
+    doc_counts = Counter(token for tokens in ratio_docs for token in set(tokens))
+    max_docs = MAX_DOC_RATIO * len(ratio_docs)
+    frequent = [term for term, count in term_counts.most_common(MAX_VOCABULARY)
+                if count >= MIN_TERM_COUNT and doc_counts[term] <= max_docs]
+    vocabulary = {term: i for i, term in enumerate(frequent)}
+    print(f"🧮 Counting co-occurrences of {len(vocabulary)} terms (window {window})...")
+
+    counts = cooccurrence_matrix(token_lists, vocabulary, window)
+    partners = top_pmi_partners(counts, top_k)
+
+    expansions = {frequent[term_id]: [frequent[other] for other, _ in pairs]
+                  for term_id, pairs in partners.items()}
+    expansions.update(APP_EXPANSIONS)
+
+    with open(json_file, 'w', encoding='utf-8') as f:
+        json.dump(expansions, f, separators=(',', ':'), sort_keys=True)
+    write_sql(expansions, sql_file)
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ Built expansions for {len(expansions)} terms in {elapsed:.1f}s")
+    print(f"   - {json_file} ({os.path.getsize(json_file) // 1024} KB)")
+    print(f"   - {sql_file}")
+
+    print(f"\n🔎 Sample expansions:")
+    for term in ['variance', 'regression', 'hypothesis', 'sample', 'probability']:
+        if term in expansions:
+            print(f"   - {term}: {', '.join(expansions[term])}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Learn keyword expansions from corpus co-occurrence (PMI)")
+    parser.add_argument("--chunks", default="book_chunks.csv")
+    parser.add_argument("--questions", default=DEFAULT_QUESTIONS_FILE)
+    parser.add_argument("--json", default="search_expansions.json")
+    parser.add_argument("--sql", default="search_expansions.sql")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW)
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K)
+    args = parser.parse_args()
+
+    print("\n" + "="*80)
+    print("  📖 Expansion Thesaurus Builder")
+    print("="*80 + "\n")
+
+    build_thesaurus(args.chunks, args.questions, args.json, args.sql, args.window, args.top_k)
+
+    print("\n" + "="*80 + "\n")
@@ -0,0 +1,245 @@
+"""
+Build an LSA (TF-IDF + truncated SVD) semantic index over book passages
+and interview questions.
+
+Keyword search and the app's hard-coded semanticExpansions map miss
+paraphrases ("spread of the data" vs "variance"). LSA maps passages,
+questions and queries into one dense space where related wording lands
+close together, with plain NumPy on a CPU.
+
+The vectors, term vectors and idf weights are stored as .npy files and
+opened with mmap_mode='r': only the term rows a query uses and the vector
+blocks being scanned are paged in, so they cost the same for 1k or 1M
+passages. vocabulary.json is loaded whole at startup, so startup time and
+memory grow with the number of distinct terms.
+
+HOW TO USE:
+1. Install dependencies:
+   pip install numpy scipy
+
+2. Build the index (passages from chunk_book_pages.py + merged questions):
+   python build_lsa_index.py build
+
+3. Query it:
+   python build_lsa_index.py query "how spread out is the data" -k 5
+   python build_lsa_index.py query "how spread out is the data" --kind question
+"""
+
+import os
+import json
+import time
+import argparse
+from collections import Counter
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.linalg import svds
+
+from build_bm25_index import tokenize, load_passages
+from question_keys import DEFAULT_QUESTIONS_FILE, load_questions
+
+DEFAULT_INDEX_DIR = "book_lsa_index"
+DEFAULT_DIMENSIONS = 128
+MIN_DOC_FREQ = 2
+
+# Scan this many vectors per matrix-vector product
+BLOCK_ROWS = 65536
+
+KINDS = {'passage': 0, 'question': 1}
+
+def load_documents(chunks_file, questions_file):
+    """Return (ids, kinds, texts) for every passage and question."""
+    ids, kinds, texts = [], [], []
+
+    if os.path.exists(chunks_file):
+        for passage_id, text in load_passages(chunks_file):
+            ids.append(passage_id)
+            kinds.append(KINDS['passage'])
+            texts.append(text)
+    else:
+        print(f"  ⚠️  File not found: {chunks_file}")
+
+    if os.path.exists(questions_file):
+        for row in load_questions(questions_file):
+            ids.append(row['content_hash'])
+            kinds.append(KINDS['question'])
+            texts.append(f"{row['question_text']} {row.get('answer_text') or ''}")
+    else:
+        print(f"  ⚠️  File not found: {questions_file}")
+
+    return ids, kinds, texts
+
+def tfidf_matrix(texts, min_doc_freq=MIN_DOC_FREQ):
+    """Sparse sublinear TF-IDF matrix (rows L2-normalized), vocabulary and idf weights."""
+    counts = [Counter(tokenize(text)) for text in texts]
+
+    doc_freq = Counter()
+    for doc_counts in counts:
+        doc_freq.update(doc_counts.keys())
+
+    vocabulary = {term: i for i, term in enumerate(sorted(t for t, df in doc_freq.items() if df >= min_doc_freq))}
+    idf = np.zeros(len(vocabulary), dtype=np.float32)
+    for term, term_id in vocabulary.items():
+        idf[term_id] = np.log((1 + len(texts)) / (1 + doc_freq[term])) + 1
+
+    rows, cols, values = [], [], []
+    for doc_number, doc_counts in enumerate(counts):
+        for term, count in doc_counts.items():
+            term_id = vocabulary.get(term)
+            if term_id is not None:
+                rows.append(doc_number)
+                cols.append(term_id)
+                values.append((1 + np.log(count)) * idf[term_id])
+
+    matrix = csr_matrix((np.array(values, dtype=np.float32), (rows, cols)),
+                        shape=(len(texts), len(vocabulary)))
+
+    norms = np.sqrt(matrix.multiply(matrix).sum(axis=1)).A1
+    norms[norms == 0] = 1
+    matrix = csr_matrix(matrix.multiply(1 / norms[:, None]))
+
+    return matrix, vocabulary, idf
+
+def normalize_rows(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return vectors / norms
+
+def build_index(chunks_file="book_chunks.csv", questions_file=DEFAULT_QUESTIONS_FILE,
+                index_dir=DEFAULT_INDEX_DIR, dimensions=DEFAULT_DIMENSIONS):
+    print(f"📂 Loading passages and questions...")
+    ids, kinds, texts = load_documents(chunks_file, questions_file)
+
+    if not texts:
+        print("❌ Nothing to index!")
+        return
+
+    started = time.perf_counter()
+    matrix, vocabulary, idf = tfidf_matrix(texts)
+
+    # svds needs k < min(matrix shape)
+    dimensions = min(dimensions, min(matrix.shape) - 1)
+    if dimensions < 1:
+        print("❌ Corpus too small for LSA")
+        return
+
+    print(f"🧮 SVD of {matrix.shape[0]} x {matrix.shape[1]} TF-IDF matrix to {dimensions} dimensions...")
+    _, _, vt = svds(matrix, k=dimensions)
+
+    # Term vectors (vocab x dims). Documents and queries are both folded in
+    # as TF-IDF @ term_vectors, then L2-normalized for cosine similarity.
+    term_vectors = np.ascontiguousarray(vt.T, dtype=np.float32)
+    doc_vectors = normalize_rows(matrix @ term_vectors).astype(np.float32)
+
+    os.makedirs(index_dir, exist_ok=True)
+    np.save(os.path.join(index_dir, 'vectors.npy'), doc_vectors)
+    np.save(os.path.join(index_dir, 'term_vectors.npy'), term_vectors)
+    np.save(os.path.join(index_dir, 'idf.npy'), idf)
+    np.save(os.path.join(index_dir, 'ids.npy'), np.array(ids))
+    np.save(os.path.join(index_dir, 'kinds.npy'), np.array(kinds, dtype=np.uint8))
+    with open(os.path.join(index_dir, 'vocabulary.json'), 'w', encoding='utf-8') as f:
+        json.dump(vocabulary, f, separators=(',', ':'))
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ Indexed {len(ids)} documents in {elapsed:.1f}s -> '{index_dir}/'")
+    print(f"\n📊 Index Statistics:")
+    print(f"   - Passages: {kinds.count(KINDS['passage'])}")
+    print(f"   - Questions: {kinds.count(KINDS['question'])}")
+    print(f"   - Vocabulary: {len(vocabulary)} terms (df >= {MIN_DOC_FREQ})")
+    print(f"   - Dimensions: {dimensions}")
+
+class LSAIndex:
+    """Read-only LSA index backed by memory-mapped .npy files."""
+
+    def __init__(self, index_dir=DEFAULT_INDEX_DIR):
+        self.vectors = np.load(os.path.join(index_dir, 'vectors.npy'), mmap_mode='r')
+        self.term_vectors = np.load(os.path.join(index_dir, 'term_vectors.npy'), mmap_mode='r')
+        self.idf = np.load(os.path.join(index_dir, 'idf.npy'), mmap_mode='r')
+        self.ids = np.load(os.path.join(index_dir, 'ids.npy'), mmap_mode='r')
+        self.kinds = np.load(os.path.join(index_dir, 'kinds.npy'), mmap_mode='r')
+        with open(os.path.join(index_dir, 'vocabulary.json'), 'r', encoding='utf-8') as f:
+            self.vocabulary = json.load(f)
+
+    def embed(self, text):
+        """Fold a query into LSA space (unit vector, or None if no known terms)."""
+        counts = Counter(term for term in tokenize(text) if term in self.vocabulary)
+        if not counts:
+            return None
+
+        term_ids = np.array([self.vocabulary[term] for term in counts])
+        weights = np.array([1 + np.log(count) for count in counts.values()], dtype=np.float32)
+        weights *= self.idf[term_ids]
+
+        vector = weights @ self.term_vectors[term_ids]
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def search_vector(self, vector, k=10, kind=None):
+        """Blocked matrix-vector top-k by cosine similarity: [(id, score), ...]."""
+        kind_code = KINDS[kind] if kind else None
+        best_rows = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+
+        for start in range(0, len(self.vectors), BLOCK_ROWS):
+            scores = self.vectors[start:start + BLOCK_ROWS] @ vector
+            if kind_code is not None:
+                scores = np.where(self.kinds[start:start + BLOCK_ROWS] == kind_code, scores, -np.inf)
+
+            rows = np.arange(start, start + len(scores))
+            if len(scores) > k:
+                keep = np.argpartition(-scores, k - 1)[:k]
+                rows, scores = rows[keep], scores[keep]
+
+            # Merge this block's winners with the running top-k
+            best_rows = np.concatenate([best_rows, rows])
+            best_scores = np.concatenate([best_scores, scores])
+            if len(best_scores) > k:
+                keep = np.argpartition(-best_scores, k - 1)[:k]
+                best_rows, best_scores = best_rows[keep], best_scores[keep]
+
+        order = np.argsort(-best_scores, kind='stable')
+        return [(str(self.ids[row]), float(score))
+                for row, score in zip(best_rows[order], best_scores[order]) if np.isfinite(score)]
+
+    def search(self, query, k=10, kind=None):
+        """Top-k passages/questions for a free-text query. kind: 'passage', 'question' or None."""
+        if k <= 0:
+            return []
+        vector = self.embed(query)
+        if vector is None:
+            return []
+        return self.search_vector(vector, k, kind)
+
+def query_index(query, k=10, kind=None, index_dir=DEFAULT_INDEX_DIR):
+    started = time.perf_counter()
+    index = LSAIndex(index_dir)
+    loaded = time.perf_counter()
+    results = index.search(query, k, kind)
+    finished = time.perf_counter()
+
+    print(f"🔍 '{query}' -> {len(results)} results "
+          f"(load {(loaded - started) * 1000:.1f} ms, query {(finished - loaded) * 1000:.2f} ms)\n")
+    for rank, (doc_id, score) in enumerate(results, 1):
+        print(f"  {rank:2d}. {doc_id}  (cosine {score:.3f})")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LSA semantic index over book passages and questions")
+    parser.add_argument("--index-dir", default=DEFAULT_INDEX_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_cmd = commands.add_parser("build", help="Build TF-IDF + SVD vectors")
+    build_cmd.add_argument("--chunks", default="book_chunks.csv")
+    build_cmd.add_argument("--questions", default=DEFAULT_QUESTIONS_FILE)
+    build_cmd.add_argument("--dimensions", type=int, default=DEFAULT_DIMENSIONS)
+
+    query_cmd = commands.add_parser("query", help="Run a semantic top-k query")
+    query_cmd.add_argument("query")
+    query_cmd.add_argument("-k", type=int, default=10)
+    query_cmd.add_argument("--kind", choices=sorted(KINDS))
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build_index(args.chunks, args.questions, args.index_dir, args.dimensions)
+    elif args.command == "query":
+        query_index(args.query, args.k, args.kind, args.index_dir)
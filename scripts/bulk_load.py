@@ -0,0 +1,171 @@
+"""
+Bulk-load questions and book pages into a fresh Postgres with COPY.
+
+Loading backups/interview_questions_data.csv and the books CSV through the
+Supabase UI or row inserts manages thousands of rows a minute. This script
+streams both CSVs over one connection with COPY FROM STDIN into temporary
+staging tables, then merges them in the same transaction:
+- interview_questions: upserted on content_hash (computed while streaming,
+  same key as question_keys.py). Rows whose fields didn't change are not
+  rewritten, and only columns the CSV has are updated.
+- documents: every book in the CSV is replaced (its old rows deleted, the
+  new ones inserted), so page CSVs (add_books_enhanced.py) and passage CSVs
+  (chunk_book_pages.py) can both be re-loaded safely.
+
+Book rows go to COPY as raw CSV bytes, without being parsed in Python.
+Nothing is visible until the final commit, and an error anywhere leaves
+the database as it was.
+
+HOW TO USE:
+1. Install dependencies:
+   pip install "psycopg[binary]"
+
+2. Point it at a Postgres with supabase/setup.sql applied (direct database
+   connection string, from Supabase: Project Settings -> Database):
+   python bulk_load.py --dsn postgresql://postgres@localhost/postgres
+   python bulk_load.py --dsn ... --questions backups/interview_questions_data.csv --books book_chunks.csv
+"""
+
+import os
+import csv
+import sys
+import time
+import argparse
+
+import psycopg
+
+from upload_questions import iter_question_rows
+
+DEFAULT_DSN = os.environ.get("DATABASE_URL", "postgresql://postgres@localhost/postgres")
+DEFAULT_QUESTIONS_CSV = "backups/interview_questions_data.csv"
+DEFAULT_BOOKS_CSV = "new_books_data_enhanced.csv"
+
+# documents columns a books CSV may have (page CSVs have the first three)
+DOCUMENT_COLUMNS = {'book_name': 'TEXT', 'page_number': 'INTEGER', 'content': 'TEXT', 'chunk_id': 'TEXT',
+                    'chunk_index': 'INTEGER', 'char_start': 'INTEGER', 'char_end': 'INTEGER'}
+
+COPY_BLOCK_BYTES = 1 << 20
+
+def copy_questions(cur, csv_file):
+    """COPY cleaned question rows into questions_staging. Returns (columns, rows)."""
+    csv.field_size_limit(sys.maxsize)
+
+    with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+        columns, rows = iter_question_rows(f)
+        # staging_row numbers rows in file order (COPY leaves it to the identity)
+        cur.execute(f"CREATE TEMP TABLE questions_staging ({', '.join(c + ' TEXT' for c in columns)}, "
+                    f"staging_row BIGINT GENERATED ALWAYS AS IDENTITY) ON COMMIT DROP")
+
+        count = 0
+        with cur.copy(f"COPY questions_staging ({', '.join(columns)}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row([row[c] for c in columns])
+                count += 1
+
+    return columns, count
+
+def merge_questions(cur, columns):
+    """Upsert questions_staging into interview_questions. Returns rows inserted or changed."""
+    column_list = ', '.join(columns)
+    fields = [c for c in columns if c != 'content_hash']
+    updates = ', '.join(f"{c} = EXCLUDED.{c}" for c in fields)
+    current = ', '.join(f"interview_questions.{c}" for c in fields)
+    incoming = ', '.join(f"EXCLUDED.{c}" for c in fields)
+
+    # DISTINCT ON: one statement can't upsert the same key twice. The first row
+    # in the file wins, like upload_questions.py
+    cur.execute(f"""
+        INSERT INTO interview_questions ({column_list})
+        SELECT DISTINCT ON (content_hash) {column_list} FROM questions_staging ORDER BY content_hash, staging_row
+        ON CONFLICT (content_hash) DO UPDATE SET {updates}
+        WHERE ({current}) IS DISTINCT FROM ({incoming})
+    """)
+    return cur.rowcount
+
+def copy_books(cur, csv_file):
+    """Stream the books CSV bytes into books_staging. Returns the columns it had."""
+    with open(csv_file, 'rb') as f:
+        header = next(csv.reader([f.readline().decode('utf-8-sig')]))
+        unknown = [c for c in header if c not in DOCUMENT_COLUMNS]
+        if unknown or not {'book_name', 'content'} <= set(header):
+            raise ValueError(f"{csv_file}: expected book_name, content and optional "
+                             f"{', '.join(DOCUMENT_COLUMNS)} columns, got {', '.join(header)}")
+
+        cur.execute(f"CREATE TEMP TABLE books_staging "
+                    f"({', '.join(f'{c} {DOCUMENT_COLUMNS[c]}' for c in header)}) ON COMMIT DROP")
+
+        with cur.copy(f"COPY books_staging ({', '.join(header)}) FROM STDIN WITH (FORMAT csv)") as copy:
+            while block := f.read(COPY_BLOCK_BYTES):
+                copy.write(block)
+
+    return header
+
+def merge_books(cur, columns):
+    """Replace every book in books_staging. Returns (rows deleted, rows inserted)."""
+    cur.execute("DELETE FROM documents WHERE book_name IN (SELECT DISTINCT book_name FROM books_staging)")
+    deleted = cur.rowcount
+
+    column_list = ', '.join(columns)
+    cur.execute(f"INSERT INTO documents ({column_list}) SELECT {column_list} FROM books_staging "
+                f"WHERE coalesce(content, '') <> ''")
+    return deleted, cur.rowcount
+
+def bulk_load(dsn=DEFAULT_DSN, questions_file=None, books_file=None):
+    started = time.perf_counter()
+
+    with psycopg.connect(dsn) as conn:
+        with conn.cursor() as cur:
+            if questions_file:
+                print(f"📥 COPY {questions_file} -> questions_staging...")
+                step = time.perf_counter()
+                columns, count = copy_questions(cur, questions_file)
+                copied = time.perf_counter()
+                changed = merge_questions(cur, columns)
+                merged = time.perf_counter()
+                print(f"   ✅ {count} rows copied in {copied - step:.2f}s ({count / max(copied - step, 1e-9):.0f} rows/s)")
+                print(f"   ✅ {changed} questions inserted or changed in {merged - copied:.2f}s")
+
+            if books_file:
+                print(f"📥 COPY {books_file} -> books_staging...")
+                step = time.perf_counter()
+                columns = copy_books(cur, books_file)
+                cur.execute("SELECT COUNT(*) FROM books_staging")
+                count = cur.fetchone()[0]
+                copied = time.perf_counter()
+                deleted, inserted = merge_books(cur, columns)
+                merged = time.perf_counter()
+                print(f"   ✅ {count} rows copied in {copied - step:.2f}s ({count / max(copied - step, 1e-9):.0f} rows/s)")
+                print(f"   ✅ Replaced {deleted} documents rows with {inserted} in {merged - copied:.2f}s")
+
+            cur.execute("ANALYZE interview_questions")
+            cur.execute("ANALYZE documents")
+
+        print(f"\n💾 Committing...")
+
+    print(f"✅ Done in {time.perf_counter() - started:.2f}s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="COPY questions and book CSVs into Postgres via staging tables")
+    parser.add_argument("--dsn", default=DEFAULT_DSN)
+    parser.add_argument("--questions", default=DEFAULT_QUESTIONS_CSV, help="Questions CSV ('' to skip)")
+    parser.add_argument("--books", default=DEFAULT_BOOKS_CSV, help="Book pages or passages CSV ('' to skip)")
+    args = parser.parse_args()
+
+    files = {}
+    for name, path in (('questions', args.questions), ('books', args.books)):
+        if path and not os.path.exists(path):
+            print(f"  ⚠️  File not found: {path}, skipping {name}")
+            path = None
+        files[name] = path
+
+    if not any(files.values()):
+        print("❌ Nothing to load!")
+        sys.exit(1)
+
+    print("\n" + "="*80)
+    print("  🚚 COPY Bulk Loader")
+    print("="*80 + "\n")
+
+    bulk_load(args.dsn, files['questions'], files['books'])
+
+    print("\n" + "="*80 + "\n")
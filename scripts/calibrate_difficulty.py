@@ -0,0 +1,267 @@
+"""
+Calibrate question difficulty from user_answers with item response theory.
+
+The difficulty labels come from upload heuristics (answer length, keywords,
+category). This job fits a 1PL (Rasch) or 2PL IRT model to what users
+actually got right and writes the estimates to interview_questions
+(irt_difficulty, irt_discrimination, irt_responses, irt_calibrated_at).
+The heuristic difficulty column is left alone.
+
+Model: user u answers question q correctly with probability
+    sigmoid(a_q * (theta_u - b_q))
+theta_u is the user's ability, b_q the question's difficulty, a_q its
+discrimination (fixed at 1 for 1PL). It is fitted in slope-intercept form,
+sigmoid(a_q * theta_u + d_q) with b_q = -d_q / a_q, where each question's
+update is a concave logistic regression. Priors keep sparse users and
+questions near the middle: theta ~ N(0, 1), d ~ N(0, D_PRIOR_SD^2),
+a ~ N(1, A_PRIOR_SD^2).
+
+The responses are a sparse users x questions matrix, loaded as one
+(user, question, answered, correct) row per answered pair; repeat answers
+count as extra trials. Fitting is MAP by block coordinate Newton: each
+iteration updates all abilities, then every question's (a, d) together (a
+2 x 2 step per question), in closed form from gradients and curvatures
+summed with np.bincount over the nonzero pairs. That is O(answered pairs)
+per iteration, and it converges in a few dozen.
+
+Only answers still in user_answers count (archived months are gone), and
+questions with fewer than --min-responses answers aren't written.
+
+HOW TO USE:
+1. Install dependencies:
+   pip install numpy "psycopg[binary]"
+
+2. Run it (direct database connection string):
+   python calibrate_difficulty.py --dsn postgresql://postgres@localhost/postgres
+   python calibrate_difficulty.py --dsn ... --model 1pl --min-responses 20
+   python calibrate_difficulty.py --dsn ... --dry-run      (fit and report, write nothing)
+"""
+
+import os
+import time
+import argparse
+
+import numpy as np
+import psycopg
+
+DEFAULT_DSN = os.environ.get("DATABASE_URL", "postgresql://postgres@localhost/postgres")
+DEFAULT_MIN_RESPONSES = 10
+DEFAULT_MAX_ITERATIONS = 100
+TOLERANCE = 1e-3  # Largest parameter change that counts as converged
+
+D_PRIOR_SD = 2.0
+A_PRIOR_SD = 0.5
+A_RANGE = (0.2, 4.0)
+MAX_STEP = 1.0  # Newton steps are capped so early iterations can't overshoot
+
+RESPONSES_SQL = """
+    SELECT user_id::TEXT, question_id::TEXT, COUNT(*), COUNT(*) FILTER (WHERE is_correct)
+    FROM user_answers
+    WHERE user_id IS NOT NULL AND question_id IS NOT NULL AND is_correct IS NOT NULL
+    GROUP BY user_id, question_id
+"""
+
+class IRTModel:
+    """MAP fit of a 1PL/2PL model over (user, question, answered, correct) arrays."""
+
+    def __init__(self, users, questions, answered, correct, two_parameter=True):
+        self.users = np.asarray(users, dtype=np.int64)
+        self.questions = np.asarray(questions, dtype=np.int64)
+        self.answered = np.asarray(answered, dtype=np.float64)
+        self.correct = np.asarray(correct, dtype=np.float64)
+        self.two_parameter = two_parameter
+
+        self.theta = np.zeros(int(self.users.max()) + 1 if len(self.users) else 0)
+        self.d = np.zeros(int(self.questions.max()) + 1 if len(self.questions) else 0)
+        self.a = np.ones(len(self.d))
+        self.iterations = 0
+
+    @property
+    def b(self):
+        """Difficulty: the ability with a 50% chance of answering correctly."""
+        return -self.d / self.a
+
+    def sums(self, index, values, size):
+        return np.bincount(index, weights=values, minlength=size)
+
+    def residuals(self):
+        """(a per pair, theta per pair, correct - expected, Fisher weight n p (1 - p))."""
+        a = self.a[self.questions]
+        theta = self.theta[self.users]
+
+        # In place: these arrays have one entry per answered pair
+        p = np.multiply(a, theta)
+        p += self.d[self.questions]
+        np.negative(p, out=p)
+        np.exp(p, out=p)
+        p += 1
+        np.reciprocal(p, out=p)
+        w = np.multiply(self.answered, p)
+        r = np.subtract(self.correct, w)
+        np.subtract(1, p, out=p)
+        w *= p
+        return a, theta, r, w
+
+    def newton_step(self, gradient, curvature):
+        return np.clip(gradient / curvature, -MAX_STEP, MAX_STEP)
+
+    def recenter(self):
+        """
+        Shift the ability scale to where the priors peak.
+
+        Moving every theta by c and every d by -a c leaves the likelihood
+        unchanged, so block updates crawl along that direction. The best
+        c has a closed form.
+        """
+        shift = -(self.theta.sum() - (self.a * self.d).sum() / D_PRIOR_SD ** 2) / (
+            len(self.theta) + (self.a * self.a).sum() / D_PRIOR_SD ** 2)
+        self.theta += shift
+        self.d -= self.a * shift
+        return abs(shift)
+
+    def iterate(self):
+        """Update the abilities, then the question parameters. Returns the largest change."""
+        a, _, r, w = self.residuals()
+        step = self.newton_step(self.sums(self.users, a * r, len(self.theta)) - self.theta,
+                                self.sums(self.users, a * a * w, len(self.theta)) + 1.0)
+        self.theta += step
+        change = np.abs(step).max(initial=0)
+
+        _, theta, r, w = self.residuals()
+        gradient_d = self.sums(self.questions, r, len(self.d)) - self.d / D_PRIOR_SD ** 2
+        curvature_d = self.sums(self.questions, w, len(self.d)) + 1.0 / D_PRIOR_SD ** 2
+        if not self.two_parameter:
+            step = self.newton_step(gradient_d, curvature_d)
+            self.d += step
+            return max(change, np.abs(step).max(initial=0), self.recenter())
+
+        # a and d move together: a 2 x 2 Newton step per question
+        gradient_a = self.sums(self.questions, r * theta, len(self.a)) - (self.a - 1) / A_PRIOR_SD ** 2
+        curvature_a = self.sums(self.questions, w * theta * theta, len(self.a)) + 1.0 / A_PRIOR_SD ** 2
+        cross = self.sums(self.questions, w * theta, len(self.a))
+        determinant = curvature_a * curvature_d - cross * cross
+        step_a = np.clip((curvature_d * gradient_a - cross * gradient_d) / determinant, -MAX_STEP, MAX_STEP)
+        step_d = (curvature_a * gradient_d - cross * gradient_a) / determinant
+
+        # Where a hits its bounds it stays put, so d takes its own 1-D step
+        new_a = np.clip(self.a + step_a, *A_RANGE)
+        step_d = self.newton_step(np.where(new_a != self.a + step_a, gradient_d / curvature_d, step_d), 1.0)
+        self.d += step_d
+        change = max(change, np.abs(step_d).max(initial=0), np.abs(new_a - self.a).max(initial=0))
+        self.a = new_a
+
+        return max(change, self.recenter())
+
+    def fit(self, max_iterations=DEFAULT_MAX_ITERATIONS, tolerance=TOLERANCE):
+        for self.iterations in range(1, max_iterations + 1):
+            if self.iterate() < tolerance:
+                break
+        return self
+
+    def log_likelihood(self):
+        """Binomial log likelihood per answer (without the priors)."""
+        z = self.a[self.questions] * self.theta[self.users] + self.d[self.questions]
+        # log p = -log(1 + e^-z), log (1 - p) = -log(1 + e^z)
+        total = -(self.correct * np.logaddexp(0, -z) + (self.answered - self.correct) * np.logaddexp(0, z)).sum()
+        return total / max(self.answered.sum(), 1)
+
+def load_responses(dsn):
+    """(user numbers, question ids, question numbers, answered, correct) for every answered pair."""
+    with psycopg.connect(dsn) as conn:
+        with conn.cursor() as cur:
+            cur.execute(RESPONSES_SQL)
+            rows = cur.fetchall()
+
+    if not rows:
+        return None
+    user_ids, question_ids, answered, correct = zip(*rows)
+    _, users = np.unique(np.array(user_ids, dtype='U36'), return_inverse=True)
+    question_names, questions = np.unique(np.array(question_ids, dtype='U36'), return_inverse=True)
+    return users, question_names, questions, np.array(answered), np.array(correct)
+
+def write_calibration(dsn, question_ids, difficulty, discrimination, responses):
+    """COPY the estimates into a staging table and update interview_questions from it."""
+    with psycopg.connect(dsn) as conn:
+        with conn.cursor() as cur:
+            cur.execute("CREATE TEMP TABLE irt_staging (question_id UUID, difficulty REAL, "
+                        "discrimination REAL, responses INT) ON COMMIT DROP")
+            with cur.copy("COPY irt_staging FROM STDIN") as copy:
+                for row in zip(question_ids.tolist(), difficulty.tolist(), discrimination.tolist(),
+                               responses.tolist()):
+                    copy.write_row(row)
+            cur.execute("""
+                UPDATE interview_questions q SET
+                    irt_difficulty = s.difficulty,
+                    irt_discrimination = s.discrimination,
+                    irt_responses = s.responses,
+                    irt_calibrated_at = NOW()
+                FROM irt_staging s
+                WHERE q.id = s.question_id
+            """)
+            return cur.rowcount
+
+def label_agreement(dsn, question_ids, difficulty):
+    """Mean calibrated difficulty per heuristic label: [(label, questions, mean b)]."""
+    with psycopg.connect(dsn) as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT id::TEXT, COALESCE(difficulty, '') FROM interview_questions WHERE id = ANY(%s::UUID[])",
+                        (question_ids.tolist(),))
+            labels = dict(cur.fetchall())
+
+    names = np.array([labels.get(q, '') for q in question_ids.tolist()])
+    label_names, label_index = np.unique(names, return_inverse=True)
+    counts = np.bincount(label_index, minlength=len(label_names))
+    means = np.bincount(label_index, weights=difficulty, minlength=len(label_names)) / counts
+    return sorted(zip(label_names.tolist(), counts.tolist(), means.tolist()), key=lambda row: row[2])
+
+def calibrate(dsn=DEFAULT_DSN, model='2pl', min_responses=DEFAULT_MIN_RESPONSES,
+              max_iterations=DEFAULT_MAX_ITERATIONS, dry_run=False):
+    started = time.perf_counter()
+    loaded = load_responses(dsn)
+    if loaded is None:
+        print("❌ No answers to calibrate from")
+        return
+    users, question_ids, questions, answered, correct = loaded
+    print(f"📥 {int(answered.sum())} answers over {len(answered)} user/question pairs: "
+          f"{users.max() + 1} users x {len(question_ids)} questions ({time.perf_counter() - started:.2f}s)")
+
+    started = time.perf_counter()
+    irt = IRTModel(users, questions, answered, correct, two_parameter=(model == '2pl')).fit(max_iterations)
+    print(f"📐 {model.upper()} fit in {irt.iterations} iterations, {time.perf_counter() - started:.2f}s "
+          f"(log likelihood per answer {irt.log_likelihood():.4f})")
+
+    responses = np.bincount(questions, weights=answered, minlength=len(question_ids)).astype(np.int64)
+    keep = responses >= min_responses
+    print(f"   {keep.sum()} of {len(question_ids)} questions have at least {min_responses} answers")
+    if not keep.any():
+        return
+
+    print("\n   Heuristic label -> mean calibrated difficulty:")
+    for label, count, mean in label_agreement(dsn, question_ids[keep], irt.b[keep]):
+        print(f"   {label or '(none)':10s} {count:7d} questions   b = {mean:+.2f}")
+
+    if dry_run:
+        print("\n✅ Nothing written (dry run)")
+        return
+
+    started = time.perf_counter()
+    updated = write_calibration(dsn, question_ids[keep], irt.b[keep], irt.a[keep], responses[keep])
+    print(f"\n✅ Wrote calibrated difficulty for {updated} questions ({time.perf_counter() - started:.2f}s)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="IRT difficulty calibration from user_answers")
+    parser.add_argument("--dsn", default=DEFAULT_DSN)
+    parser.add_argument("--model", choices=['1pl', '2pl'], default='2pl')
+    parser.add_argument("--min-responses", type=int, default=DEFAULT_MIN_RESPONSES,
+                        help="Skip questions with fewer answers")
+    parser.add_argument("--max-iterations", type=int, default=DEFAULT_MAX_ITERATIONS)
+    parser.add_argument("--dry-run", action="store_true", help="Fit and report only")
+    args = parser.parse_args()
+
+    print("\n" + "="*80)
+    print("  📐 IRT Difficulty Calibration")
+    print("="*80 + "\n")
+
+    calibrate(args.dsn, args.model, args.min_responses, args.max_iterations, args.dry_run)
+
+    print("\n" + "="*80 + "\n")
@@ -0,0 +1,253 @@
+"""
+Split extracted book pages into small, overlapping passages for search.
+
+add_books_enhanced.py writes one row per page. Whole pages are big, so the
+app downloads and scores far more text than it needs per hit. This script
+splits every page into passages of at most --max-chars characters:
+- Text is packed sentence by sentence; consecutive passages share up to
+  --overlap characters so an answer spanning a boundary is not lost.
+- Markdown TABLE blocks are kept whole when they fit, otherwise split by
+  rows with the header repeated in every piece.
+
+Each passage gets a stable chunk_id (a hash of its book, page, offset and
+text), so rerunning on the same pages produces the same IDs.
+
+HOW TO USE:
+1. Extract the books first:
+   python add_books_enhanced.py
+
+2. Run this script:
+   python chunk_book_pages.py
+   python chunk_book_pages.py --max-chars 800 --overlap 150
+
+3. Upload 'book_chunks.csv' to the documents table in Supabase
+   (run supabase/setup.sql first so documents has the chunk columns)
+"""
+
+import re
+import csv
+import sys
+import hashlib
+import argparse
+
+DEFAULT_MAX_CHARS = 1200
+DEFAULT_OVERLAP = 200
+
+# Room for a table header (truncated to half a piece) plus a row cut from
+# the other half; split_line() can't make progress with less
+MIN_MAX_CHARS = 100
+
+CHUNK_FIELDS = ['chunk_id', 'book_name', 'page_number', 'chunk_index', 'char_start', 'char_end', 'content']
+
+# Sentence ends: ., ! or ? followed by whitespace, or a line break
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+|\n+')
+
+def make_chunk_id(book_name, page_number, char_start, text):
+    """Stable ID for a passage: same page, offset and text -> same ID."""
+    key = f"{book_name}\x1f{page_number}\x1f{char_start}\x1f{text}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+def split_blocks(content):
+    """
+    Split page content into ('text', start, end) and ('table', start, end) blocks.
+
+    Tables are the 'TABLE:' blocks written by add_books_enhanced.py: the
+    marker line, header, separator and rows, up to the next blank line.
+    """
+    blocks = []
+    position = 0
+
+    for match in re.finditer(r'^TABLE:\n(?:.+\n?)*', content, flags=re.MULTILINE):
+        if match.start() > position:
+            blocks.append(('text', position, match.start()))
+        blocks.append(('table', match.start(), match.end()))
+        position = match.end()
+
+    if position < len(content):
+        blocks.append(('text', position, len(content)))
+
+    return blocks
+
+def split_units(content, start, end, max_chars):
+    """Split content[start:end] into sentence spans, none longer than max_chars."""
+    units = []
+    unit_start = start
+
+    for match in SENTENCE_END.finditer(content, start, end):
+        if match.start() > unit_start:
+            units.append((unit_start, match.start()))
+        unit_start = match.end()
+    if unit_start < end:
+        units.append((unit_start, end))
+
+    # Hard-split runaway sentences at whitespace
+    bounded = []
+    for unit_start, unit_end in units:
+        while unit_end - unit_start > max_chars:
+            cut = content.rfind(' ', unit_start, unit_start + max_chars)
+            if cut <= unit_start:
+                cut = unit_start + max_chars
+            bounded.append((unit_start, cut))
+            unit_start = cut
+            while unit_start < unit_end and content[unit_start].isspace():
+                unit_start += 1
+        if unit_end > unit_start:
+            bounded.append((unit_start, unit_end))
+
+    return bounded
+
+def pack_text(content, start, end, max_chars, overlap):
+    """Greedily pack sentence spans into (start, end) passages with overlap."""
+    units = split_units(content, start, end, max_chars)
+    passages = []
+    first = 0
+
+    while first < len(units):
+        last = first
+        while last + 1 < len(units) and units[last + 1][1] - units[first][0] <= max_chars:
+            last += 1
+        passages.append((units[first][0], units[last][1]))
+
+        if last + 1 >= len(units):
+            break
+
+        # Step back over trailing sentences that fit in the overlap budget,
+        # but always move forward by at least one sentence
+        next_first = last + 1
+        while next_first - 1 > first and units[last][1] - units[next_first - 1][0] <= overlap:
+            next_first -= 1
+        first = next_first
+
+    return passages
+
+def split_line(line, max_chars):
+    """Cut one over-long line into pieces of at most max_chars, at a cell border or space if possible."""
+    pieces = []
+    while len(line) > max_chars:
+        cut = max(line.rfind('|', 1, max_chars), line.rfind(' ', 1, max_chars))
+        if cut <= max_chars // 2:  # No border in the second half: cut mid-word
+            cut = max_chars
+        pieces.append(line[:cut].rstrip())
+        line = line[cut:].lstrip()
+    if line:
+        pieces.append(line)
+    return pieces
+
+def split_table(table_text, max_chars):
+    """Split a markdown TABLE block by rows, repeating the header in each piece.
+
+    A header longer than half of max_chars is repeated truncated, and rows that
+    don't fit next to it are cut, so no piece is longer than max_chars.
+    """
+    table_text = table_text.strip()
+    if len(table_text) <= max_chars:
+        return [table_text]
+
+    lines = table_text.split('\n')
+    head = '\n'.join(lines[:3])  # TABLE:, header, separator
+    if len(head) > max_chars // 2:
+        head = head[:max_chars // 2].rstrip()
+    row_chars = max_chars - len(head) - 1
+    pieces = []
+    rows = []
+
+    for line in lines[3:]:
+        for row in split_line(line, row_chars):
+            if rows and len(head) + sum(len(r) + 1 for r in rows) + len(row) + 1 > max_chars:
+                pieces.append(head + '\n' + '\n'.join(rows))
+                rows = []
+            rows.append(row)
+    if rows or not pieces:
+        pieces.append(head + ('\n' + '\n'.join(rows) if rows else ''))
+
+    return pieces
+
+def chunk_page(book_name, page_number, content, max_chars=DEFAULT_MAX_CHARS, overlap=DEFAULT_OVERLAP):
+    """Yield passage rows for one page, in reading order."""
+    chunk_index = 0
+
+    for kind, start, end in split_blocks(content):
+        if kind == 'table':
+            # Table pieces all point at the whole table's span on the page
+            pieces = [(start, end, piece) for piece in split_table(content[start:end], max_chars)]
+        else:
+            pieces = [(s, e, content[s:e].strip()) for s, e in pack_text(content, start, end, max_chars, overlap)]
+
+        for piece_start, piece_end, text in pieces:
+            if not text:
+                continue
+            yield {
+                'chunk_id': make_chunk_id(book_name, page_number, piece_start, text),
+                'book_name': book_name,
+                'page_number': page_number,
+                'chunk_index': chunk_index,
+                'char_start': piece_start,
+                'char_end': piece_end,
+                'content': text
+            }
+            chunk_index += 1
+
+def iter_chunks(pages_file, max_chars=DEFAULT_MAX_CHARS, overlap=DEFAULT_OVERLAP):
+    """Stream passage rows for every page in a book pages CSV."""
+    with open(pages_file, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            yield from chunk_page(row['book_name'], int(row['page_number']), row['content'],
+                                  max_chars, overlap)
+
+def load_chunks(chunks_file):
+    """Load passage rows written by this script (used by the index builders)."""
+    with open(chunks_file, 'r', encoding='utf-8', newline='') as f:
+        return list(csv.DictReader(f))
+
+def create_chunks_csv(pages_file="new_books_data_enhanced.csv", output_file="book_chunks.csv",
+                      max_chars=DEFAULT_MAX_CHARS, overlap=DEFAULT_OVERLAP):
+    """Chunk every page and stream the passages to CSV."""
+    if max_chars < MIN_MAX_CHARS:
+        print(f"❌ Error: --max-chars ({max_chars}) must be at least {MIN_MAX_CHARS}")
+        return
+    if overlap >= max_chars:
+        print(f"❌ Error: --overlap ({overlap}) must be smaller than --max-chars ({max_chars})")
+        return
+
+    print(f"✂️  Chunking '{pages_file}' (max {max_chars} chars, {overlap} overlap)...")
+
+    chunks = 0
+    pages = set()
+    total_chars = 0
+
+    with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=CHUNK_FIELDS)
+        writer.writeheader()
+
+        for chunk in iter_chunks(pages_file, max_chars, overlap):
+            writer.writerow(chunk)
+            chunks += 1
+            pages.add((chunk['book_name'], chunk['page_number']))
+            total_chars += len(chunk['content'])
+
+    if not chunks:
+        print(f"❌ No passages written. Is '{pages_file}' empty?")
+        return
+
+    print(f"✅ Wrote {chunks} passages from {len(pages)} pages to '{output_file}'")
+    print(f"\n📊 Chunk Statistics:")
+    print(f"   - Passages per page: {chunks / len(pages):.1f}")
+    print(f"   - Average passage length: {total_chars // chunks} chars")
+
+if __name__ == "__main__":
+    csv.field_size_limit(sys.maxsize)
+
+    parser = argparse.ArgumentParser(description="Split book pages into overlapping passages")
+    parser.add_argument("--input", default="new_books_data_enhanced.csv")
+    parser.add_argument("--output", default="book_chunks.csv")
+    parser.add_argument("--max-chars", type=int, default=DEFAULT_MAX_CHARS)
+    parser.add_argument("--overlap", type=int, default=DEFAULT_OVERLAP)
+    args = parser.parse_args()
+
+    print("\n" + "="*80)
+    print("  ✂️  Book Passage Chunker")
+    print("="*80 + "\n")
+
+    create_chunks_csv(args.input, args.output, args.max_chars, args.overlap)
+
+    print("\n" + "="*80 + "\n")
@@ -0,0 +1,587 @@
+"""
+Load test: thousands of concurrent coach-app sessions.
+
+benchmark_search_rpc.py times one query at a time. This script runs many
+virtual users at once on asyncio, each replaying session scripts built
+from the requests the app makes:
+- onboarding:      save the profile as a user_profiles row (where the
+                   profile is headed; the app keeps it in localStorage for now)
+- search:          search(): the search_documents RPC, or with --search ilike
+                   the app's fallback, one ILIKE query per keyword in sequence
+- fetch_questions: fetchCodingQuestions(): the sample_questions RPC. An
+                   empty result counts as an error: the app has nothing
+                   to show, and a backend without matching questions
+                   would otherwise look fast
+- reveal_answer:   toggleQuestionAnswer(): the question's precomputed
+                   question_passages row, then those documents by chunk_id,
+                   or the full documents read when it has none
+- submit_answer:   a user_answers insert for a revealed question
+Sessions pick a script at random (SESSION_SCRIPTS, weighted), with random
+think time between steps. Groq and Gemini are never called.
+
+Two backends:
+- A PostgREST API (default): Supabase, the Supabase CLI's local stack or
+  question_api_server.py. Each virtual user keeps one keep-alive
+  connection, like a browser tab. SUPABASE_URL / SUPABASE_KEY or --url /
+  --key (the anon key; user_profiles has no anon insert policy yet, so
+  against Supabase itself onboarding is counted as errors until it does)
+- Postgres directly (--dsn): the same queries through a pool of
+  --connections connections, like PostgREST's own pool, for a local
+  database with supabase/setup.sql applied
+
+Latency is timed per step, from the first request to the last response,
+including waiting for a pooled connection. Every step reports its count,
+errors, throughput and p50/p95/p99/mean. The generator is one process: if
+it sits at 100% CPU, the numbers are its own limit, not the backend's.
+
+HOW TO USE:
+1. Install dependencies:
+   pip install numpy scipy "psycopg[binary]"
+
+2. Start a backend, e.g. the local stand-in:
+   python question_api_server.py serve --port 54321
+
+3. Run sessions against it:
+   python load_test_sessions.py --url http://localhost:54321 --users 2000 --ramp-up 10
+   python load_test_sessions.py --url http://localhost:54321 --users 500 --think-time 0 --search ilike
+   python load_test_sessions.py --dsn postgresql://postgres@localhost/postgres --users 1000 --connections 20
+"""
+
+import os
+import ssl
+import sys
+import json
+import time
+import uuid
+import random
+import asyncio
+import argparse
+import statistics
+from collections import Counter
+from urllib.parse import urlsplit, quote
+
+from benchmark_search_rpc import percentile
+from build_bm25_index import STOP_WORDS  # extractKeywords() stop words
+from build_expansion_thesaurus import APP_EXPANSIONS as SEMANTIC_EXPANSIONS  # The app's hand-written expansions
+from question_keys import DEFAULT_QUESTIONS_FILE, load_questions, question_hash
+
+DEFAULT_URL = os.environ.get('SUPABASE_URL', 'http://localhost:54321')
+DEFAULT_KEY = os.environ.get('SUPABASE_KEY', 'anon')
+DEFAULT_USERS = 1000
+DEFAULT_CONNECTIONS = 20
+DEFAULT_TIMEOUT = 30.0
+
+SEARCH_LIMIT = 50       # p_limit / .limit() in searchDocuments()
+PASSAGES_SHOWN = 5      # Precomputed passages fetchPrecomputedPassages() keeps
+FALLBACK_ROWS = 1000    # Supabase's API row cap, which bounds the app's full documents read
+
+# Steps of each kind of session, and how often each kind is picked
+SESSION_SCRIPTS = {
+    'new_user': (1, ['onboarding', 'search', 'fetch_questions', 'reveal_answer', 'submit_answer']),
+    'study': (3, ['search', 'search', 'search', 'reveal_answer']),
+    'practice': (4, ['fetch_questions', 'reveal_answer', 'submit_answer', 'reveal_answer',
+                     'submit_answer', 'reveal_answer', 'submit_answer']),
+    'search_and_practice': (2, ['search', 'search', 'fetch_questions', 'reveal_answer', 'submit_answer']),
+}
+STEPS = ['onboarding', 'search', 'fetch_questions', 'reveal_answer', 'submit_answer']
+
+# Form values in the app's profile and question generator
+EXPERIENCE_LEVELS = ['junior', 'mid', 'senior']
+COMPANIES = ['Meta', 'Google', 'Amazon', 'Apple', 'Netflix', 'Microsoft', 'Uber', 'Airbnb', 'LinkedIn']
+WEAK_AREAS = ['coding', 'stats', 'ml', 'case', 'communication']
+QUESTION_COUNTS = [5, 10, 15, 20]
+CODING_DIFFICULTIES = {'easy': 'Easy', 'medium': 'Medium', 'hard': 'Advanced', 'random': None}
+
+class RequestError(Exception):
+    """A response the app would treat as an error."""
+
+def extract_keywords(query, expansions=SEMANTIC_EXPANSIONS):
+    """Same keywords as extractKeywords() in the app, in the same order."""
+    words = [w for w in query.lower().translate(str.maketrans('', '', '?.,!;:')).split()
+             if len(w) > 2 and w not in STOP_WORDS]
+    keywords = dict.fromkeys(words)
+    for word in words:
+        for related in expansions.get(word, []):
+            for term in related.split(' '):
+                if len(term) > 2:
+                    keywords.setdefault(term)
+    return list(keywords)
+
+# ============================================
+# Backends
+# ============================================
+
+class HTTPConnection:
+    """One keep-alive HTTP/1.1 connection, reopened when the server closes it."""
+
+    def __init__(self, host, port, ssl_context, timeout):
+        self.host = host
+        self.port = port
+        self.ssl_context = ssl_context
+        self.timeout = timeout
+        self.reader = self.writer = None
+
+    async def request(self, method, path, headers, body=b''):
+        """(status, response headers, body bytes)."""
+        try:
+            return await asyncio.wait_for(self.exchange(method, path, headers, body), self.timeout)
+        except asyncio.TimeoutError:
+            self.close()
+            raise RequestError(f"no response in {self.timeout:.0f}s")
+
+    async def exchange(self, method, path, headers, body):
+        reused = self.writer is not None
+        if not reused:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl_context)
+
+        head = f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Length: {len(body)}\r\n"
+        head += ''.join(f"{name}: {value}\r\n" for name, value in headers)
+        try:
+            self.writer.write(head.encode('latin-1') + b'\r\n' + body)
+            await self.writer.drain()
+            return await self.read_response(method)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            self.close()
+            if not reused:
+                raise
+            # The server dropped an idle keep-alive connection: retry once on a new one, as browsers do
+            return await self.exchange(method, path, headers, body)
+
+    async def read_response(self, method):
+        head = await self.reader.readuntil(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        status = int(lines[0].split(' ', 2)[1])
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+
+        if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+            body = b''
+        elif 'content-length' in headers:
+            body = await self.reader.readexactly(int(headers['content-length']))
+        elif headers.get('transfer-encoding', '').lower() == 'chunked':
+            parts = []
+            while True:
+                size = int((await self.reader.readuntil(b'\r\n')).split(b';')[0], 16)
+                if size == 0:
+                    await self.reader.readuntil(b'\r\n')  # No trailers expected
+                    break
+                parts.append(await self.reader.readexactly(size))
+                await self.reader.readexactly(2)
+            body = b''.join(parts)
+        else:
+            body = await self.reader.read()
+            headers['connection'] = 'close'
+
+        if headers.get('connection', '').lower() == 'close':
+            self.close()
+        return status, headers, body
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+class RestBackend:
+    """The app's requests through a PostgREST API, one HTTPConnection per virtual user."""
+
+    def __init__(self, url, key, timeout=DEFAULT_TIMEOUT):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f"Expected an http(s) URL, got '{url}'")
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.ssl_context = ssl.create_default_context() if parts.scheme == 'https' else None
+        self.prefix = parts.path.rstrip('/') + '/rest/v1'
+        self.headers = [('apikey', key), ('Authorization', f"Bearer {key}")]
+        self.timeout = timeout
+        self.requests = 0
+
+    def describe(self):
+        return f"PostgREST at {self.host}:{self.port}{self.prefix}"
+
+    async def start(self):
+        pass
+
+    def connection(self):
+        return HTTPConnection(self.host, self.port, self.ssl_context, self.timeout)
+
+    def release(self, conn):
+        conn.close()
+
+    async def call(self, conn, method, path, payload=None, headers=(), parse=True, allowed=()):
+        """Parsed JSON body (None if empty or parse=False). Statuses >= 400 raise unless allowed."""
+        self.requests += 1
+        headers = self.headers + [('Accept', 'application/json')] + list(headers)
+        body = b''
+        if payload is not None:
+            body = json.dumps(payload).encode('utf-8')
+            headers.append(('Content-Type', 'application/json'))
+
+        status, _, data = await conn.request(method, self.prefix + path, headers, body)
+        if status >= 400 and status not in allowed:
+            raise RequestError(f"HTTP {status} {data[:120].decode('utf-8', 'replace')}")
+        if status >= 400 or not parse or not data:
+            return None
+        return json.loads(data)
+
+    async def onboarding(self, conn, profile):
+        rows = await self.call(conn, 'POST', '/user_profiles', profile,
+                               [('Prefer', 'return=representation')])
+        return rows[0]['id'] if rows else None
+
+    async def search(self, conn, query, keywords, mode):
+        if mode == 'rpc':
+            await self.call(conn, 'POST', '/rpc/search_documents', {'p_query': query, 'p_limit': SEARCH_LIMIT},
+                            parse=False)
+            return
+        for keyword in keywords:
+            pattern = quote(f"%{keyword}%", safe='')
+            await self.call(conn, 'GET', f"/documents?select=*&content=ilike.{pattern}&limit={SEARCH_LIMIT}",
+                            parse=False)
+
+    async def fetch_questions(self, conn, count, difficulty):
+        return await self.call(conn, 'POST', '/rpc/sample_questions',
+                               {'p_count': count, 'p_category': 'Coding', 'p_difficulty': difficulty}) or []
+
+    async def reveal_answer(self, conn, question_text):
+        # .maybeSingle(): 406 is PostgREST's "no row", not an error
+        match = await self.call(conn, 'GET', f"/question_passages?select=passage_ids,scores"
+                                f"&content_hash=eq.{question_hash(question_text)}",
+                                headers=[('Accept', 'application/vnd.pgrst.object+json')], allowed=(406,))
+        ids = (match or {}).get('passage_ids') or []
+        if ids:
+            chunk_ids = quote(','.join(ids[:PASSAGES_SHOWN]), safe=',')
+            await self.call(conn, 'GET', f"/documents?select=*&chunk_id=in.({chunk_ids})", parse=False)
+        else:
+            await self.call(conn, 'GET', "/documents?select=*", parse=False)
+
+    async def submit_answer(self, conn, answer):
+        await self.call(conn, 'POST', '/user_answers', answer, [('Prefer', 'return=minimal')], parse=False)
+
+    async def close(self):
+        pass
+
+class PostgresBackend:
+    """The same requests as SQL, through a fixed pool of connections shared by every virtual user."""
+
+    def __init__(self, dsn, connections=DEFAULT_CONNECTIONS):
+        import psycopg
+        from psycopg.rows import dict_row
+        self.psycopg = psycopg
+        self.dict_row = dict_row
+        self.dsn = dsn
+        self.size = connections
+        self.pool = None
+        self.connections = []
+        self.requests = 0
+
+    def describe(self):
+        return f"Postgres ({self.size} pooled connections)"
+
+    async def start(self):
+        self.pool = asyncio.Queue()
+        for _ in range(self.size):
+            conn = await self.psycopg.AsyncConnection.connect(self.dsn, autocommit=True)
+            self.connections.append(conn)
+            self.pool.put_nowait(conn)
+
+    def connection(self):
+        return None  # Virtual users borrow from the pool per step
+
+    def release(self, conn):
+        pass
+
+    async def run(self, statements):
+        """Run (sql, params) statements on one pooled connection: rows of the last, as dicts."""
+        conn = await self.pool.get()
+        try:
+            async with conn.cursor(row_factory=self.dict_row) as cur:
+                for sql, params in statements:
+                    self.requests += 1
+                    await cur.execute(sql, params)
+                return await cur.fetchall() if cur.description else []
+        finally:
+            self.pool.put_nowait(conn)
+
+    async def onboarding(self, conn, profile):
+        rows = await self.run([("INSERT INTO user_profiles (experience_level, target_companies, weak_areas, "
+                                "interview_date) VALUES (%s, %s, %s, %s) RETURNING id",
+                                (profile['experience_level'], profile['target_companies'],
+                                 profile['weak_areas'], profile['interview_date']))])
+        return str(rows[0]['id'])
+
+    async def search(self, conn, query, keywords, mode):
+        if mode == 'rpc':
+            await self.run([("SELECT * FROM search_documents(%s, %s)", (query, SEARCH_LIMIT))])
+            return
+        for keyword in keywords:  # One request per keyword, like the app
+            await self.run([("SELECT * FROM documents WHERE content ILIKE %s LIMIT %s",
+                             (f"%{keyword}%", SEARCH_LIMIT))])
+
+    async def fetch_questions(self, conn, count, difficulty):
+        rows = await self.run([("SELECT * FROM sample_questions(%s, NULL, %s, 'Coding')", (count, difficulty))])
+        for row in rows:
+            row['id'] = str(row['id'])
+        return rows
+
+    async def reveal_answer(self, conn, question_text):
+        rows = await self.run([("SELECT passage_ids, scores FROM question_passages WHERE content_hash = %s",
+                                (question_hash(question_text),))])
+        ids = rows[0]['passage_ids'] if rows else None
+        if ids:
+            await self.run([("SELECT * FROM documents WHERE chunk_id = ANY(%s)", (ids[:PASSAGES_SHOWN],))])
+        else:
+            await self.run([("SELECT * FROM documents LIMIT %s", (FALLBACK_ROWS,))])
+
+    async def submit_answer(self, conn, answer):
+        columns = list(answer)
+        await self.run([(f"INSERT INTO user_answers ({', '.join(columns)}) "
+                         f"VALUES ({', '.join(['%s'] * len(columns))})", [answer[c] for c in columns])])
+
+    async def close(self):
+        for conn in self.connections:
+            await conn.close()
+
+def open_backend(dsn=None, url=DEFAULT_URL, key=DEFAULT_KEY, connections=DEFAULT_CONNECTIONS,
+                 timeout=DEFAULT_TIMEOUT):
+    """PostgresBackend for a DSN, otherwise RestBackend for the URL."""
+    if dsn:
+        return PostgresBackend(dsn, connections)
+    return RestBackend(url, key, timeout)
+
+# ============================================
+# Virtual users
+# ============================================
+
+class Workload:
+    """What virtual users draw from: search queries and questions from the corpus."""
+
+    def __init__(self, questions, max_query_chars=200, expansions=SEMANTIC_EXPANSIONS):
+        self.expansions = expansions
+        self.questions = questions
+        # search() gives up on queries without keywords before sending anything
+        self.queries = [(q['question_text'], keywords) for q in questions
+                        if len(q['question_text']) <= max_query_chars
+                        and (keywords := extract_keywords(q['question_text'], expansions))]
+
+class Stats:
+    """Step latencies and errors, shared by every virtual user."""
+
+    def __init__(self):
+        self.timings = {step: [] for step in STEPS}
+        self.errors = {step: Counter() for step in STEPS}
+        self.sessions = 0
+
+    def record(self, step, elapsed):
+        self.timings[step].append(elapsed)
+
+    def fail(self, step, error):
+        self.errors[step][f"{type(error).__name__}: {str(error)[:100]}"] += 1
+
+    def completed(self):
+        return sum(len(t) for t in self.timings.values())
+
+    def failed(self):
+        return sum(sum(e.values()) for e in self.errors.values())
+
+class VirtualUser:
+    """One simulated app user: its connection plus what its current session has seen."""
+
+    def __init__(self, backend, workload, stats, search_mode='rpc', think_time=1.0):
+        self.backend = backend
+        self.workload = workload
+        self.stats = stats
+        self.search_mode = search_mode
+        self.think_time = think_time
+        self.conn = backend.connection()
+        self.user_id = None
+        self.session_id = None
+        self.questions = []   # Fetched, not revealed yet
+        self.revealed = []    # Revealed, not answered yet
+
+    async def run(self, sessions, start_delay=0.0):
+        await asyncio.sleep(start_delay)
+        try:
+            for _ in range(sessions):
+                await self.run_session()
+        finally:
+            self.backend.release(self.conn)
+
+    async def run_session(self):
+        names = list(SESSION_SCRIPTS)
+        name = random.choices(names, weights=[SESSION_SCRIPTS[n][0] for n in names])[0]
+        self.session_id = str(uuid.uuid4())
+        self.questions, self.revealed = [], []
+
+        for step in SESSION_SCRIPTS[name][1]:
+            started = time.perf_counter()
+            try:
+                await getattr(self, step)()
+                self.stats.record(step, time.perf_counter() - started)
+            except Exception as e:  # Keep the session going, like the app does after an error message
+                self.stats.fail(step, e)
+            if self.think_time:
+                await asyncio.sleep(random.expovariate(1 / self.think_time))
+        self.stats.sessions += 1
+
+    async def onboarding(self):
+        profile = {
+            'experience_level': random.choice(EXPERIENCE_LEVELS),
+            'target_companies': random.sample(COMPANIES, random.randint(0, 3)),
+            'weak_areas': random.sample(WEAK_AREAS, random.randint(0, 2)),
+            'interview_date': None,  # "Practice Only"
+        }
+        self.user_id = await self.backend.onboarding(self.conn, profile)
+
+    async def search(self):
+        query, keywords = random.choice(self.workload.queries)
+        await self.backend.search(self.conn, query, keywords, self.search_mode)
+
+    async def fetch_questions(self):
+        difficulty = CODING_DIFFICULTIES[random.choice(list(CODING_DIFFICULTIES))]
+        self.questions = await self.backend.fetch_questions(self.conn, random.choice(QUESTION_COUNTS), difficulty)
+        self.revealed = []
+        if not self.questions:
+            raise RequestError(f"no questions returned (difficulty {difficulty})")
+
+    def next_question(self):
+        """The next fetched question, or a corpus question (no id) when none were fetched."""
+        if self.questions:
+            return self.questions.pop(0)
+        question = random.choice(self.workload.questions)
+        return {'id': None, 'question_text': question['question_text'], 'difficulty': question.get('difficulty')}
+
+    async def reveal_answer(self):
+        question = self.next_question()
+        await self.backend.reveal_answer(self.conn, question['question_text'])
+        self.revealed.append(question)
+
+    async def submit_answer(self):
+        question = self.revealed.pop() if self.revealed else self.next_question()
+        await self.backend.submit_answer(self.conn, {
+            'user_id': self.user_id,
+            'session_id': self.session_id,
+            'question_id': question.get('id'),
+            'user_answer': 'Load test answer',
+            'is_correct': random.random() < 0.6,
+            'time_spent_seconds': random.randint(20, 600),
+            'hints_used': random.choice((0, 0, 0, 1, 2)),
+            'difficulty_at_time': question.get('difficulty'),
+        })
+
+# ============================================
+# Running and reporting
+# ============================================
+
+def raise_open_file_limit(needed):
+    """Every virtual user holds a socket; lift the soft fd limit towards the hard one if it is too low."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY or soft >= needed:
+        return
+    target = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+    if target < needed:
+        print(f"⚠️  Open file limit is {hard}, fewer than {needed} sockets: expect connection errors")
+
+def report(name, timings, errors, elapsed):
+    ms = [t * 1000 for t in timings]
+    if not ms:
+        print(f"   {name:16s} {0:7d} ok | {errors:5d} errors")
+        return
+    print(f"   {name:16s} {len(ms):7d} ok | {errors:5d} errors | {len(ms) / elapsed:8.1f} /s | "
+          f"p50 {percentile(ms, 50):8.2f} ms | p95 {percentile(ms, 95):8.2f} ms | "
+          f"p99 {percentile(ms, 99):8.2f} ms | mean {statistics.mean(ms):8.2f} ms")
+
+async def print_progress(stats, interval=5.0):
+    started = time.perf_counter()
+    while True:
+        await asyncio.sleep(interval)
+        print(f"   ⏳ {time.perf_counter() - started:6.1f}s: {stats.completed()} steps, "
+              f"{stats.failed()} errors, {stats.sessions} sessions done")
+
+async def run_load_test(backend, workload, users=DEFAULT_USERS, sessions=1, ramp_up=0.0, think_time=1.0,
+                        search_mode='rpc'):
+    stats = Stats()
+    await backend.start()
+    print(f"🎯 {backend.describe()}")
+    print(f"👥 {users} virtual users x {sessions} sessions, ramp-up {ramp_up:.0f}s, "
+          f"think time {think_time:.2f}s, search via {search_mode}\n")
+
+    virtual_users = [VirtualUser(backend, workload, stats, search_mode, think_time) for _ in range(users)]
+    progress = asyncio.create_task(print_progress(stats))
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(user.run(sessions, ramp_up * i / users) for i, user in enumerate(virtual_users)))
+    finally:
+        progress.cancel()
+        await backend.close()
+    elapsed = time.perf_counter() - started
+
+    print(f"\n⏱️  Latency per step ({elapsed:.1f}s wall clock):")
+    for step in STEPS:
+        report(step, stats.timings[step], sum(stats.errors[step].values()), elapsed)
+
+    print(f"\n✅ {stats.sessions} sessions, {stats.completed()} steps ok ({stats.completed() / elapsed:.1f} /s), "
+          f"{backend.requests} requests ({backend.requests / elapsed:.1f} /s)")
+
+    if stats.failed():
+        print(f"\n❌ {stats.failed()} failed steps:")
+        for step in STEPS:
+            for message, count in stats.errors[step].most_common(3):
+                print(f"   {step:16s} {count:6d} x {message}")
+    return stats
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay concurrent coach-app sessions against a backend")
+    parser.add_argument("--url", default=DEFAULT_URL, help="PostgREST API base URL (Supabase project URL)")
+    parser.add_argument("--key", default=DEFAULT_KEY, help="API key sent as apikey and bearer token")
+    parser.add_argument("--dsn", help="Query this Postgres database directly instead of the REST API")
+    parser.add_argument("--connections", type=int, default=DEFAULT_CONNECTIONS, help="Pool size with --dsn")
+    parser.add_argument("--users", type=int, default=DEFAULT_USERS, help="Concurrent virtual users")
+    parser.add_argument("--sessions", type=int, default=1, help="Sessions each virtual user runs")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Seconds over which users start")
+    parser.add_argument("--think-time", type=float, default=1.0, help="Mean seconds between steps (0 = none)")
+    parser.add_argument("--search", choices=['rpc', 'ilike'], default='rpc',
+                        help="search_documents RPC or the app's per-keyword ILIKE fallback")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Seconds per HTTP request")
+    parser.add_argument("--questions", default=DEFAULT_QUESTIONS_FILE)
+    parser.add_argument("--expansions", default="search_expansions.json",
+                        help="build_expansion_thesaurus.py output, merged into the keyword expansions if present")
+    parser.add_argument("--max-query-chars", type=int, default=200)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.questions):
+        print(f"❌ Error: {args.questions} not found!")
+        sys.exit(1)
+
+    print("\n" + "="*80)
+    print("  🏎️  Coach App Session Load Test")
+    print("="*80 + "\n")
+
+    expansions = SEMANTIC_EXPANSIONS
+    if os.path.exists(args.expansions):
+        with open(args.expansions, 'r', encoding='utf-8') as f:
+            expansions = {**json.load(f), **SEMANTIC_EXPANSIONS}  # Hand-written entries win, as in the app
+
+    workload = Workload(load_questions(args.questions), args.max_query_chars, expansions)
+    print(f"📂 {len(workload.questions)} questions, {len(workload.queries)} usable as search queries")
+
+    try:
+        backend = open_backend(args.dsn, args.url, args.key, args.connections, args.timeout)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if not args.dsn:
+        raise_open_file_limit(args.users + 64)
+    asyncio.run(run_load_test(backend, workload, args.users, args.sessions, args.ramp_up, args.think_time,
+                              args.search))
+
+    print("\n" + "="*80 + "\n")
@@ -0,0 +1,554 @@
+"""
+Monthly partitions for user_answers: migration, maintenance and archiving.
+
+supabase/setup.sql creates user_answers partitioned by month of created_at
+(UTC), so a query over the last week or two only scans one or two
+partitions. This script handles the rest:
+
+- migrate: converts an existing unpartitioned user_answers. It builds
+  user_answers_new with the same columns, foreign keys and indexes, copies
+  rows one month per transaction (resumable, ON CONFLICT DO NOTHING), then
+  swaps the tables in one short transaction. That transaction holds an
+  EXCLUSIVE lock (reads go on, writes wait), re-copies the rows a
+  temporary trigger logged as written during the copy, and moves
+  triggers, policies, grants and views over. The old table is kept as user_answers_unpartitioned unless
+  --drop-old is given.
+- maintain: creates partitions for the coming months (and for months whose
+  rows fell into the default partition). With --retain-months it also
+  archives every month older than that:
+    1. sum its answers per user into user_answers_archived_totals and
+       DETACH it, in one transaction, so stats keep counting them
+    2. stream the detached table into <archive-dir>/<partition>.csv.gz
+       (same keyset COPY and manifest.json as backup_database.py, so
+       `backup_database.py verify <archive-dir>` checks the files)
+    3. drop it, unless --keep-detached
+  Each archive is recorded in user_answers_archives. A run that stopped
+  after step 1 finishes the export on the next run.
+- status: partitions with sizes, archives, and how many partitions a
+  7-day query scans. Recent-window queries need an upper bound too
+  (created_at <= NOW()), or the planner keeps future months and the
+  default partition.
+
+The summary and daily stats tables don't change when a partition is
+detached: the statement triggers only fire on INSERT/UPDATE/DELETE.
+
+HOW TO USE:
+1. Install dependencies:
+   pip install "psycopg[binary]"
+
+2. Apply the current supabase/setup.sql (for create_user_answers_partition()
+   and the archive tables), then migrate (direct database connection string):
+   python partition_user_answers.py migrate --dsn postgresql://postgres@localhost/postgres
+
+3. Run maintenance regularly (e.g. a daily cron job):
+   python partition_user_answers.py maintain --dsn ... --months-ahead 3
+   python partition_user_answers.py maintain --dsn ... --retain-months 12 --archive-dir backups/user_answers_archive
+   python partition_user_answers.py status --dsn ...
+"""
+
+import os
+import json
+import time
+import argparse
+from datetime import date, datetime, timezone
+
+import psycopg
+
+from backup_database import backup_table, table_columns, DEFAULT_PAGE_SIZE
+
+DEFAULT_DSN = os.environ.get("DATABASE_URL", "postgresql://postgres@localhost/postgres")
+DEFAULT_ARCHIVE_DIR = "backups/user_answers_archive"
+DEFAULT_MONTHS_AHEAD = 3
+
+PARTITION_NAME_FORMAT = "user_answers_p%Y_%m"
+OLD_TABLE = "user_answers_unpartitioned"
+NEW_TABLE = "user_answers_new"
+CHANGE_LOG = "user_answers_migration_log"
+
+# Where rows with no created_at go (the partition key can't be NULL)
+MISSING_CREATED_AT = "1970-01-01 00:00:00+00"
+
+ARCHIVED_TOTALS_SQL = """
+    INSERT INTO user_answers_archived_totals AS t
+    SELECT * FROM archived_batch
+    ON CONFLICT (user_id) DO UPDATE SET
+        total_answered = t.total_answered + EXCLUDED.total_answered,
+        total_correct = t.total_correct + EXCLUDED.total_correct,
+        timed_answers = t.timed_answers + EXCLUDED.timed_answers,
+        total_time_seconds = t.total_time_seconds + EXCLUDED.total_time_seconds,
+        easy_answered = t.easy_answered + EXCLUDED.easy_answered,
+        easy_correct = t.easy_correct + EXCLUDED.easy_correct,
+        medium_answered = t.medium_answered + EXCLUDED.medium_answered,
+        medium_correct = t.medium_correct + EXCLUDED.medium_correct,
+        hard_answered = t.hard_answered + EXCLUDED.hard_answered,
+        hard_correct = t.hard_correct + EXCLUDED.hard_correct,
+        last_practice_date = GREATEST(t.last_practice_date, EXCLUDED.last_practice_date)
+"""
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+def current_month():
+    today = datetime.now(timezone.utc).date()
+    return date(today.year, today.month, 1)
+
+def partition_month(name):
+    """The month a partition holds, from its name, or None for other tables."""
+    try:
+        return datetime.strptime(name, PARTITION_NAME_FORMAT).date()
+    except ValueError:
+        return None
+
+def is_partitioned(cur, table="user_answers"):
+    cur.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", (table,))
+    row = cur.fetchone()
+    return row is not None and row[0] == 'p'
+
+def partitions(cur, parent="user_answers"):
+    """[(name, is_default)] of a partitioned table, in name order."""
+    cur.execute("""
+        SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) = 'DEFAULT'
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(%s)
+        ORDER BY c.relname
+    """, (parent,))
+    return cur.fetchall()
+
+def create_partition(cur, month, parent="user_answers"):
+    cur.execute("SELECT create_user_answers_partition(%s, %s)", (month, parent))
+    return cur.fetchone()[0]
+
+# ============================================
+# migrate
+# ============================================
+
+def indexes(cur, table):
+    """[(name, definition)] of a table's indexes that don't back a constraint."""
+    cur.execute("""
+        SELECT c.relname, pg_get_indexdef(c.oid)
+        FROM pg_index x
+        JOIN pg_class c ON c.oid = x.indexrelid
+        WHERE x.indrelid = to_regclass(%s)
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint k WHERE k.conindid = x.indexrelid)
+        ORDER BY c.relname
+    """, (table,))
+    return cur.fetchall()
+
+def create_new_table(cur):
+    """user_answers_new: same columns, foreign keys and indexes, partitioned by month."""
+    cur.execute(f"CREATE TABLE {NEW_TABLE} (LIKE user_answers INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)")
+    cur.execute(f"ALTER TABLE {NEW_TABLE} ALTER COLUMN created_at SET NOT NULL")
+    cur.execute(f"ALTER TABLE {NEW_TABLE} ADD PRIMARY KEY (id, created_at)")
+
+    cur.execute("SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+                "WHERE conrelid = 'user_answers'::regclass AND contype = 'f'")
+    for name, definition in cur.fetchall():
+        cur.execute(f"ALTER TABLE {NEW_TABLE} ADD CONSTRAINT {name} {definition}")
+
+    # Built up front on the empty parent, so the swap doesn't have to wait for them
+    for name, definition in indexes(cur, "user_answers"):
+        cur.execute(definition.replace(f"INDEX {name} ON public.user_answers ",
+                                       f"INDEX {name}_new ON public.{NEW_TABLE} ", 1))
+
+    cur.execute(f"CREATE TABLE user_answers_default PARTITION OF {NEW_TABLE} DEFAULT")
+
+    # Ids written while the copy runs; the swap re-copies just these
+    cur.execute(f"CREATE TABLE {CHANGE_LOG} (id UUID NOT NULL)")
+    cur.execute(f"""
+        CREATE FUNCTION log_user_answers_migration() RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                INSERT INTO {CHANGE_LOG} VALUES (OLD.id);
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                INSERT INTO {CHANGE_LOG} VALUES (NEW.id);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public
+    """)
+    cur.execute("CREATE TRIGGER user_answers_migration_log AFTER INSERT OR UPDATE OR DELETE ON user_answers "
+                "FOR EACH ROW EXECUTE FUNCTION log_user_answers_migration()")
+
+def copy_months(conn, columns):
+    """Copy user_answers into user_answers_new one month per transaction. Returns rows copied."""
+    column_list = ', '.join(columns)
+    copied = 0
+
+    with conn.cursor() as cur:
+        cur.execute("SELECT MIN(created_at), MAX(created_at) FROM user_answers")
+        first, last = cur.fetchone()
+        months = []
+        if first is not None:
+            first, last = first.astimezone(timezone.utc), last.astimezone(timezone.utc)
+            month = date(first.year, first.month, 1)
+            while month <= date(last.year, last.month, 1):
+                months.append(month)
+                month = add_months(month, 1)
+        for ahead in range(DEFAULT_MONTHS_AHEAD + 1):
+            if add_months(current_month(), ahead) not in months:
+                months.append(add_months(current_month(), ahead))
+
+        for month in months:
+            started = time.perf_counter()
+            name = create_partition(cur, month, NEW_TABLE)
+            cur.execute(f"""
+                INSERT INTO {NEW_TABLE} ({column_list})
+                SELECT {column_list} FROM user_answers
+                WHERE created_at >= %s::TIMESTAMP AT TIME ZONE 'UTC'
+                  AND created_at < %s::TIMESTAMP AT TIME ZONE 'UTC'
+                ON CONFLICT DO NOTHING
+            """, (month, add_months(month, 1)))
+            copied += cur.rowcount
+            conn.commit()
+            print(f"   📦 {name}: {cur.rowcount} rows ({time.perf_counter() - started:.2f}s)")
+
+        select_list = ', '.join(f"'{MISSING_CREATED_AT}'" if c == 'created_at' else c for c in columns)
+        cur.execute(f"INSERT INTO {NEW_TABLE} ({column_list}) "
+                    f"SELECT {select_list} FROM user_answers WHERE created_at IS NULL ON CONFLICT DO NOTHING")
+        if cur.rowcount:
+            print(f"   📦 {cur.rowcount} rows without created_at -> user_answers_default ({MISSING_CREATED_AT})")
+        copied += cur.rowcount
+        conn.commit()
+
+    return copied
+
+def policy_sql(policy):
+    name, permissive, roles, command, using, check = policy
+    roles = ', '.join('PUBLIC' if role == 'public' else f'"{role}"' for role in roles)
+    sql = f'CREATE POLICY "{name}" ON user_answers AS {permissive} FOR {command} TO {roles}'
+    if using:
+        sql += f" USING ({using})"
+    if check:
+        sql += f" WITH CHECK ({check})"
+    return sql
+
+def grants(cur, table):
+    cur.execute("""
+        SELECT grantee, string_agg(privilege_type, ', ')
+        FROM information_schema.role_table_grants
+        WHERE table_schema = 'public' AND table_name = %s
+          AND grantee <> (SELECT pg_get_userbyid(relowner) FROM pg_class WHERE oid = to_regclass(%s))
+        GROUP BY grantee
+    """, (table, table))
+    return [f'GRANT {privileges} ON {table} TO "{grantee}"' for grantee, privileges in cur.fetchall()]
+
+def swap_tables(cur, columns):
+    """Catch up and swap user_answers_new in. Runs inside the caller's transaction."""
+    column_list = ', '.join(columns)
+    select_list = ', '.join(f"COALESCE(o.created_at, '{MISSING_CREATED_AT}')" if c == 'created_at' else f"o.{c}"
+                            for c in columns)
+
+    cur.execute("LOCK TABLE user_answers IN EXCLUSIVE MODE")
+
+    # Rows inserted, updated or deleted since the copy started: drop their
+    # copies and copy them again from the (now frozen) old table
+    cur.execute(f"CREATE TEMP TABLE changed_ids ON COMMIT DROP AS SELECT DISTINCT id FROM {CHANGE_LOG}")
+    cur.execute(f"DELETE FROM {NEW_TABLE} n USING changed_ids c WHERE n.id = c.id")
+    cur.execute(f"""
+        INSERT INTO {NEW_TABLE} ({column_list})
+        SELECT {select_list} FROM user_answers o JOIN changed_ids c ON c.id = o.id
+    """)
+    cur.execute("SELECT COUNT(*) FROM changed_ids")
+    print(f"   🔄 Caught up on {cur.fetchone()[0]} rows written since the copy")
+
+    cur.execute("DROP TRIGGER user_answers_migration_log ON user_answers")
+    cur.execute("DROP FUNCTION log_user_answers_migration()")
+    cur.execute(f"DROP TABLE {CHANGE_LOG}")
+
+    # Everything attached to the old table, captured while it's still called user_answers
+    cur.execute("SELECT tgname, pg_get_triggerdef(oid) FROM pg_trigger "
+                "WHERE tgrelid = 'user_answers'::regclass AND NOT tgisinternal")
+    triggers = cur.fetchall()
+    cur.execute("SELECT policyname, permissive, roles, cmd, qual, with_check FROM pg_policies "
+                "WHERE schemaname = 'public' AND tablename = 'user_answers'")
+    policies = cur.fetchall()
+    cur.execute("SELECT relrowsecurity FROM pg_class WHERE oid = 'user_answers'::regclass")
+    row_security = cur.fetchone()[0]
+    cur.execute("""
+        SELECT DISTINCT v.relname, pg_get_viewdef(v.oid)
+        FROM pg_depend d
+        JOIN pg_rewrite r ON r.oid = d.objid
+        JOIN pg_class v ON v.oid = r.ev_class
+        WHERE d.refobjid = 'user_answers'::regclass AND v.oid <> 'user_answers'::regclass
+    """)
+    views = cur.fetchall()
+    table_grants = grants(cur, 'user_answers')
+    view_grants = [sql for name, _ in views for sql in grants(cur, name)]
+    old_indexes = [name for name, _ in indexes(cur, 'user_answers')]
+
+    for name, _ in views:
+        cur.execute(f"DROP VIEW {name}")
+    for name, _ in triggers:
+        cur.execute(f"DROP TRIGGER {name} ON user_answers")
+
+    cur.execute(f"ALTER TABLE user_answers RENAME TO {OLD_TABLE}")
+    cur.execute(f"ALTER INDEX user_answers_pkey RENAME TO {OLD_TABLE}_pkey")
+    for name in old_indexes:
+        cur.execute(f"ALTER INDEX {name} RENAME TO {name}_unpartitioned")
+
+    cur.execute(f"ALTER TABLE {NEW_TABLE} RENAME TO user_answers")
+    cur.execute(f"ALTER INDEX {NEW_TABLE}_pkey RENAME TO user_answers_pkey")
+    for name in old_indexes:
+        cur.execute(f"ALTER INDEX {name}_new RENAME TO {name}")
+
+    for _, definition in triggers:
+        cur.execute(definition)
+    if row_security:
+        cur.execute("ALTER TABLE user_answers ENABLE ROW LEVEL SECURITY")
+    for policy in policies:
+        cur.execute(policy_sql(policy))
+    for name, definition in views:
+        cur.execute(f"CREATE VIEW {name} AS {definition}")
+    for sql in table_grants + view_grants:
+        cur.execute(sql)
+
+    print(f"   🔁 Swapped: {len(triggers)} triggers, {len(policies)} policies, {len(views)} views moved over")
+
+def migrate(dsn=DEFAULT_DSN, drop_old=False):
+    """Convert an unpartitioned user_answers. Returns True on success."""
+    started = time.perf_counter()
+
+    with psycopg.connect(dsn) as conn:
+        with conn.cursor() as cur:
+            if is_partitioned(cur):
+                print("✅ user_answers is already partitioned")
+                return True
+
+            if cur.execute("SELECT to_regclass(%s)", (NEW_TABLE,)).fetchone()[0] is None:
+                create_new_table(cur)
+                conn.commit()
+                print(f"🏗️  Created {NEW_TABLE}")
+            else:
+                print(f"🏗️  Resuming into the existing {NEW_TABLE}")
+            columns = table_columns(cur, 'user_answers')
+
+        copied = copy_months(conn, columns)
+        print(f"\n📥 Copied {copied} rows in {time.perf_counter() - started:.2f}s")
+
+        swap_started = time.perf_counter()
+        with conn.cursor() as cur:
+            swap_tables(cur, columns)
+            cur.execute(f"SELECT (SELECT COUNT(*) FROM user_answers), (SELECT COUNT(*) FROM {OLD_TABLE})")
+            new_rows, old_rows = cur.fetchone()
+            if new_rows != old_rows:
+                conn.rollback()
+                print(f"❌ Row counts differ after the swap ({new_rows} vs {old_rows}), rolled back")
+                return False
+        conn.commit()
+        print(f"   🔒 Writes were blocked for {time.perf_counter() - swap_started:.2f}s")
+
+        with conn.cursor() as cur:
+            cur.execute("ANALYZE user_answers")
+            if drop_old:
+                cur.execute(f"DROP TABLE {OLD_TABLE}")
+                print(f"   🗑️  Dropped {OLD_TABLE}")
+
+    print(f"\n✅ user_answers is partitioned ({new_rows} rows, {time.perf_counter() - started:.2f}s total)")
+    return True
+
+# ============================================
+# maintain
+# ============================================
+
+def write_manifest_entry(archive_dir, name, entry):
+    """Add one archived partition to <archive-dir>/manifest.json (backup_database.py's format)."""
+    path = os.path.join(archive_dir, 'manifest.json')
+    manifest = {'created_at': datetime.now(timezone.utc).isoformat(), 'page_size': DEFAULT_PAGE_SIZE, 'tables': {}}
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    manifest['tables'][name] = entry
+
+    with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+def detach_partition(conn, name, month):
+    """Fold a partition's answers into the archived totals and detach it, atomically."""
+    with conn.cursor() as cur:
+        # Writes to this month wait; the parent is only locked for the DETACH itself
+        cur.execute(f"LOCK TABLE {name} IN SHARE MODE")
+        cur.execute(f"""
+            CREATE TEMP TABLE archived_batch ON COMMIT DROP AS
+            SELECT
+                user_id,
+                COUNT(*) as total_answered,
+                COUNT(*) FILTER (WHERE is_correct) as total_correct,
+                COUNT(time_spent_seconds) as timed_answers,
+                COALESCE(SUM(time_spent_seconds), 0) as total_time_seconds,
+                COUNT(*) FILTER (WHERE difficulty_at_time = 'easy') as easy_answered,
+                COUNT(*) FILTER (WHERE difficulty_at_time = 'easy' AND is_correct) as easy_correct,
+                COUNT(*) FILTER (WHERE difficulty_at_time = 'medium') as medium_answered,
+                COUNT(*) FILTER (WHERE difficulty_at_time = 'medium' AND is_correct) as medium_correct,
+                COUNT(*) FILTER (WHERE difficulty_at_time = 'hard') as hard_answered,
+                COUNT(*) FILTER (WHERE difficulty_at_time = 'hard' AND is_correct) as hard_correct,
+                MAX(created_at) as last_practice_date
+            FROM {name}
+            WHERE user_id IS NOT NULL
+            GROUP BY user_id
+            ORDER BY user_id
+        """)
+        cur.execute(f"SELECT COUNT(*) FROM {name}")
+        rows = cur.fetchone()[0]
+
+        cur.execute(f"ALTER TABLE user_answers DETACH PARTITION {name}")
+        cur.execute(ARCHIVED_TOTALS_SQL)
+        cur.execute("INSERT INTO user_answers_archives (partition_name, range_start, range_end, row_count) "
+                    "VALUES (%s, %s::TIMESTAMP AT TIME ZONE 'UTC', %s::TIMESTAMP AT TIME ZONE 'UTC', %s)",
+                    (name, month, add_months(month, 1), rows))
+    conn.commit()
+    return rows
+
+def export_partition(conn, name, archive_dir, keep_detached=False):
+    """Write a detached partition to <archive-dir>/<name>.csv.gz, record it, drop it. Returns its entry."""
+    with conn.cursor() as cur:
+        entry = backup_table(cur, name, os.path.join(archive_dir, f"{name}.csv.gz"))
+        cur.execute("SELECT row_count FROM user_answers_archives WHERE partition_name = %s", (name,))
+        expected = cur.fetchone()[0]
+        if entry['rows'] != expected:
+            raise RuntimeError(f"{name}: exported {entry['rows']} rows, expected {expected}")
+
+        write_manifest_entry(archive_dir, name, entry)
+        cur.execute("UPDATE user_answers_archives SET archive_file = %s, sha256 = %s WHERE partition_name = %s",
+                    (os.path.join(archive_dir, entry['file']), entry['sha256'], name))
+        if not keep_detached:
+            cur.execute(f"DROP TABLE {name}")
+    conn.commit()
+    return entry
+
+def maintain(dsn=DEFAULT_DSN, months_ahead=DEFAULT_MONTHS_AHEAD, retain_months=None,
+             archive_dir=DEFAULT_ARCHIVE_DIR, keep_detached=False):
+    """Create upcoming partitions and archive expired ones. Returns True on success."""
+    this_month = current_month()
+
+    with psycopg.connect(dsn) as conn:
+        with conn.cursor() as cur:
+            if not is_partitioned(cur):
+                print("❌ user_answers isn't partitioned yet, run the migrate command first")
+                return False
+
+            created = []
+            existing = {name for name, _ in partitions(cur)}
+            cur.execute("SELECT DISTINCT date_trunc('month', created_at AT TIME ZONE 'UTC')::DATE "
+                        "FROM user_answers_default")
+            stray_months = [row[0] for row in cur.fetchall()]
+            upcoming = [add_months(this_month, ahead) for ahead in range(months_ahead + 1)]
+
+            for month in sorted(set(stray_months + upcoming)):
+                name = create_partition(cur, month)
+                conn.commit()
+                if name not in existing:
+                    created.append(name)
+            print(f"🏗️  Created {len(created)} partitions{': ' + ', '.join(created) if created else ''}")
+            if stray_months:
+                print(f"   ↪️  Moved rows out of user_answers_default for {len(stray_months)} months")
+
+            if retain_months is None:
+                return True
+
+            cutoff = add_months(this_month, -retain_months)
+            expired = [(name, partition_month(name)) for name, is_default in partitions(cur)
+                       if not is_default and partition_month(name) and partition_month(name) < cutoff]
+
+            # Detached by an earlier run that stopped before the export finished
+            cur.execute("SELECT partition_name FROM user_answers_archives "
+                        "WHERE sha256 IS NULL AND to_regclass(partition_name) IS NOT NULL ORDER BY 1")
+            unfinished = [row[0] for row in cur.fetchall()]
+
+        print(f"\n📦 Archiving {len(expired)} partitions before {cutoff:%Y-%m} into '{archive_dir}/'")
+        os.makedirs(archive_dir, exist_ok=True)
+
+        for name in unfinished:
+            entry = export_partition(conn, name, archive_dir, keep_detached)
+            print(f"   ✅ {name}: {entry['rows']} rows, {entry['compressed_bytes'] // 1024} KB (resumed)")
+
+        for name, month in expired:
+            started = time.perf_counter()
+            detach_partition(conn, name, month)
+            entry = export_partition(conn, name, archive_dir, keep_detached)
+            print(f"   ✅ {name}: {entry['rows']} rows, {entry['compressed_bytes'] // 1024} KB, "
+                  f"{'kept' if keep_detached else 'dropped'} ({time.perf_counter() - started:.2f}s)")
+
+    return True
+
+# ============================================
+# status
+# ============================================
+
+def scanned_relations(plan):
+    """Table names a JSON EXPLAIN plan reads."""
+    names = [plan['Relation Name']] if 'Relation Name' in plan else []
+    for child in plan.get('Plans', []):
+        names += scanned_relations(child)
+    return names
+
+def status(dsn=DEFAULT_DSN):
+    with psycopg.connect(dsn) as conn:
+        with conn.cursor() as cur:
+            if not is_partitioned(cur):
+                print("⚠️  user_answers isn't partitioned yet (run the migrate command)")
+                return False
+
+            print("📚 Partitions:")
+            for name, is_default in partitions(cur):
+                cur.execute("SELECT reltuples::BIGINT, pg_total_relation_size(oid) FROM pg_class WHERE relname = %s",
+                            (name,))
+                estimate, size = cur.fetchone()
+                if is_default:
+                    estimate = cur.execute(f"SELECT COUNT(*) FROM {name}").fetchone()[0]
+                print(f"   {name:28s} ~{max(estimate, 0):>10} rows  {size // 1024:>8} KB"
+                      f"{'  ⚠️  rows outside every month partition' if is_default and estimate else ''}")
+
+            cur.execute("SELECT partition_name, row_count, archive_file, archived_at FROM user_answers_archives "
+                        "ORDER BY range_start")
+            archives = cur.fetchall()
+            if archives:
+                print("\n🗄️  Archived:")
+                for name, rows, archive_file, archived_at in archives:
+                    print(f"   {name:28s} {rows:>11} rows  {archive_file or '(export pending)'}  "
+                          f"{archived_at:%Y-%m-%d}")
+
+            # Both bounds: with only a lower one, future months and the default partition are scanned too
+            cur.execute("EXPLAIN (FORMAT JSON) SELECT COUNT(*) FROM user_answers "
+                        "WHERE created_at > NOW() - INTERVAL '7 days' AND created_at <= NOW()")
+            scanned = sorted(set(scanned_relations(cur.fetchone()[0][0]['Plan'])))
+            print(f"\n🔎 A 7-day query scans {len(scanned)} partition(s): {', '.join(scanned)}")
+    return True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Partition, maintain and archive user_answers")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate_cmd = commands.add_parser("migrate", help="Convert an unpartitioned user_answers")
+    migrate_cmd.add_argument("--dsn", default=DEFAULT_DSN)
+    migrate_cmd.add_argument("--drop-old", action="store_true", help=f"Drop {OLD_TABLE} after the swap")
+
+    maintain_cmd = commands.add_parser("maintain", help="Create upcoming partitions, archive old ones")
+    maintain_cmd.add_argument("--dsn", default=DEFAULT_DSN)
+    maintain_cmd.add_argument("--months-ahead", type=int, default=DEFAULT_MONTHS_AHEAD)
+    maintain_cmd.add_argument("--retain-months", type=int, help="Archive months older than this many months")
+    maintain_cmd.add_argument("--archive-dir", default=DEFAULT_ARCHIVE_DIR)
+    maintain_cmd.add_argument("--keep-detached", action="store_true",
+                              help="Keep archived partitions as standalone tables")
+
+    status_cmd = commands.add_parser("status", help="List partitions and archives")
+    status_cmd.add_argument("--dsn", default=DEFAULT_DSN)
+
+    args = parser.parse_args()
+
+    print("\n" + "="*80)
+    print(f"  🗂️  user_answers Partitions: {args.command}")
+    print("="*80 + "\n")
+
+    if args.command == "migrate":
+        ok = migrate(args.dsn, args.drop_old)
+    elif args.command == "maintain":
+        ok = maintain(args.dsn, args.months_ahead, args.retain_months, args.archive_dir, args.keep_detached)
+    else:
+        ok = status(args.dsn)
+
+    print("\n" + "="*80 + "\n")
+    raise SystemExit(0 if ok else 1)
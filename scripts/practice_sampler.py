@@ -0,0 +1,257 @@
+"""
+Personalized practice sets drawn with Walker alias tables.
+
+The profile's weak_areas and target_companies only shape the LLM prompt
+(buildPersonalizedInstruction in the app). This engine uses them, plus
+the user's accuracy per question type, to draw practice questions from
+the question bank.
+
+A user's weight for a question depends only on its question type, category
+and company. Questions are grouped into classes by those three fields, so
+a user's distribution is one weight per class (class size x boosts), not one
+per question. Each user gets an alias table over the classes. A draw picks
+a class in O(1) from that table, then a uniform member of the class in O(1).
+Weights per class:
+    size x (1 + WEAK_AREA_BOOST if the class covers a weak area)
+         x (1 + COMPANY_BOOST if its company is a target company)
+         x (1 + ACCURACY_WEIGHT x (1 - accuracy on that question type))
+Accuracy is (correct + 1) / (answered + 2) from user_daily_stats, the daily
+tallies of user_answers (archived months included), so types the user
+hasn't tried yet count as 50%.
+
+The batch API builds every user's table in one pass. The weights are a
+users x classes matrix, and the tables are built with the "smallest
+pairs with largest" alias construction, vectorized over all users at
+once: K - 1 NumPy steps for K classes. Sets are then drawn for all users
+with a handful of array operations. Repeats within a set are redrawn.
+
+HOW TO USE:
+1. Install dependencies:
+   pip install numpy "psycopg[binary]"
+
+2. Draw sets (direct database connection string):
+   python practice_sampler.py --dsn postgresql://postgres@localhost/postgres --user <user_id> --size 10
+   python practice_sampler.py --dsn ... --all --size 10 --output practice_sets.json
+"""
+
+import os
+import json
+import time
+import argparse
+
+import numpy as np
+import psycopg
+
+DEFAULT_DSN = os.environ.get("DATABASE_URL", "postgresql://postgres@localhost/postgres")
+DEFAULT_SET_SIZE = 10
+
+WEAK_AREA_BOOST = 2.0
+COMPANY_BOOST = 1.0
+ACCURACY_WEIGHT = 2.0
+
+# question_type / category values -> the app's weak area names
+# ('coding', 'stats', 'ml', 'case', 'communication')
+AREA_ALIASES = {
+    'sql': 'coding',
+    'python': 'coding',
+    'behavioral': 'communication',
+}
+
+def question_areas(question_type, category):
+    """Weak areas a question practices. 'coding/stats' style types count for each part."""
+    areas = {AREA_ALIASES.get(part, part) for part in (question_type or '').lower().split('/') if part}
+    if (category or '').lower() == 'coding':
+        areas.add('coding')
+    return areas
+
+def build_alias_tables(weights):
+    """
+    Alias tables for every row of a (users x classes) weight matrix at once.
+
+    Returns (prob, alias): a draw from row u picks class i uniformly, keeps
+    it with probability prob[u, i], otherwise takes alias[u, i]. Each step
+    pairs every row's smallest remaining scaled weight (<= 1) with its
+    largest (>= 1). Rows of zeros become uniform.
+    """
+    weights = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+    users, classes = weights.shape
+    rows = np.arange(users)
+
+    totals = weights.sum(axis=1, keepdims=True)
+    remaining = np.where(totals > 0, weights * classes / np.where(totals > 0, totals, 1), 1.0)
+    prob = np.ones((users, classes))
+    alias = np.tile(np.arange(classes), (users, 1))
+    active = np.ones((users, classes), dtype=bool)
+
+    for _ in range(classes - 1):
+        small = np.where(active, remaining, np.inf).argmin(axis=1)
+        large = np.where(active, remaining, -np.inf).argmax(axis=1)
+        small_value = remaining[rows, small]
+
+        prob[rows, small] = small_value
+        alias[rows, small] = large
+        remaining[rows, large] -= 1.0 - small_value
+        active[rows, small] = False
+
+    return np.minimum(prob, 1.0), alias
+
+def alias_draw(prob, alias, count, rng, users=None):
+    """count class draws per row (or per row in users): an (n x count) array, O(1) per draw."""
+    users = np.arange(prob.shape[0]) if users is None else np.asarray(users)
+    picks = rng.integers(prob.shape[1], size=(len(users), count))
+    keep = rng.random((len(users), count)) < prob[users[:, None], picks]
+    return np.where(keep, picks, alias[users[:, None], picks])
+
+class PracticeSampler:
+    """Question bank grouped into classes, ready to draw weighted practice sets."""
+
+    def __init__(self, questions):
+        """questions: dicts with id, question_type, category and company."""
+        keys = [((q.get('question_type') or '').strip().lower(),
+                 (q.get('category') or '').strip(),
+                 (q.get('company') or '').strip().lower()) for q in questions]
+        self.class_keys = sorted(set(keys))
+        class_index = {key: i for i, key in enumerate(self.class_keys)}
+
+        question_class = np.array([class_index[key] for key in keys], dtype=np.int64)
+        order = np.argsort(question_class, kind='stable')  # questions grouped by class
+        self.question_ids = np.array([q['id'] for q in questions], dtype=object)[order]
+        self.class_sizes = np.bincount(question_class, minlength=len(self.class_keys))
+        self.class_starts = np.concatenate(([0], np.cumsum(self.class_sizes)[:-1]))
+
+        self.types = sorted({question_type for question_type, _, _ in self.class_keys})
+        self.class_type = np.array([self.types.index(t) for t, _, _ in self.class_keys])
+        self.class_areas = [question_areas(t, category) for t, category, _ in self.class_keys]
+        self.class_company = [company for _, _, company in self.class_keys]
+
+    def class_weights(self, profiles, accuracy):
+        """
+        (users x classes) weights.
+
+        profiles: [(user_id, weak_areas, target_companies)]
+        accuracy: {(user_id, question_type): (answered, correct)}
+        """
+        users, classes = len(profiles), len(self.class_keys)
+        user_rows = {profile[0]: u for u, profile in enumerate(profiles)}
+        type_index = {t: i for i, t in enumerate(self.types)}
+        answered = np.zeros((users, len(self.types)))
+        correct = np.zeros((users, len(self.types)))
+        weak = np.zeros((users, classes), dtype=bool)
+        company = np.zeros((users, classes), dtype=bool)
+
+        for u, (user_id, weak_areas, target_companies) in enumerate(profiles):
+            weak_areas = {area.lower() for area in weak_areas or []}
+            targets = {c.lower() for c in target_companies or []}
+            if weak_areas:
+                weak[u] = [bool(areas & weak_areas) for areas in self.class_areas]
+            if targets:
+                company[u] = [c in targets for c in self.class_company]
+
+        for (user_id, question_type), (n, k) in accuracy.items():
+            t = type_index.get((question_type or '').lower())
+            u = user_rows.get(user_id)
+            if t is not None and u is not None:
+                answered[u, t] += n
+                correct[u, t] += k
+
+        smoothed = (correct + 1) / (answered + 2)
+        return (self.class_sizes[None, :]
+                * (1 + WEAK_AREA_BOOST * weak)
+                * (1 + COMPANY_BOOST * company)
+                * (1 + ACCURACY_WEIGHT * (1 - smoothed[:, self.class_type])))
+
+    def sample_sets(self, profiles, accuracy, set_size=DEFAULT_SET_SIZE, seed=None):
+        """One practice set (question ids) per profile: {user_id: [ids]}."""
+        rng = np.random.default_rng(seed)
+        prob, alias = build_alias_tables(self.class_weights(profiles, accuracy))
+        set_size = min(set_size, len(self.question_ids))
+
+        sets = [[] for _ in profiles]
+        seen = [set() for _ in profiles]
+        pending = np.arange(len(profiles))
+        draws = set_size
+
+        while len(pending):
+            classes = alias_draw(prob, alias, draws, rng, pending)
+            members = (self.class_starts[classes]
+                       + (rng.random(classes.shape) * self.class_sizes[classes]).astype(np.int64))
+
+            still_short = []
+            for u, row in zip(pending, members):
+                for question in row:
+                    if question not in seen[u]:
+                        seen[u].add(question)
+                        sets[u].append(question)
+                        if len(sets[u]) == set_size:
+                            break
+                if len(sets[u]) < set_size:
+                    still_short.append(u)
+
+            pending = np.array(still_short, dtype=np.int64)
+            draws = set_size * 2  # Only users whose draws repeated come back
+
+        return {profile[0]: [self.question_ids[q] for q in chosen] for profile, chosen in zip(profiles, sets)}
+
+def load_from_database(dsn, user_id=None):
+    """(questions, profiles, accuracy) for every user, or just one."""
+    with psycopg.connect(dsn) as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT id, question_type, category, company, question_text FROM interview_questions")
+            questions = [{'id': str(row[0]), 'question_type': row[1], 'category': row[2], 'company': row[3],
+                          'question_text': row[4]} for row in cur.fetchall()]
+
+            user_filter = "WHERE id = %s" if user_id else ""
+            cur.execute(f"SELECT id::TEXT, weak_areas, target_companies FROM user_profiles {user_filter} ORDER BY id",
+                        (user_id,) if user_id else ())
+            profiles = cur.fetchall()
+
+            user_filter = "WHERE user_id = %s" if user_id else ""
+            cur.execute(f"SELECT user_id::TEXT, question_type, SUM(answered), SUM(correct) FROM user_daily_stats "
+                        f"{user_filter} GROUP BY 1, 2", (user_id,) if user_id else ())
+            accuracy = {(u, t): (int(n), int(k)) for u, t, n, k in cur.fetchall()}
+
+    return questions, profiles, accuracy
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Weighted practice sets from Walker alias tables")
+    parser.add_argument("--dsn", default=DEFAULT_DSN)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--user", help="Draw one set for this user_id")
+    target.add_argument("--all", action="store_true", help="Draw a set for every user")
+    parser.add_argument("--size", type=int, default=DEFAULT_SET_SIZE)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--output", help="Write {user_id: [question ids]} JSON here")
+    args = parser.parse_args()
+
+    print("\n" + "="*80)
+    print("  🎯 Personalized Practice Sampler")
+    print("="*80 + "\n")
+
+    started = time.perf_counter()
+    questions, profiles, accuracy = load_from_database(args.dsn, args.user)
+    print(f"📚 {len(questions)} questions, {len(profiles)} users, "
+          f"{len(accuracy)} accuracy rows ({time.perf_counter() - started:.2f}s)")
+
+    if not profiles or not questions:
+        print("❌ No matching user or no questions")
+        raise SystemExit(1)
+
+    started = time.perf_counter()
+    sampler = PracticeSampler(questions)
+    sets = sampler.sample_sets(profiles, accuracy, args.size, args.seed)
+    elapsed = time.perf_counter() - started
+    print(f"🎲 {len(sets)} sets of {args.size} from {len(sampler.class_keys)} classes in {elapsed:.2f}s")
+
+    if args.user:
+        text = {q['id']: q['question_text'] for q in questions}
+        user_id, weak_areas, companies = profiles[0]
+        print(f"\n   Weak areas: {', '.join(weak_areas or []) or '-'} | Companies: {', '.join(companies or []) or '-'}\n")
+        for i, question_id in enumerate(sets[user_id], 1):
+            print(f"   {i:2d}. {' '.join(text[question_id].split())[:100]}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(sets, f)
+        print(f"\n💾 Saved to '{args.output}'")
+
+    print("\n" + "="*80 + "\n")
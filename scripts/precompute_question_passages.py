@@ -0,0 +1,163 @@
+"""
+Precompute the best book passages for every interview question.
+
+When a user clicks a question to see its answer, the app downloads the
+whole documents table and scores every page in the browser. This script
+does that work once, offline: it ranks the passages for every question
+with the local BM25 index (optionally blended with the LSA index) and
+writes a small question -> passages table.
+
+With that table uploaded, a click costs two small queries: one row from
+question_passages, then at most five passages from documents by chunk_id.
+
+HOW TO USE:
+1. Build the passages and the BM25 index first:
+   python chunk_book_pages.py
+   python build_bm25_index.py build
+
+2. Run this script:
+   python precompute_question_passages.py
+   python precompute_question_passages.py --lsa-weight 0.5   (needs build_lsa_index.py build)
+
+3. Upload 'question_passages.csv' to the question_passages table in Supabase
+   (created by supabase/setup.sql)
+"""
+
+import os
+import csv
+import time
+import argparse
+
+import numpy as np
+
+from build_bm25_index import DEFAULT_INDEX_FILE, BM25Index, load_passages, tokenize, top_k
+from question_keys import DEFAULT_QUESTIONS_FILE, load_questions
+
+DEFAULT_TOP_K = 5
+
+def load_bm25(index_file, chunks_file):
+    """Load the saved BM25 index, or build one in memory from the passages CSV."""
+    if os.path.exists(index_file):
+        print(f"📂 Loading BM25 index '{index_file}'")
+        return BM25Index.load(index_file)
+
+    print(f"📂 No '{index_file}', building BM25 index from '{chunks_file}'")
+    return BM25Index.build(load_passages(chunks_file))
+
+def attach_lsa(lsa_dir, bm25):
+    """Open the LSA index and line its passage vectors up with the BM25 passage numbers."""
+    from build_lsa_index import KINDS, LSAIndex
+
+    lsa = LSAIndex(lsa_dir)
+    bm25_position = {doc_id: i for i, doc_id in enumerate(bm25.doc_ids)}
+
+    rows, positions = [], []
+    for row in np.flatnonzero(np.asarray(lsa.kinds) == KINDS['passage']):
+        position = bm25_position.get(str(lsa.ids[row]))
+        if position is not None:
+            rows.append(row)
+            positions.append(position)
+
+    lsa.passage_vectors = np.asarray(lsa.vectors[np.array(rows, dtype=np.int64)])
+    lsa.bm25_positions = np.array(positions, dtype=np.int64)
+    return lsa
+
+def lsa_scores_for(lsa, bm25, text):
+    """Cosine similarity of every BM25 passage to the text, in BM25 passage order."""
+    vector = lsa.embed(text)
+    if vector is None:
+        return None
+
+    scores = np.zeros(len(bm25.doc_ids), dtype=np.float32)
+    scores[lsa.bm25_positions] = np.maximum(lsa.passage_vectors @ vector, 0)
+    return scores
+
+def rank_passages(bm25, text, k, lsa=None, lsa_weight=0.0):
+    """Top-k (chunk_id, score) for a question: BM25, optionally blended with LSA cosine."""
+    scores = bm25.score_terms(tokenize(text))
+
+    if lsa is not None and lsa_weight > 0:
+        semantic = lsa_scores_for(lsa, bm25, text)
+        if semantic is not None:
+            # Scale BM25 to [0, 1] per question so the blend weight means the same everywhere
+            peak = scores.max()
+            if peak > 0:
+                scores = scores / peak
+            scores = scores + lsa_weight * semantic
+
+    return top_k(scores, k, bm25.doc_ids)
+
+def postgres_array(values):
+    """Format a list as a Postgres array literal for CSV upload."""
+    return "{" + ",".join(str(value) for value in values) + "}"
+
+def precompute(questions_file=DEFAULT_QUESTIONS_FILE, chunks_file="book_chunks.csv",
+               index_file=DEFAULT_INDEX_FILE, output_file="question_passages.csv",
+               k=DEFAULT_TOP_K, lsa_dir=None, lsa_weight=0.0):
+    questions = load_questions(questions_file)
+    if not questions:
+        print(f"❌ No questions found in '{questions_file}'")
+        return
+
+    bm25 = load_bm25(index_file, chunks_file)
+    lsa = attach_lsa(lsa_dir, bm25) if lsa_dir and lsa_weight > 0 else None
+    if lsa is not None:
+        print(f"📂 Blending in LSA index '{lsa_dir}' (weight {lsa_weight})")
+
+    print(f"\n🔗 Ranking passages for {len(questions)} questions (top {k})...")
+
+    started = time.perf_counter()
+    seen = set()
+    written = 0
+    without_match = 0
+
+    with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=['content_hash', 'passage_ids', 'scores'])
+        writer.writeheader()
+
+        for question in questions:
+            # The same question can appear in several sources
+            if question['content_hash'] in seen:
+                continue
+            seen.add(question['content_hash'])
+
+            ranked = rank_passages(bm25, question['question_text'], k, lsa, lsa_weight)
+            if not ranked:
+                without_match += 1
+                continue
+
+            writer.writerow({
+                'content_hash': question['content_hash'],
+                'passage_ids': postgres_array(doc_id for doc_id, _ in ranked),
+                'scores': postgres_array(f"{score:.4f}" for _, score in ranked)
+            })
+            written += 1
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ Wrote {written} questions to '{output_file}' in {elapsed:.1f}s "
+          f"({elapsed / max(len(seen), 1) * 1000:.2f} ms per question)")
+    if without_match:
+        print(f"   - {without_match} questions had no matching passage")
+
+    print(f"\n📤 Next step: Upload '{output_file}' to the question_passages table in Supabase")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute top-k book passages for every question")
+    parser.add_argument("--questions", default=DEFAULT_QUESTIONS_FILE)
+    parser.add_argument("--chunks", default="book_chunks.csv")
+    parser.add_argument("--index", default=DEFAULT_INDEX_FILE)
+    parser.add_argument("--output", default="question_passages.csv")
+    parser.add_argument("-k", type=int, default=DEFAULT_TOP_K)
+    parser.add_argument("--lsa-dir", default="book_lsa_index")
+    parser.add_argument("--lsa-weight", type=float, default=0.0,
+                        help="Blend in LSA cosine similarity with this weight (0 = BM25 only)")
+    args = parser.parse_args()
+
+    print("\n" + "="*80)
+    print("  🔗 Question -> Passage Precomputation")
+    print("="*80 + "\n")
+
+    precompute(args.questions, args.chunks, args.index, args.output, args.k,
+               args.lsa_dir, args.lsa_weight)
+
+    print("\n" + "="*80 + "\n")
@@ -0,0 +1,696 @@
+"""
+Local read-only stand-in for the app's Supabase REST API.
+
+Load-testing the app against Supabase hammers the real project. This server
+answers the PostgREST subset the app uses from a prebuilt index of the
+questions and the book passages, so it can stand in for
+Supabase locally or sit in front of it as a caching read tier:
+
+- GET /rest/v1/<table> with select=, column filters (eq, neq, in, like,
+  ilike, is, each optionally not.), order=, limit= and offset=, for
+  interview_questions, documents and question_passages
+- POST /rest/v1/rpc/search_documents (ranked with the BM25 index from
+  build_bm25_index.py instead of ts_rank_cd)
+- POST /rest/v1/rpc/sample_questions (uniform random questions)
+- POST /rest/v1/<any table> is accepted and dropped (201), so scripted
+  sessions can submit answers; nothing is ever written
+
+The index is a directory of flat files. The tables, bitsets and postings are
+opened with mmap, like build_lsa_index.py, so queries read only the pages
+they touch. Startup still loads the BM25 term list and per-passage length
+norms, so it grows with the vocabulary and the passage count:
+- <table>.rows.bin: every row pre-serialized as JSON, back to back, with
+  its offsets in <table>.rows.npy. select=* responses are slices of it.
+- <table>.<column>.bin: the column's text values joined by \\x00 (NULL is
+  \\x01), offsets in <table>.<column>.npy. eq filters are one regex pass
+  over it; like/ilike find the pattern's longest literal with a substring
+  search and check the full pattern only on the rows it hits.
+- <table>.<column>.lower.bin: the same blob ASCII-lowercased (same
+  offsets), for ilike. Only written for columns with uppercase letters.
+- <table>.<column>.bits.npy: for columns with few distinct values
+  (difficulty, company, ...), one bitset per value, packed like
+  question_facets.py, so eq/in filters are bitwise ops.
+- documents.bm25.*.npy and bm25_terms.json: the BM25 postings.
+Filters become bitsets over the table's rows and are ANDed together.
+
+Responses are kept in an in-process LRU cache keyed by the request
+(sample_questions is random and never cached). GET /_stats reports cache
+hits and misses. CORS is open, so the app can point at it directly.
+
+HOW TO USE:
+1. Install dependencies:
+   pip install numpy
+
+2. Build the index (questions, chunk_book_pages.py passages and
+   precompute_question_passages.py output; missing files are skipped).
+   Use a question export with the table's columns, like the default
+   backups/interview_questions_data.csv: the app samples coding questions
+   by category and Easy/Medium/Advanced difficulty, which the merged
+   corpus (collected_questions/) doesn't have, so build warns about it:
+   python question_api_server.py build --questions backups/interview_questions_data.csv \\
+       --chunks book_chunks.csv --passages question_passages.csv
+
+3. Serve it, then set CONFIG.SUPABASE_URL to 'http://localhost:54321' in the app
+   (any anon key works):
+   python question_api_server.py serve --port 54321 --cache-size 4096
+"""
+
+import os
+import re
+import csv
+import sys
+import json
+import mmap
+import time
+import uuid
+import asyncio
+import argparse
+from collections import OrderedDict
+from urllib.parse import urlsplit, parse_qsl
+
+import numpy as np
+
+from build_bm25_index import BM25Index, tokenize, top_k
+from question_facets import pack_bits
+from question_keys import load_questions
+
+DEFAULT_QUESTIONS_FILE = "backups/interview_questions_data.csv"  # Export of interview_questions
+DEFAULT_INDEX_DIR = "question_api_index"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 54321  # The Supabase CLI's local API port
+DEFAULT_CACHE_SIZE = 4096
+DEFAULT_MAX_ROWS = 1000  # Supabase's default API row cap
+
+FACET_MAX_VALUES = 64  # Columns with at most this many distinct values get bitsets
+MAX_HEADER_BYTES = 65536
+MAX_BODY_BYTES = 1 << 20
+
+SEPARATOR = b'\x00'
+NULL = b'\x01'
+
+QUESTION_ID_NAMESPACE = uuid.UUID('5d1c2b7e-6a0f-4c49-9b1e-2f0c7a4e8d31')
+
+# Columns sample_questions() filters on
+SAMPLE_COLUMNS = ['question_type', 'difficulty', 'category']
+
+# RETURNS TABLE(...) of search_documents()
+SEARCH_COLUMNS = ['id', 'book_name', 'page_number', 'chunk_id', 'content']
+
+DOCUMENT_TYPES = {'id': 'int', 'page_number': 'int', 'chunk_index': 'int', 'char_start': 'int', 'char_end': 'int'}
+PASSAGE_TYPES = {'passage_ids': 'text[]', 'scores': 'real[]'}
+
+class APIError(Exception):
+    """A PostgREST-style error response."""
+
+    def __init__(self, status, code, message, details=None):
+        super().__init__(message)
+        self.status = status
+        self.body = {'code': code, 'details': details, 'hint': None, 'message': message}
+
+# ============================================
+# Building the index
+# ============================================
+
+def parse_array(text):
+    """Postgres array literal ('{a,b}') -> list of strings."""
+    inner = (text or '').strip()[1:-1]
+    return next(csv.reader([inner])) if inner else []
+
+def json_value(text, kind):
+    if text is None:
+        return None
+    if kind == 'int':
+        return int(text)
+    if kind == 'real':
+        return float(text)
+    if kind == 'text[]':
+        return parse_array(text)
+    if kind == 'real[]':
+        return [float(v) for v in parse_array(text)]
+    return text
+
+def write_table(index_dir, name, columns, types, rows):
+    """Write one table: JSON rows, value blobs per column and bitsets for low-cardinality columns."""
+    facets = {}
+    lowered = []
+    with open(os.path.join(index_dir, f"{name}.rows.bin"), 'wb') as f:
+        offsets = [0]
+        for row in rows:
+            encoded = json.dumps({c: json_value(row.get(c), types.get(c, 'text')) for c in columns},
+                                 ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            f.write(encoded)
+            offsets.append(offsets[-1] + len(encoded))
+    np.save(os.path.join(index_dir, f"{name}.rows.npy"), np.array(offsets, dtype=np.int64))
+
+    for column in columns:
+        values = [row.get(column) for row in rows]
+        lower_path = os.path.join(index_dir, f"{name}.{column}.lower.bin")
+        has_upper = False
+        with open(os.path.join(index_dir, f"{name}.{column}.bin"), 'wb') as f, open(lower_path, 'wb') as lower:
+            # offsets[i] is the separator before value i, offsets[-1] the final separator
+            offsets = []
+            position = 0
+            for value in values:
+                encoded = NULL if value is None else value.encode('utf-8')
+                f.write(SEPARATOR + encoded)
+                lower.write(SEPARATOR + encoded.lower())  # bytes.lower() only maps ASCII: same length
+                has_upper = has_upper or encoded != encoded.lower()
+                offsets.append(position)
+                position += 1 + len(encoded)
+            f.write(SEPARATOR)
+            lower.write(SEPARATOR)
+            offsets.append(position)
+        if has_upper:
+            lowered.append(column)
+        else:
+            os.remove(lower_path)  # Already lowercase: ilike reads the blob itself
+        np.save(os.path.join(index_dir, f"{name}.{column}.npy"), np.array(offsets, dtype=np.int64))
+
+        distinct = sorted({value for value in values if value is not None})
+        if types.get(column, 'text') == 'text' and 0 < len(distinct) <= FACET_MAX_VALUES:
+            codes = {value: i for i, value in enumerate(distinct)}
+            flags = np.zeros((len(distinct), len(rows)), dtype=bool)
+            for i, value in enumerate(values):
+                if value is not None:
+                    flags[codes[value], i] = True
+            np.save(os.path.join(index_dir, f"{name}.{column}.bits.npy"), pack_bits(flags))
+            facets[column] = distinct
+
+    return {'rows': len(rows), 'columns': {c: types.get(c, 'text') for c in columns}, 'facets': facets,
+            'lowered': lowered}
+
+def read_csv(path):
+    csv.field_size_limit(sys.maxsize)
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        return reader.fieldnames or [], [{k: (v if v != '' else None) for k, v in row.items()} for row in reader]
+
+def build_index(questions_file=DEFAULT_QUESTIONS_FILE, chunks_file="book_chunks.csv",
+                passages_file="question_passages.csv", index_dir=DEFAULT_INDEX_DIR):
+    started = time.perf_counter()
+    os.makedirs(index_dir, exist_ok=True)
+    meta = {'tables': {}}
+
+    if os.path.exists(questions_file):
+        # One row per content_hash, like the unique index on interview_questions
+        questions = {}
+        for row in load_questions(questions_file):
+            row = {k: (v if v != '' else None) for k, v in row.items()}
+            row['id'] = str(uuid.uuid5(QUESTION_ID_NAMESPACE, row['content_hash']))
+            questions.setdefault(row['content_hash'], row)
+        rows = list(questions.values())
+        columns = ['id'] + [c for c in rows[0] if c != 'id'] if rows else []
+        meta['tables']['interview_questions'] = write_table(index_dir, 'interview_questions', columns, {}, rows)
+        print(f"📚 interview_questions: {len(rows)} questions from '{questions_file}'")
+        missing = [c for c in SAMPLE_COLUMNS if c not in columns]
+        if missing:
+            print(f"⚠️  No {', '.join(missing)} column in '{questions_file}': sample_questions "
+                  f"will find nothing when filtering on it (the app's coding questions need category)")
+    else:
+        print(f"⚠️  No '{questions_file}', skipping interview_questions")
+
+    if os.path.exists(chunks_file):
+        fieldnames, rows = read_csv(chunks_file)
+        for i, row in enumerate(rows, 1):
+            row['id'] = str(i)
+        columns = ['id'] + fieldnames
+        meta['tables']['documents'] = write_table(index_dir, 'documents', columns, DOCUMENT_TYPES, rows)
+
+        bm25 = BM25Index.build([(str(i), row.get('content') or '') for i, row in enumerate(rows)])
+        for name in ('offsets', 'doc_deltas', 'term_freqs', 'doc_lengths'):
+            np.save(os.path.join(index_dir, f"documents.bm25.{name}.npy"), getattr(bm25, name))
+        with open(os.path.join(index_dir, 'bm25_terms.json'), 'w', encoding='utf-8') as f:
+            json.dump(bm25.terms, f, separators=(',', ':'))
+        print(f"📖 documents: {len(rows)} passages from '{chunks_file}' ({len(bm25.terms)} BM25 terms)")
+    else:
+        print(f"⚠️  No '{chunks_file}', skipping documents")
+
+    if os.path.exists(passages_file):
+        fieldnames, rows = read_csv(passages_file)
+        meta['tables']['question_passages'] = write_table(index_dir, 'question_passages', fieldnames,
+                                                          PASSAGE_TYPES, rows)
+        print(f"🔗 question_passages: {len(rows)} rows from '{passages_file}'")
+    else:
+        print(f"⚠️  No '{passages_file}', skipping question_passages")
+
+    with open(os.path.join(index_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    print(f"\n✅ Built '{index_dir}' in {time.perf_counter() - started:.1f}s")
+
+# ============================================
+# Reading the index
+# ============================================
+
+def open_blob(path):
+    if os.path.getsize(path) == 0:
+        return b''  # mmap can't map an empty file
+    with open(path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def like_regex(pattern, ignore_case):
+    """Regex matching a whole \\x00-delimited value against a LIKE pattern (* works as %, as in PostgREST)."""
+    parts = []
+    for char in pattern:
+        if char in '%*':
+            parts.append(b'[^\\x00]*')
+        elif char == '_':
+            parts.append(b'[^\\x00]')
+        else:
+            parts.append(re.escape(char.encode('utf-8')))
+    return re.compile(b'\\x00' + b''.join(parts) + b'(?=\\x00)', re.IGNORECASE if ignore_case else 0)
+
+class Table:
+    """One table of the index, memory-mapped."""
+
+    def __init__(self, index_dir, name, meta):
+        self.name = name
+        self.size = meta['rows']
+        self.types = meta['columns']
+        self.rows_blob = open_blob(os.path.join(index_dir, f"{name}.rows.bin"))
+        self.row_offsets = np.load(os.path.join(index_dir, f"{name}.rows.npy"), mmap_mode='r')
+        self.blobs = {c: open_blob(os.path.join(index_dir, f"{name}.{c}.bin")) for c in self.types}
+        self.offsets = {c: np.load(os.path.join(index_dir, f"{name}.{c}.npy"), mmap_mode='r') for c in self.types}
+        self.facets = {c: ({v: i for i, v in enumerate(values)},
+                           np.load(os.path.join(index_dir, f"{name}.{c}.bits.npy"), mmap_mode='r'))
+                       for c, values in meta['facets'].items()}
+        self.lowered = {c: open_blob(os.path.join(index_dir, f"{name}.{c}.lower.bin")) if c in meta['lowered']
+                        else self.blobs[c] for c in self.types}  # ASCII-lowercased blobs, for ilike
+        self.all = pack_bits(np.ones(self.size, dtype=bool))[0]
+
+    def column(self, name):
+        if name not in self.types:
+            raise APIError(400, '42703', f"column {self.name}.{name} does not exist")
+        return name
+
+    def value(self, column, row):
+        """Text value of one cell (None for NULL)."""
+        offsets = self.offsets[column]
+        raw = self.blobs[column][offsets[row] + 1:offsets[row + 1]]
+        return None if raw == NULL else raw.decode('utf-8')
+
+    def rows_to_bits(self, rows):
+        flags = np.zeros(self.size, dtype=bool)
+        flags[rows] = True
+        return pack_bits(flags)[0]
+
+    def scan(self, column, regex):
+        """Bitset of the rows whose value matches a regex anchored at its leading separator."""
+        starts = [match.start() for match in regex.finditer(self.blobs[column])]
+        rows = np.searchsorted(self.offsets[column], np.array(starts, dtype=np.int64), side='right') - 1
+        return self.rows_to_bits(rows)
+
+    def like(self, column, pattern, ignore_case, limit=None):
+        """Bitset for a LIKE/ILIKE pattern (only the first `limit` matching rows, if given).
+
+        Finds the pattern's longest literal piece with a plain substring search
+        (with the value separator when it starts or ends the pattern), skipping
+        to the next row after each hit, and checks the whole pattern only on those
+        rows. ILIKE runs on the ASCII-lowercased copy written at build time (same offsets);
+        patterns without a usable literal fall back to the regex scan.
+        """
+        pieces = re.split(r'([%*_])', pattern)  # literals at even positions
+        at = max(range(0, len(pieces), 2), key=lambda i: len(pieces[i]))
+        literal = pieces[at]
+        if not literal or (ignore_case and not pattern.isascii()):  # the scan ignores limit
+            return self.scan(column, like_regex(pattern, ignore_case))
+
+        blob = self.blobs[column]
+        if ignore_case:
+            blob, pattern, literal = self.lowered[column], pattern.lower(), literal.lower()
+        regex = like_regex(pattern, False)
+        needle = literal.encode('utf-8')
+        if at == 0:
+            needle = SEPARATOR + needle
+        if at == len(pieces) - 1:
+            needle = needle + SEPARATOR
+        contains = re.fullmatch(r'[%*]+[^%*_]+[%*]+', pattern) is not None
+
+        offsets = self.offsets[column]
+        rows = []
+        position = blob.find(needle)
+        while position != -1 and (limit is None or len(rows) < limit):
+            row = int(np.searchsorted(offsets, position, side='right')) - 1
+            if contains or regex.match(blob, offsets[row]):
+                rows.append(row)
+            position = blob.find(needle, offsets[row + 1])
+        return self.rows_to_bits(np.array(rows, dtype=np.int64))
+
+    def equals(self, column, value):
+        facet = self.facets.get(column)
+        if facet is not None:
+            code = facet[0].get(value)
+            return np.array(facet[1][code]) if code is not None else np.zeros_like(self.all)
+        return self.scan(column, re.compile(SEPARATOR + re.escape(value.encode('utf-8')) + b'(?=\\x00)'))
+
+    def filter(self, column, expression, limit=None):
+        """Bitset for a PostgREST filter like 'eq.hard', 'in.(a,b)', 'not.ilike.*tree*'.
+
+        limit lets like/ilike stop after that many matching rows, for callers
+        that need no more than the first rows in table order.
+        """
+        column = self.column(column)
+        negate = expression.startswith('not.')
+        if negate:
+            expression = expression[4:]
+        operator, _, operand = expression.partition('.')
+
+        if operator == 'eq':
+            bits = self.equals(column, operand)
+        elif operator == 'neq':
+            bits = ~self.equals(column, operand) & ~self.filter(column, 'is.null') & self.all
+        elif operator == 'in':
+            if not (operand.startswith('(') and operand.endswith(')')):
+                raise APIError(400, 'PGRST100', f"failed to parse filter ({expression})")
+            bits = np.zeros_like(self.all)
+            for value in next(csv.reader([operand[1:-1]])) if operand[1:-1] else []:
+                bits |= self.equals(column, value)
+        elif operator in ('like', 'ilike'):
+            bits = self.like(column, operand, operator == 'ilike', None if negate else limit)
+        elif operator == 'is' and operand == 'null':
+            bits = self.scan(column, re.compile(SEPARATOR + re.escape(NULL) + b'(?=\\x00)'))
+        else:
+            raise APIError(400, 'PGRST100', f"unsupported filter ({operator}.{operand})")
+
+        return ~bits & self.all if negate else bits
+
+    def order(self, rows, order):
+        """Sort row numbers by 'col.asc,col2.desc.nullsfirst' (NULLs last ascending, first descending)."""
+        for term in reversed(order.split(',')):
+            column, *options = term.strip().split('.')
+            column = self.column(column)
+            descending = 'desc' in options
+            nulls_first = 'nullsfirst' in options or (descending and 'nullslast' not in options)
+            kind = self.types[column]
+
+            values = [json_value(self.value(column, row), kind) for row in rows]
+            present = [(v, row) for v, row in zip(values, rows) if v is not None]
+            missing = [row for v, row in zip(values, rows) if v is None]
+            present.sort(key=lambda pair: pair[0], reverse=descending)
+            sorted_rows = [row for _, row in present]
+            rows = missing + sorted_rows if nulls_first else sorted_rows + missing
+        return rows
+
+    def render(self, rows, columns=None, extra=None):
+        """JSON array bytes for these rows: pre-serialized rows for select=*, else built from the column blobs."""
+        if columns is None and extra is None:
+            blob, offsets = self.rows_blob, self.row_offsets
+            return b'[' + b','.join(blob[offsets[r]:offsets[r + 1]] for r in rows) + b']'
+
+        columns = columns or list(self.types)
+        objects = []
+        for i, row in enumerate(rows):
+            item = {c: json_value(self.value(c, row), self.types[c]) for c in columns}
+            if extra:
+                item.update({name: values[i] for name, values in extra.items()})
+            objects.append(item)
+        return json.dumps(objects, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+class QuestionIndex:
+    """Every table in the index directory, plus the documents BM25 index."""
+
+    def __init__(self, index_dir=DEFAULT_INDEX_DIR):
+        with open(os.path.join(index_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.tables = {name: Table(index_dir, name, table_meta) for name, table_meta in meta['tables'].items()}
+
+        self.bm25 = None
+        if 'documents' in self.tables:
+            arrays = {name: np.load(os.path.join(index_dir, f"documents.bm25.{name}.npy"), mmap_mode='r')
+                      for name in ('offsets', 'doc_deltas', 'term_freqs', 'doc_lengths')}
+            with open(os.path.join(index_dir, 'bm25_terms.json'), 'r', encoding='utf-8') as f:
+                terms = json.load(f)
+            self.bm25 = BM25Index(terms, arrays['offsets'], arrays['doc_deltas'], arrays['term_freqs'],
+                                  arrays['doc_lengths'], range(self.tables['documents'].size))
+        self.rng = np.random.default_rng()
+
+    def table(self, name):
+        table = self.tables.get(name)
+        if table is None:
+            raise APIError(404, 'PGRST205', f"Could not find the table 'public.{name}' in the schema cache")
+        return table
+
+    def select(self, name, params, max_rows=DEFAULT_MAX_ROWS, count=False):
+        """(Content-Range, rows returned, JSON bytes) for a GET on a table."""
+        table = self.table(name)
+        bits = table.all
+        columns, order, limit, offset = None, None, max_rows, 0
+        filters = []
+
+        for key, value in params:
+            if key == 'select':
+                selected = [c.strip() for c in value.split(',') if c.strip()]
+                columns = None if selected in ([], ['*']) else [table.column(c) for c in selected]
+            elif key == 'order':
+                order = value
+            elif key == 'limit':
+                limit = min(int(value), max_rows)
+            elif key == 'offset':
+                offset = int(value)
+            else:
+                filters.append((key, value))
+
+        # Unordered and uncounted, a lone filter only has to find the page's rows
+        needed = offset + limit if len(filters) == 1 and not order and not count else None
+        for key, value in filters:
+            bits = bits & table.filter(key, value, needed)
+
+        rows = np.flatnonzero(np.unpackbits(bits.view(np.uint8), bitorder='little')[:table.size]).tolist()
+        if order:
+            rows = table.order(rows, order)
+        page = rows[offset:offset + limit]
+
+        total = len(rows) if count else '*'
+        content_range = f"{offset}-{offset + len(page) - 1}/{total}" if page else f"*/{total}"
+        return content_range, len(page), table.render(page, columns)
+
+    def search_documents(self, p_query, p_limit=20):
+        table = self.table('documents')
+        ranked = top_k(self.bm25.score_terms(tokenize(p_query or '')), int(p_limit), self.bm25.doc_ids)
+        rows = [row for row, _ in ranked]
+        return table.render(rows, SEARCH_COLUMNS, {'rank': [round(score, 4) for _, score in ranked]})
+
+    def sample_questions(self, p_count=5, p_question_type=None, p_difficulty=None, p_category=None):
+        """Uniform random questions, NULL arguments meaning any (like COALESCE(column, '') in the RPC)."""
+        table = self.table('interview_questions')
+        bits = table.all
+        for column, value in (('question_type', p_question_type), ('difficulty', p_difficulty),
+                              ('category', p_category)):
+            if value is None:
+                continue
+            if column not in table.types:  # Corpus without the column: every value is NULL
+                bits = bits if value == '' else np.zeros_like(table.all)
+            else:
+                bits = bits & (table.filter(column, 'is.null') if value == '' else table.equals(column, value))
+
+        matching = np.flatnonzero(np.unpackbits(bits.view(np.uint8), bitorder='little')[:table.size])
+        count = min(max(int(p_count), 0), len(matching))
+        return table.render(self.rng.choice(matching, size=count, replace=False).tolist())
+
+RPCS = {'search_documents': 'search_documents', 'sample_questions': 'sample_questions'}
+UNCACHED_RPCS = {'sample_questions'}
+
+# ============================================
+# HTTP server
+# ============================================
+
+class ResponseCache:
+    """LRU of encoded responses."""
+
+    def __init__(self, capacity=DEFAULT_CACHE_SIZE):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        response = self.entries.get(key)
+        if response is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return response
+
+    def put(self, key, response):
+        if self.capacity <= 0:
+            return
+        self.entries[key] = response
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+CORS_HEADERS = [
+    ('Access-Control-Allow-Origin', '*'),
+    ('Access-Control-Allow-Headers', 'apikey, authorization, content-type, prefer, accept, accept-profile, '
+                                     'content-profile, range, x-client-info'),
+    ('Access-Control-Allow-Methods', 'GET, POST, OPTIONS'),
+    ('Access-Control-Expose-Headers', 'Content-Range'),
+]
+
+REASONS = {200: 'OK', 201: 'Created', 204: 'No Content', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 406: 'Not Acceptable', 413: 'Payload Too Large',
+           500: 'Internal Server Error'}
+
+class QuestionAPIServer:
+    """asyncio HTTP/1.1 server for the PostgREST subset, keep-alive, one event loop."""
+
+    def __init__(self, index, cache_size=DEFAULT_CACHE_SIZE, max_rows=DEFAULT_MAX_ROWS):
+        self.index = index
+        self.cache = ResponseCache(cache_size)
+        self.max_rows = max_rows
+        self.requests = 0
+        self.started = time.time()
+
+    def handle(self, method, target, headers, body):
+        """(status, extra headers, body bytes) for one request."""
+        url = urlsplit(target)
+        path = url.path.rstrip('/')
+        params = parse_qsl(url.query, keep_blank_values=True)
+
+        if method == 'OPTIONS':
+            return 204, [], b''
+        if path == '/_stats':
+            return 200, [], json.dumps({
+                'requests': self.requests, 'cache_hits': self.cache.hits, 'cache_misses': self.cache.misses,
+                'cache_entries': len(self.cache.entries), 'uptime_seconds': round(time.time() - self.started, 1),
+            }).encode()
+        if not path.startswith('/rest/v1/'):
+            raise APIError(404, 'PGRST000', f"No route for {path}")
+        name = path[len('/rest/v1/'):]
+
+        if name.startswith('rpc/'):
+            function = RPCS.get(name[4:])
+            if function is None or method != 'POST':
+                raise APIError(404, 'PGRST202', f"Could not find the function public.{name[4:]} in the schema cache")
+            try:
+                arguments = json.loads(body or b'{}')
+                return 200, [], getattr(self.index, function)(**arguments)
+            except (TypeError, ValueError) as e:
+                raise APIError(400, 'PGRST102', f"Invalid arguments for {name[4:]}: {e}")
+
+        if method == 'POST':
+            return 201, [], b''  # Accepted and dropped (user_answers etc.): the stand-in is read-only
+        if method not in ('GET', 'HEAD'):
+            raise APIError(405, 'PGRST000', f"{method} is not supported by the read-only stand-in")
+
+        try:
+            content_range, rows, payload = self.index.select(name, params, self.max_rows,
+                                                             'count=exact' in headers.get('prefer', ''))
+        except ValueError as e:
+            raise APIError(400, 'PGRST100', str(e))
+
+        if 'application/vnd.pgrst.object+json' in headers.get('accept', ''):
+            if rows != 1:
+                raise APIError(406, 'PGRST116', "JSON object requested, multiple (or no) rows returned",
+                               f"The result contains {rows} rows")
+            payload = payload[1:-1]
+        return 200, [('Content-Range', content_range)], payload
+
+    def respond(self, method, target, headers, body):
+        """Cached (status, headers, body) for a request."""
+        self.requests += 1
+        path = urlsplit(target).path.rstrip('/')
+        rpc = path.rsplit('/rpc/', 1)[1] if '/rpc/' in path else None
+        cacheable = path.startswith('/rest/v1/') and (
+            method == 'GET' or (method == 'POST' and rpc is not None and rpc not in UNCACHED_RPCS))
+        key = (method, target, body, headers.get('accept', ''), headers.get('prefer', ''))
+        if cacheable:
+            response = self.cache.get(key)
+            if response is not None:
+                return response
+
+        try:
+            status, extra, payload = self.handle(method, target, headers, body)
+        except APIError as e:
+            status, extra, payload = e.status, [], json.dumps(e.body).encode()
+
+        response = (status, extra, payload)
+        if cacheable and status < 500:
+            self.cache.put(key, response)
+        return response
+
+    async def serve_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    break
+
+                request_line, *header_lines = head.decode('latin-1').split('\r\n')
+                method, target, version = request_line.split(' ', 2)
+                headers = {}
+                for line in header_lines:
+                    if ':' in line:
+                        key, value = line.split(':', 1)
+                        headers[key.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length', 0))
+                if length > MAX_BODY_BYTES:
+                    status, extra, payload = 413, [], b''
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    try:
+                        status, extra, payload = self.respond(method, target, headers, body)
+                    except Exception as e:  # Keep serving; report like PostgREST would
+                        status, extra, payload = 500, [], json.dumps({'message': str(e)}).encode()
+
+                keep_alive = (version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                              and length <= MAX_BODY_BYTES)
+                lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+                         f"Content-Length: {len(payload) if method != 'HEAD' else 0}",
+                         "Content-Type: application/json; charset=utf-8",
+                         f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+                lines += [f"{key}: {value}" for key, value in CORS_HEADERS + extra]
+                writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+                if method != 'HEAD':
+                    writer.write(payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+async def serve(index_dir=DEFAULT_INDEX_DIR, host=DEFAULT_HOST, port=DEFAULT_PORT,
+                cache_size=DEFAULT_CACHE_SIZE, max_rows=DEFAULT_MAX_ROWS):
+    index = QuestionIndex(index_dir)
+    app = QuestionAPIServer(index, cache_size, max_rows)
+    server = await asyncio.start_server(app.serve_connection, host, port, limit=MAX_HEADER_BYTES, backlog=4096)
+
+    for name, table in index.tables.items():
+        print(f"📂 {name}: {table.size} rows")
+    print(f"\n🚀 Serving http://{host}:{port}/rest/v1/ (cache {cache_size} responses, Ctrl+C to stop)")
+    async with server:
+        await server.serve_forever()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local read-only stand-in for the app's Supabase REST API")
+    parser.add_argument("--index", default=DEFAULT_INDEX_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_cmd = commands.add_parser("build", help="Build the index from the corpus CSVs")
+    build_cmd.add_argument("--questions", default=DEFAULT_QUESTIONS_FILE)
+    build_cmd.add_argument("--chunks", default="book_chunks.csv")
+    build_cmd.add_argument("--passages", default="question_passages.csv")
+
+    serve_cmd = commands.add_parser("serve", help="Serve the index over HTTP")
+    serve_cmd.add_argument("--host", default=DEFAULT_HOST)
+    serve_cmd.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve_cmd.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE, help="Responses kept (0 = off)")
+    serve_cmd.add_argument("--max-rows", type=int, default=DEFAULT_MAX_ROWS)
+
+    args = parser.parse_args()
+
+    print("\n" + "="*80)
+    print(f"  🛰️  Question API Stand-in: {args.command}")
+    print("="*80 + "\n")
+
+    if args.command == "build":
+        build_index(args.questions, args.chunks, args.passages, args.index)
+    else:
+        try:
+            asyncio.run(serve(args.index, args.host, args.port, args.cache_size, args.max_rows))
+        except KeyboardInterrupt:
+            print("\n👋 Stopped")
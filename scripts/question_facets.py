@@ -0,0 +1,291 @@
+"""
+Bitmap facet index over the merged question corpus.
+
+Slicing the corpus by company, difficulty, question_type and the
+pipe-separated topics meant scanning every row and splitting strings each
+time. This index stores one bitset per facet value instead: bit i is set
+when question i has that value. The bitsets are rows of one uint64 matrix
+(64 questions per word), so a filter like
+
+    topics:deep_learning AND (difficulty:hard OR difficulty:medium) AND NOT company:google
+
+is a few vectorized &, | and ~ over whole words, and counting the matches
+is a popcount. Facet counts for a slice (how many of its questions have
+each value) are one & of the slice against every bitset plus a popcount
+per row.
+
+Query syntax: facet:value terms, with value lists as OR (company:google,meta)
+and quotes for spaces (company:"capital one"), combined with NOT, AND, OR
+(in that precedence) and parentheses. Adjacent terms are ANDed, and * matches
+every question. Values are matched lowercase. Facets: company, difficulty,
+question_type, topics, category, source (the ones the corpus CSV has).
+
+HOW TO USE:
+1. Install dependencies:
+   pip install numpy
+
+2. Build the index from the merged corpus (merge_all_questions.py):
+   python question_facets.py build --corpus collected_questions/final_interview_questions.csv
+
+3. Slice it:
+   python question_facets.py query "topics:deep_learning AND NOT difficulty:easy" -n 10
+   python question_facets.py query "question_type:sql,coding" --output sql_questions.csv
+   python question_facets.py facets "difficulty:hard"       (value counts within a slice)
+
+4. From Python:
+   from question_facets import FacetIndex
+   index = FacetIndex.load()
+   rows = index.rows(index.select("company:google OR company:meta"))
+"""
+
+import re
+import csv
+import sys
+import time
+import argparse
+
+import numpy as np
+
+DEFAULT_INDEX_FILE = "question_facets.npz"
+DEFAULT_CORPUS = "collected_questions/final_interview_questions.csv"
+
+FACETS = ['company', 'difficulty', 'question_type', 'topics', 'category', 'source']
+MULTI_VALUED = {'topics': '|'}
+
+POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+TOKEN_PATTERN = re.compile(r'\(|\)|[^\s()"]+:"[^"]*"|[^\s()]+')
+
+def load_corpus(corpus_file):
+    csv.field_size_limit(sys.maxsize)
+    with open(corpus_file, 'r', encoding='utf-8', newline='') as f:
+        return list(csv.DictReader(f))
+
+def facet_values(facet, raw):
+    """Normalized values of one field: lowercase, split if multi-valued, empties dropped."""
+    raw = (raw or '').strip().lower()
+    separator = MULTI_VALUED.get(facet)
+    values = [v.strip() for v in raw.split(separator)] if separator else [raw]
+    return [v for v in values if v]
+
+def pack_bits(flags):
+    """Boolean matrix (rows x questions) -> uint64 words (rows x ceil(questions / 64))."""
+    flags = np.atleast_2d(flags)
+    padding = -flags.shape[1] % 64
+    flags = np.pad(flags, ((0, 0), (0, padding)))
+    return np.packbits(flags, axis=1, bitorder='little').view('<u8')
+
+def popcount(bits):
+    """Set bits per row (or in total for a 1-D bitset)."""
+    return POPCOUNT[bits.view(np.uint8)].sum(axis=-1, dtype=np.int64)
+
+class FacetIndex:
+    """One bitset per (facet, value), rows of a uint64 matrix."""
+
+    def __init__(self, facets, values, offsets, bits, size, texts, corpus=None):
+        self.facets = facets      # facet names
+        self.values = values      # every facet's values, sorted, facet after facet
+        self.offsets = offsets    # values of facet i: [offsets[i], offsets[i + 1])
+        self.bits = bits          # (values x words) uint64, bit q of row v = question q has value v
+        self.size = size          # questions
+        self.texts = texts        # question_text per question, for display
+        self.corpus = corpus      # CSV the index was built from
+
+        self.rows_by_term = {}
+        for i, facet in enumerate(facets):
+            for row in range(offsets[i], offsets[i + 1]):
+                self.rows_by_term[(facet, values[row])] = row
+        self.all = pack_bits(np.ones(size, dtype=bool))[0]
+
+    @classmethod
+    def build(cls, questions, corpus=None):
+        """Build from corpus rows (dicts with question_text and any FACETS columns)."""
+        facets = [f for f in FACETS if questions and f in questions[0]]
+        values, offsets, flags = [], [0], []
+
+        for facet in facets:
+            members = {}
+            for q, question in enumerate(questions):
+                for value in facet_values(facet, question.get(facet)):
+                    members.setdefault(value, []).append(q)
+            for value in sorted(members):
+                row = np.zeros(len(questions), dtype=bool)
+                row[members[value]] = True
+                values.append(value)
+                flags.append(row)
+            offsets.append(len(values))
+
+        bits = pack_bits(np.array(flags)) if flags else np.zeros((0, -(-len(questions) // 64)), dtype='<u8')
+        texts = [question.get('question_text', '') for question in questions]
+        return cls(facets, values, np.array(offsets, dtype=np.int64), bits, len(questions), texts, corpus)
+
+    def bitset(self, facet, value):
+        if facet not in self.facets:
+            raise ValueError(f"Unknown facet '{facet}' (facets: {', '.join(self.facets)})")
+        row = self.rows_by_term.get((facet, value.lower()))
+        return self.bits[row] if row is not None else np.zeros_like(self.all)
+
+    def select(self, query):
+        """Bitset of the questions matching a query string."""
+        tokens = TOKEN_PATTERN.findall(query)
+        bits, position = self.parse_or(tokens, 0)
+        if position != len(tokens):
+            raise ValueError(f"Unexpected '{tokens[position]}' in query")
+        return bits
+
+    def parse_or(self, tokens, position):
+        bits, position = self.parse_and(tokens, position)
+        while position < len(tokens) and tokens[position].upper() == 'OR':
+            right, position = self.parse_and(tokens, position + 1)
+            bits = bits | right
+        return bits, position
+
+    def parse_and(self, tokens, position):
+        bits, position = self.parse_not(tokens, position)
+        while position < len(tokens) and tokens[position] != ')' and tokens[position].upper() != 'OR':
+            if tokens[position].upper() == 'AND':
+                position += 1
+            right, position = self.parse_not(tokens, position)
+            bits = bits & right
+        return bits, position
+
+    def parse_not(self, tokens, position):
+        if position >= len(tokens):
+            raise ValueError("Query ends early")
+        token = tokens[position]
+        if token.upper() == 'NOT':
+            bits, position = self.parse_not(tokens, position + 1)
+            return ~bits & self.all, position
+        if token == '(':
+            bits, position = self.parse_or(tokens, position + 1)
+            if position >= len(tokens) or tokens[position] != ')':
+                raise ValueError("Missing ')'")
+            return bits, position + 1
+        if token == '*':
+            return self.all.copy(), position + 1
+        if ':' not in token:
+            raise ValueError(f"Expected facet:value, got '{token}'")
+
+        facet, value = token.split(':', 1)
+        bits = np.zeros_like(self.all)
+        for v in value.strip('"').split(','):
+            bits |= self.bitset(facet.lower(), v.strip())
+        return bits, position + 1
+
+    def count(self, bits):
+        return int(popcount(bits))
+
+    def rows(self, bits):
+        """Question numbers (corpus row order) set in a bitset."""
+        flags = np.unpackbits(bits.view(np.uint8), bitorder='little')[:self.size]
+        return np.flatnonzero(flags)
+
+    def facet_counts(self, bits):
+        """{facet: [(value, questions in the slice), ...]} for the values present, most first."""
+        counts = popcount(self.bits & bits)
+        result = {}
+        for i, facet in enumerate(self.facets):
+            start, end = self.offsets[i], self.offsets[i + 1]
+            present = [(self.values[row], int(counts[row])) for row in range(start, end) if counts[row]]
+            result[facet] = sorted(present, key=lambda pair: -pair[1])
+        return result
+
+    def save(self, path=DEFAULT_INDEX_FILE):
+        np.savez_compressed(path, facets=np.array(self.facets), values=np.array(self.values),
+                            offsets=self.offsets, bits=self.bits, size=self.size,
+                            texts=np.array(self.texts), corpus=np.array(self.corpus or ''))
+
+    @classmethod
+    def load(cls, path=DEFAULT_INDEX_FILE):
+        with np.load(path) as data:
+            return cls(data['facets'].tolist(), data['values'].tolist(), data['offsets'], data['bits'],
+                       int(data['size']), data['texts'].tolist(), str(data['corpus']) or None)
+
+def build_index(corpus_file=DEFAULT_CORPUS, index_file=DEFAULT_INDEX_FILE):
+    print(f"📂 Loading questions from '{corpus_file}'...")
+    questions = load_corpus(corpus_file)
+
+    if not questions:
+        print(f"❌ No questions found in '{corpus_file}'")
+        return
+
+    started = time.perf_counter()
+    index = FacetIndex.build(questions, corpus_file)
+    index.save(index_file)
+    elapsed = time.perf_counter() - started
+
+    print(f"✅ Indexed {index.size} questions in {elapsed:.2f}s -> '{index_file}'")
+    print(f"\n📊 Facets:")
+    for i, facet in enumerate(index.facets):
+        print(f"   - {facet}: {index.offsets[i + 1] - index.offsets[i]} values")
+
+def query_index(query, limit=10, output_file=None, index_file=DEFAULT_INDEX_FILE):
+    index = FacetIndex.load(index_file)
+
+    started = time.perf_counter()
+    bits = index.select(query)
+    rows = index.rows(bits)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    print(f"🔍 '{query}' -> {len(rows)} of {index.size} questions in {elapsed_ms:.2f} ms\n")
+    for row in rows[:limit]:
+        print(f"  {row:6d}. {' '.join(index.texts[row].split())[:100]}")
+
+    if output_file:
+        questions = load_corpus(index.corpus)
+        if len(questions) != index.size:
+            print(f"\n❌ '{index.corpus}' changed since the index was built, rebuild it first")
+            return
+        with open(output_file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(questions[0].keys()))
+            writer.writeheader()
+            writer.writerows(questions[row] for row in rows)
+        print(f"\n💾 Saved {len(rows)} questions to '{output_file}'")
+
+def show_facets(query='*', limit=10, index_file=DEFAULT_INDEX_FILE):
+    index = FacetIndex.load(index_file)
+
+    started = time.perf_counter()
+    bits = index.select(query)
+    counts = index.facet_counts(bits)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    print(f"🔍 '{query}' -> {index.count(bits)} questions, facet counts in {elapsed_ms:.2f} ms")
+    for facet, values in counts.items():
+        if not values:
+            continue
+        print(f"\n   {facet}:")
+        for value, count in values[:limit]:
+            print(f"      {value[:50]:50s} {count:6d}")
+        if len(values) > limit:
+            print(f"      ... {len(values) - limit} more")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bitmap facet index over the question corpus")
+    parser.add_argument("--index", default=DEFAULT_INDEX_FILE)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_cmd = commands.add_parser("build", help="Build the index from the corpus CSV")
+    build_cmd.add_argument("--corpus", default=DEFAULT_CORPUS)
+
+    query_cmd = commands.add_parser("query", help="List the questions matching a facet query")
+    query_cmd.add_argument("query")
+    query_cmd.add_argument("-n", type=int, default=10, help="Questions to print")
+    query_cmd.add_argument("--output", help="Write the matching corpus rows to this CSV")
+
+    facets_cmd = commands.add_parser("facets", help="Value counts per facet within a slice")
+    facets_cmd.add_argument("query", nargs="?", default="*")
+    facets_cmd.add_argument("-n", type=int, default=10, help="Values to print per facet")
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == "build":
+            build_index(args.corpus, args.index)
+        elif args.command == "query":
+            query_index(args.query, args.n, args.output, args.index)
+        elif args.command == "facets":
+            show_facets(args.query, args.n, args.index)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
@@ -0,0 +1,36 @@
+"""
+Stable keys for interview questions.
+
+Rows in interview_questions get random UUIDs from Supabase, so the local
+CSVs have no ID of their own. The scripts that index, upload or sync
+questions all use the key below instead: a hash of the normalized question
+text, which stays the same across merges, re-uploads and machines.
+"""
+
+import csv
+import hashlib
+
+DEFAULT_QUESTIONS_FILE = "collected_questions/final_interview_questions.csv"
+
+def normalize_question(text):
+    """Lowercase and collapse whitespace so trivial edits don't change the key."""
+    # Same result as re.sub(r'\s+', ' ', text.lower().strip()), a few times faster.
+    # question_content_hash() in supabase/setup.sql repeats this in SQL, keep them in step
+    return ' '.join((text or '').lower().split())
+
+def question_hash(question_text):
+    """Content-hash key for a question (32 hex chars)."""
+    return hashlib.sha256(normalize_question(question_text).encode('utf-8')).hexdigest()[:32]
+
+def load_questions(questions_file=DEFAULT_QUESTIONS_FILE):
+    """Load question rows, each with its 'content_hash' key added."""
+    questions = []
+
+    with open(questions_file, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            if not (row.get('question_text') or '').strip():
+                continue
+            row['content_hash'] = question_hash(row['question_text'])
+            questions.append(row)
+
+    return questions
@@ -0,0 +1,249 @@
+"""
+Versioned snapshots of the questions corpus in a content-addressed store.
+
+Copies like interview_questions_data.csv.backup and
+backups/interview_questions_data.csv are mostly the same rows. This store
+keeps each distinct question record once, like git objects:
+- objects/ab/cdef....json: one CSV row as JSON, named by the sha256 of
+  its canonical form. Identical rows in any number of versions share one file.
+- versions/<name>.json: a version's manifest. It holds the source file, the
+  columns and one [content_hash, record_hash] pair per row, in file order.
+
+Saving a new version writes its manifest plus objects only for rows that
+changed. content_hash is the question key from question_keys.py, so a
+question whose answer or tags changed keeps its key but gets a new
+record_hash.
+
+diff is a hash join of two manifests: {content_hash: record_hash} of the
+old version probed with every row of the new one. It never reads the CSVs
+or compares text, and only loads objects to name the fields that changed.
+
+HOW TO USE:
+   python question_snapshots.py snapshot backups/interview_questions_data.csv --name 2025-01-backup
+   python question_snapshots.py snapshot collected_questions/final_interview_questions.csv
+   python question_snapshots.py list
+   python question_snapshots.py diff 2025-01-backup final_interview_questions_20250102_101500
+   python question_snapshots.py export 2025-01-backup restored.csv
+"""
+
+import os
+import csv
+import sys
+import json
+import time
+import hashlib
+import argparse
+from datetime import datetime, timezone
+
+from question_keys import question_hash
+
+DEFAULT_STORE = "backups/snapshots"
+
+# Values past the header's last column (hand-edited CSVs have a few such rows)
+EXTRA_KEY = '_extra'
+
+def canonical_record(row):
+    """Stable JSON for a CSV row: sorted keys, no whitespace."""
+    return json.dumps(row, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+
+class SnapshotStore:
+    """Content-addressed question records plus one manifest per version."""
+
+    def __init__(self, path=DEFAULT_STORE):
+        self.path = path
+        self.objects_dir = os.path.join(path, 'objects')
+        self.versions_dir = os.path.join(path, 'versions')
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.versions_dir, exist_ok=True)
+
+    def object_path(self, record_hash):
+        return os.path.join(self.objects_dir, record_hash[:2], record_hash[2:] + '.json')
+
+    def put_object(self, data):
+        """Store a canonical record unless it's already there. Returns (record_hash, newly written)."""
+        record_hash = hashlib.sha256(data.encode('utf-8')).hexdigest()
+        path = self.object_path(record_hash)
+        if os.path.exists(path):
+            return record_hash, False
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(temp_path, path)  # readers never see half-written objects
+        return record_hash, True
+
+    def get_object(self, record_hash):
+        with open(self.object_path(record_hash), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def version_path(self, name):
+        return os.path.join(self.versions_dir, f"{name}.json")
+
+    def load_manifest(self, name):
+        path = self.version_path(name)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No snapshot named '{name}' in {self.path}")
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def versions(self):
+        return sorted(f[:-len('.json')] for f in os.listdir(self.versions_dir) if f.endswith('.json'))
+
+    def snapshot(self, csv_file, name=None):
+        """Store a questions CSV as a new version. Returns its manifest."""
+        name = name or f"{os.path.splitext(os.path.basename(csv_file))[0]}_{datetime.now():%Y%m%d_%H%M%S}"
+        if os.path.exists(self.version_path(name)):
+            raise FileExistsError(f"Snapshot '{name}' already exists")
+
+        csv.field_size_limit(sys.maxsize)
+        rows = []
+        new_objects = 0
+        file_hash = hashlib.sha256()
+
+        with open(csv_file, 'rb') as f:
+            while block := f.read(1 << 20):
+                file_hash.update(block)
+
+        with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.DictReader(f, restkey=EXTRA_KEY)
+            columns = list(reader.fieldnames or [])
+            for row in reader:
+                record_hash, written = self.put_object(canonical_record(row))
+                new_objects += written
+                rows.append([question_hash(row.get('question_text') or row.get('question')), record_hash])
+
+        manifest = {
+            'name': name,
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'source_file': csv_file,
+            'source_sha256': file_hash.hexdigest(),
+            'columns': columns,
+            'new_objects': new_objects,
+            'rows': rows
+        }
+        with open(self.version_path(name), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, separators=(',', ':'))
+
+        return manifest
+
+    def export(self, name, output_file):
+        """Rebuild a version's CSV, row for row."""
+        manifest = self.load_manifest(name)
+        columns = manifest['columns']
+        with open(output_file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for _, record_hash in manifest['rows']:
+                record = self.get_object(record_hash)
+                values = [record.get(c) for c in columns]
+                while values and values[-1] is None:  # short rows: DictReader filled the gap with None
+                    values.pop()
+                writer.writerow(values + record.get(EXTRA_KEY, []))
+        return len(manifest['rows'])
+
+def diff_manifests(old, new):
+    """Hash join two manifests by content_hash: (added, removed, changed) lists.
+
+    changed holds (content_hash, old record_hash, new record_hash). A question
+    repeated within one version counts once (its first row).
+    """
+    old_records = {}
+    for content_hash, record_hash in old['rows']:
+        old_records.setdefault(content_hash, record_hash)
+
+    added, changed = [], []
+    seen = set()
+    for content_hash, record_hash in new['rows']:
+        if content_hash in seen:
+            continue
+        seen.add(content_hash)
+
+        old_hash = old_records.get(content_hash)
+        if old_hash is None:
+            added.append(content_hash)
+        elif old_hash != record_hash:
+            changed.append((content_hash, old_hash, record_hash))
+
+    removed = [content_hash for content_hash in old_records if content_hash not in seen]
+    return added, removed, changed
+
+def preview(text, width=90):
+    text = ' '.join((text or '').split())
+    return text if len(text) <= width else text[:width - 3] + '...'
+
+def print_diff(store, old_name, new_name, show=10):
+    started = time.perf_counter()
+    old, new = store.load_manifest(old_name), store.load_manifest(new_name)
+    added, removed, changed = diff_manifests(old, new)
+    elapsed = time.perf_counter() - started
+
+    print(f"🔀 {old_name} ({len(old['rows'])} rows) -> {new_name} ({len(new['rows'])} rows) "
+          f"in {elapsed * 1000:.1f} ms\n")
+    print(f"   + {len(added)} added")
+    print(f"   - {len(removed)} removed")
+    print(f"   ~ {len(changed)} changed")
+
+    if show <= 0:
+        return
+
+    new_by_key = {content_hash: record_hash for content_hash, record_hash in reversed(new['rows'])}
+    old_by_key = {content_hash: record_hash for content_hash, record_hash in reversed(old['rows'])}
+
+    for label, keys, records in (('Added', added, new_by_key), ('Removed', removed, old_by_key)):
+        if keys:
+            print(f"\n{label}:")
+            for content_hash in keys[:show]:
+                record = store.get_object(records[content_hash])
+                print(f"   {content_hash[:8]}  {preview(record.get('question_text') or record.get('question'))}")
+
+    if changed:
+        print(f"\nChanged:")
+        for content_hash, old_hash, new_hash in changed[:show]:
+            before, after = store.get_object(old_hash), store.get_object(new_hash)
+            fields = sorted(k for k in set(before) | set(after) if before.get(k) != after.get(k))
+            question = after.get('question_text') or after.get('question')
+            print(f"   {content_hash[:8]}  {preview(question, 60)}  [{', '.join(fields)}]")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Content-addressed, versioned snapshots of question CSVs")
+    parser.add_argument("--store", default=DEFAULT_STORE)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    snapshot_cmd = commands.add_parser("snapshot", help="Store a questions CSV as a new version")
+    snapshot_cmd.add_argument("csv_file")
+    snapshot_cmd.add_argument("--name", help="Version name (default <file>_<timestamp>)")
+
+    commands.add_parser("list", help="List stored versions")
+
+    diff_cmd = commands.add_parser("diff", help="Added, removed and changed questions between two versions")
+    diff_cmd.add_argument("old")
+    diff_cmd.add_argument("new")
+    diff_cmd.add_argument("--show", type=int, default=10, help="Questions to print per group (0 = counts only)")
+
+    export_cmd = commands.add_parser("export", help="Write a version back out as CSV")
+    export_cmd.add_argument("name")
+    export_cmd.add_argument("output")
+
+    args = parser.parse_args()
+    store = SnapshotStore(args.store)
+
+    try:
+        if args.command == "snapshot":
+            started = time.perf_counter()
+            manifest = store.snapshot(args.csv_file, args.name)
+            print(f"📸 Saved '{manifest['name']}': {len(manifest['rows'])} rows, "
+                  f"{manifest['new_objects']} new objects ({time.perf_counter() - started:.2f}s)")
+        elif args.command == "list":
+            for name in store.versions():
+                manifest = store.load_manifest(name)
+                print(f"   {name:45s} {len(manifest['rows']):7d} rows  {manifest['new_objects']:7d} new  "
+                      f"{manifest['created_at'][:19]}  {manifest['source_file']}")
+        elif args.command == "diff":
+            print_diff(store, args.old, args.new, args.show)
+        elif args.command == "export":
+            count = store.export(args.name, args.output)
+            print(f"✅ Wrote {count} rows to '{args.output}'")
+    except (FileNotFoundError, FileExistsError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
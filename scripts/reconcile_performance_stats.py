@@ -0,0 +1,135 @@
+"""
+Check (and repair) user_performance_summary against a full recount.
+
+The summary table behind user_performance_stats is maintained by triggers
+on user_answers (supabase/setup.sql). Triggers can't drift by themselves,
+but manual edits, restores with triggers disabled or a partial migration
+can leave it wrong. This job recounts every user's answers in one
+GROUP BY (the user_performance_recount view, which adds the totals of
+archived user_answers partitions) and full-outer-joins that with the
+summary. Everything happens in SQL, so only counts and a few
+sample user_ids come back to Python.
+
+With --repair, the recount and the fix run in one transaction that holds
+a SHARE lock on user_answers. Answers can't change between recount and
+write, and the app can still read while it runs. Fixed rows are upserted,
+and summaries of users with no answers left are deleted.
+
+HOW TO USE:
+1. Install dependencies:
+   pip install "psycopg[binary]"
+
+2. Run it (direct database connection string):
+   python reconcile_performance_stats.py --dsn postgresql://postgres@localhost/postgres
+   python reconcile_performance_stats.py --dsn ... --repair
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import psycopg
+
+DEFAULT_DSN = os.environ.get("DATABASE_URL", "postgresql://postgres@localhost/postgres")
+
+SUMMARY_COLUMNS = ['total_answered', 'total_correct', 'timed_answers', 'total_time_seconds',
+                   'easy_answered', 'easy_correct', 'medium_answered', 'medium_correct',
+                   'hard_answered', 'hard_correct', 'last_practice_date']
+
+# expected = recount, actual = summary; one row per user that is missing, stale or extra
+MISMATCHES_SQL = f"""
+    SELECT
+        COALESCE(e.user_id, a.user_id) as user_id,
+        CASE WHEN a.user_id IS NULL THEN 'missing' WHEN e.user_id IS NULL THEN 'extra' ELSE 'stale' END as problem
+    FROM recount e
+    FULL OUTER JOIN user_performance_summary a ON a.user_id = e.user_id
+    WHERE a.user_id IS NULL
+       OR e.user_id IS NULL
+       OR ({', '.join('e.' + c for c in SUMMARY_COLUMNS)}) IS DISTINCT FROM ({', '.join('a.' + c for c in SUMMARY_COLUMNS)})
+"""
+
+def find_mismatches(cur):
+    """Count missing / stale / extra summaries and keep a few sample user_ids per problem."""
+    cur.execute(f"""
+        SELECT problem, COUNT(*), (array_agg(user_id ORDER BY user_id))[1:5]
+        FROM ({MISMATCHES_SQL}) m
+        GROUP BY problem
+    """)
+    return {problem: (count, samples) for problem, count, samples in cur.fetchall()}
+
+def repair(cur):
+    """Rewrite wrong summaries from the recount. Returns (rows upserted, rows deleted)."""
+    columns = ', '.join(SUMMARY_COLUMNS)
+    updates = ', '.join(f"{c} = EXCLUDED.{c}" for c in SUMMARY_COLUMNS)
+
+    cur.execute(f"""
+        INSERT INTO user_performance_summary (user_id, {columns})
+        SELECT e.user_id, {', '.join('e.' + c for c in SUMMARY_COLUMNS)}
+        FROM ({MISMATCHES_SQL}) m
+        JOIN recount e ON e.user_id = m.user_id
+        ORDER BY e.user_id
+        ON CONFLICT (user_id) DO UPDATE SET {updates}, updated_at = NOW()
+    """)
+    upserted = cur.rowcount
+
+    cur.execute("""
+        DELETE FROM user_performance_summary a
+        WHERE NOT EXISTS (SELECT 1 FROM recount e WHERE e.user_id = a.user_id)
+    """)
+    return upserted, cur.rowcount
+
+def reconcile(dsn=DEFAULT_DSN, fix=False):
+    """Returns True if the summaries were (or now are) correct."""
+    started = time.perf_counter()
+
+    with psycopg.connect(dsn) as conn:
+        with conn.cursor() as cur:
+            if fix:
+                cur.execute("LOCK TABLE user_answers IN SHARE MODE")
+
+            cur.execute("CREATE TEMP TABLE recount ON COMMIT DROP AS SELECT * FROM user_performance_recount")
+            cur.execute("CREATE UNIQUE INDEX ON recount (user_id)")
+            cur.execute("ANALYZE recount")
+            cur.execute("SELECT COUNT(*), COALESCE(SUM(total_answered), 0) FROM recount")
+            users, answers = cur.fetchone()
+            counted = time.perf_counter()
+            print(f"🧮 Recounted {answers} answers for {users} users in {counted - started:.2f}s")
+
+            mismatches = find_mismatches(cur)
+            if not mismatches:
+                print("✅ All summaries match")
+                return True
+
+            for problem, (count, samples) in sorted(mismatches.items()):
+                print(f"   ⚠️  {count} {problem} (e.g. {', '.join(str(s) for s in samples)})")
+
+            if not fix:
+                print("\n   Run with --repair to fix them")
+                return False
+
+            upserted, deleted = repair(cur)
+            print(f"\n🔧 Repaired {upserted} summaries, deleted {deleted} in "
+                  f"{time.perf_counter() - counted:.2f}s")
+
+            if find_mismatches(cur):
+                print("❌ Summaries still don't match after repair")
+                return False
+
+    print("✅ All summaries match")
+    return True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify / repair user_performance_summary against user_answers")
+    parser.add_argument("--dsn", default=DEFAULT_DSN)
+    parser.add_argument("--repair", action="store_true", help="Rewrite wrong summaries")
+    args = parser.parse_args()
+
+    print("\n" + "="*80)
+    print("  📊 Performance Stats Reconciliation")
+    print("="*80 + "\n")
+
+    ok = reconcile(args.dsn, args.repair)
+
+    print("\n" + "="*80 + "\n")
+    sys.exit(0 if ok else 1)
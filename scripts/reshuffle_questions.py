@@ -0,0 +1,102 @@
+"""
+Backfill and reshuffle the random sample ranks of interview_questions.
+
+sample_questions() (supabase/setup.sql) draws uniformly random questions by
+looking up random sample_rank values, which are dense random positions
+within each (category, question_type, difficulty) bucket. Triggers rank new
+questions as they arrive. This job:
+- backfills ranks for questions stored before the column existed
+- closes the gaps deleted questions leave behind (draws that land in a gap
+  are redrawn, so gaps only cost extra index probes)
+- deals a fresh random permutation, so no question keeps its position
+
+One UPDATE ranks every question with row_number() over a random order per
+bucket, and question_sample_buckets is rebuilt from the same counts. It
+runs in one transaction holding a SHARE ROW EXCLUSIVE lock: the app can
+keep reading and sampling, uploads wait until it commits.
+
+HOW TO USE:
+1. Install dependencies:
+   pip install "psycopg[binary]"
+
+2. Run it (direct database connection string), e.g. nightly:
+   python reshuffle_questions.py --dsn postgresql://postgres@localhost/postgres
+   python reshuffle_questions.py --dsn ... --dry-run      (only report unranked questions and gaps)
+"""
+
+import os
+import time
+import argparse
+
+import psycopg
+
+DEFAULT_DSN = os.environ.get("DATABASE_URL", "postgresql://postgres@localhost/postgres")
+
+BUCKET = "COALESCE(category, ''), COALESCE(question_type, ''), COALESCE(difficulty, '')"
+
+RESHUFFLE_SQL = f"""
+    UPDATE interview_questions q
+    SET sample_rank = r.rank
+    FROM (
+        SELECT id, (row_number() OVER (PARTITION BY {BUCKET} ORDER BY random()) - 1)::INT as rank
+        FROM interview_questions
+    ) r
+    WHERE q.id = r.id
+"""
+
+REBUILD_BUCKETS_SQL = f"""
+    INSERT INTO question_sample_buckets (category, question_type, difficulty, size)
+    SELECT {BUCKET}, COUNT(*)
+    FROM interview_questions
+    GROUP BY 1, 2, 3
+"""
+
+def rank_health(cur):
+    """(questions, unranked questions, gaps, buckets)."""
+    cur.execute("""
+        SELECT
+            (SELECT COUNT(*) FROM interview_questions),
+            (SELECT COUNT(*) FROM interview_questions WHERE sample_rank IS NULL),
+            (SELECT COALESCE(SUM(size), 0) FROM question_sample_buckets)
+                - (SELECT COUNT(sample_rank) FROM interview_questions),
+            (SELECT COUNT(*) FROM question_sample_buckets)
+    """)
+    return cur.fetchone()
+
+def reshuffle(dsn=DEFAULT_DSN, dry_run=False):
+    started = time.perf_counter()
+
+    with psycopg.connect(dsn) as conn:
+        with conn.cursor() as cur:
+            cur.execute("LOCK TABLE interview_questions IN SHARE ROW EXCLUSIVE MODE")
+
+            questions, unranked, gaps, buckets = rank_health(cur)
+            print(f"📚 {questions} questions in {buckets} buckets: {unranked} unranked, {gaps} gaps")
+
+            if dry_run:
+                conn.rollback()
+                print("\n✅ Nothing written (dry run)")
+                return
+
+            cur.execute(RESHUFFLE_SQL)
+            ranked = cur.rowcount
+            cur.execute("DELETE FROM question_sample_buckets")
+            cur.execute(REBUILD_BUCKETS_SQL)
+            buckets = cur.rowcount
+            cur.execute("ANALYZE interview_questions")
+
+        print(f"\n✅ Reshuffled {ranked} questions into {buckets} buckets in {time.perf_counter() - started:.2f}s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill / reshuffle interview_questions.sample_rank")
+    parser.add_argument("--dsn", default=DEFAULT_DSN)
+    parser.add_argument("--dry-run", action="store_true", help="Report unranked questions and gaps only")
+    args = parser.parse_args()
+
+    print("\n" + "="*80)
+    print("  🔀 Question Sample Reshuffle")
+    print("="*80 + "\n")
+
+    reshuffle(args.dsn, args.dry_run)
+
+    print("\n" + "="*80 + "\n")
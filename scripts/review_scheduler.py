@@ -0,0 +1,291 @@
+"""
+Spaced-repetition review queues (SM-2) built from user_answers.
+
+Nothing resurfaces a question a user got wrong. This batch job keeps an
+SM-2 schedule for every (user, question) pair the user has answered, and
+writes each user's review queue for the day.
+
+State lives in one .npz file of flat arrays, one entry per card (a user +
+question pair), sorted by card key (user number << 32 | question number):
+ease factor, interval (days), repetitions, lapses and due day. It also
+records the high-water mark (latest created_at ingested) and the ids of the
+answers ingested within the safety window before it.
+
+A run:
+1. streams the answers created after (high-water mark - safety window)
+   through a server-side cursor, in created_at order, one batch at a time,
+   skipping the ids already ingested
+2. applies SM-2 to each batch with array operations. Answers that repeat a
+   card within a batch are applied in rounds (first answer per card,
+   then the second, ...), so updates stay in order
+3. saves the state, then builds a heap of users keyed by their earliest
+   due card. It pops every user due by today and writes their due cards,
+   most overdue (then lowest ease) first, as one JSON line per user
+
+Quality (SM-2's 0-5 grade) comes from the answer: 4 if correct, 3 if
+correct with hints, 1 if wrong (the card starts over at a 1-day interval).
+
+created_at defaults to the start of the inserting transaction, so an
+answer can commit after answers with a later created_at. The safety window
+(--window-minutes, default 5) re-reads that stretch to catch them; such an
+answer is applied after the later ones of its card. Answers committed more
+than the window late, or backdated, aren't picked up: run with --rebuild
+periodically (e.g. weekly) to replay all answers (archived partitions are
+gone, so run this before archiving if their history matters).
+
+HOW TO USE:
+1. Install dependencies:
+   pip install numpy "psycopg[binary]"
+
+2. Run it daily (direct database connection string):
+   python review_scheduler.py --dsn postgresql://postgres@localhost/postgres
+   python review_scheduler.py --dsn ... --output review_queues.jsonl --limit 20
+   python review_scheduler.py --dsn ... --rebuild        (ignore the saved state)
+   python review_scheduler.py --dsn ... --window-minutes 30
+"""
+
+import os
+import json
+import time
+import heapq
+import argparse
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+import psycopg
+
+DEFAULT_DSN = os.environ.get("DATABASE_URL", "postgresql://postgres@localhost/postgres")
+DEFAULT_STATE_FILE = "review_schedule.npz"
+DEFAULT_OUTPUT_FILE = "review_queues.jsonl"
+DEFAULT_BATCH_SIZE = 200000
+DEFAULT_QUEUE_LIMIT = 20
+DEFAULT_WINDOW_MINUTES = 5
+
+EPOCH = date(1970, 1, 1)
+
+# SM-2 defaults
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+PASSING_QUALITY = 3
+
+ANSWERS_SQL = """
+    SELECT
+        user_id::TEXT, question_id::TEXT, is_correct, COALESCE(hints_used, 0) > 0,
+        (created_at AT TIME ZONE 'UTC')::DATE - DATE '1970-01-01',  -- UTC day number
+        created_at, id::TEXT
+    FROM user_answers
+    WHERE user_id IS NOT NULL AND question_id IS NOT NULL
+      AND created_at > %s
+    ORDER BY created_at, id
+"""
+
+def day_number(value):
+    return (value - EPOCH).days
+
+class ReviewSchedule:
+    """SM-2 cards in flat arrays sorted by card key."""
+
+    def __init__(self):
+        self.user_ids = []
+        self.question_ids = []
+        self.user_index = {}
+        self.question_index = {}
+        self.keys = np.zeros(0, dtype=np.int64)
+        self.ease = np.zeros(0, dtype=np.float32)
+        self.interval = np.zeros(0, dtype=np.int32)
+        self.repetitions = np.zeros(0, dtype=np.int16)
+        self.lapses = np.zeros(0, dtype=np.int16)
+        self.due = np.zeros(0, dtype=np.int32)
+        self.high_water = datetime(1970, 1, 1, tzinfo=timezone.utc)
+        self.applied = {}  # answer id -> created_at, for answers within the window before high_water
+
+    @classmethod
+    def load(cls, path):
+        schedule = cls()
+        with np.load(path, allow_pickle=False) as data:
+            schedule.user_ids = data['user_ids'].tolist()
+            schedule.question_ids = data['question_ids'].tolist()
+            for name in ('keys', 'ease', 'interval', 'repetitions', 'lapses', 'due'):
+                setattr(schedule, name, data[name])
+            schedule.high_water = datetime.fromisoformat(str(data['high_water_at']))
+            if 'applied_ids' in data.files:
+                schedule.applied = {i: datetime.fromisoformat(at) for i, at in
+                                    zip(data['applied_ids'].tolist(), data['applied_at'].tolist())}
+            else:
+                schedule.applied = None  # saved before the window existed: resume right after high_water
+        schedule.user_index = {u: i for i, u in enumerate(schedule.user_ids)}
+        schedule.question_index = {q: i for i, q in enumerate(schedule.question_ids)}
+        return schedule
+
+    def save(self, path):
+        temp_path = f"{path}.tmp.npz"
+        np.savez(temp_path,
+                 user_ids=np.array(self.user_ids, dtype='U36'),
+                 question_ids=np.array(self.question_ids, dtype='U36'),
+                 keys=self.keys, ease=self.ease, interval=self.interval,
+                 repetitions=self.repetitions, lapses=self.lapses, due=self.due,
+                 high_water_at=self.high_water.isoformat(),
+                 applied_ids=np.array(list(self.applied), dtype='U36'),
+                 applied_at=np.array([at.isoformat() for at in self.applied.values()], dtype='U40'))
+        os.replace(temp_path, path)  # an interrupted run keeps the previous state
+
+    def number(self, values, index, names):
+        """Map ids to dense numbers, adding new ones."""
+        numbers = np.empty(len(values), dtype=np.int64)
+        for i, value in enumerate(values):
+            n = index.get(value)
+            if n is None:
+                n = index[value] = len(names)
+                names.append(value)
+            numbers[i] = n
+        return numbers
+
+    def card_positions(self, keys):
+        """Positions of these card keys, inserting new cards with SM-2 defaults."""
+        at = np.minimum(np.searchsorted(self.keys, keys), max(len(self.keys) - 1, 0))
+        known = self.keys[at] == keys if len(self.keys) else np.zeros(len(keys), dtype=bool)
+        new_keys = np.unique(keys[~known])
+        if len(new_keys):
+            at = np.searchsorted(self.keys, new_keys)
+            self.keys = np.insert(self.keys, at, new_keys)
+            self.ease = np.insert(self.ease, at, INITIAL_EASE)
+            self.interval = np.insert(self.interval, at, 0)
+            self.repetitions = np.insert(self.repetitions, at, 0)
+            self.lapses = np.insert(self.lapses, at, 0)
+            self.due = np.insert(self.due, at, 0)
+        return np.searchsorted(self.keys, keys)
+
+    def review(self, cards, quality, days):
+        """SM-2 for distinct cards, one answer each."""
+        passed = quality >= PASSING_QUALITY
+        repetitions = np.where(passed, self.repetitions[cards] + 1, 0).astype(np.int16)
+        interval = np.where(~passed, 1,
+                   np.where(repetitions == 1, 1,
+                   np.where(repetitions == 2, 6,
+                            np.rint(self.interval[cards] * self.ease[cards])))).astype(np.int32)
+        miss = 5 - quality
+        ease = np.maximum(MIN_EASE, self.ease[cards] + (0.1 - miss * (0.08 + miss * 0.02)))
+
+        self.repetitions[cards] = repetitions
+        self.interval[cards] = interval
+        self.ease[cards] = ease
+        self.lapses[cards] += (~passed).astype(np.int16)
+        self.due[cards] = days + interval
+
+    def ingest(self, user_ids, question_ids, correct, hinted, days):
+        """Apply a batch of answers, in order."""
+        users = self.number(user_ids, self.user_index, self.user_ids)
+        questions = self.number(question_ids, self.question_index, self.question_ids)
+        cards = self.card_positions((users << 32) | questions)
+        quality = np.where(correct, np.where(hinted, 3, 4), 1)
+
+        # Round r applies every card's r-th answer in this batch
+        order = np.argsort(cards, kind='stable')
+        sorted_cards = cards[order]
+        first = np.r_[True, sorted_cards[1:] != sorted_cards[:-1]]
+        starts = np.maximum.accumulate(np.where(first, np.arange(len(order)), 0))
+        rounds = np.empty(len(order), dtype=np.int64)
+        rounds[order] = np.arange(len(order)) - starts
+
+        for r in range(int(rounds.max()) + 1 if len(rounds) else 0):
+            selected = rounds == r
+            self.review(cards[selected], quality[selected], days[selected])
+
+    def due_queues(self, today, limit=DEFAULT_QUEUE_LIMIT):
+        """Yield (user_id, [question_id, ...]) for every user with cards due by today."""
+        users = (self.keys >> 32).astype(np.int64)
+        if not len(users):
+            return
+        starts = np.flatnonzero(np.r_[True, users[1:] != users[:-1]])
+        ends = np.r_[starts[1:], len(users)]
+        next_due = np.minimum.reduceat(self.due, starts)
+
+        heap = list(zip(next_due.tolist(), range(len(starts))))
+        heapq.heapify(heap)
+
+        while heap and heap[0][0] <= today:
+            _, u = heapq.heappop(heap)
+            span = slice(starts[u], ends[u])
+            due = self.due[span]
+            ready = np.flatnonzero(due <= today)
+            ready = ready[np.lexsort((self.ease[span][ready], due[ready]))][:limit]
+            questions = (self.keys[span][ready] & 0xFFFFFFFF).tolist()
+            yield self.user_ids[users[starts[u]]], [self.question_ids[q] for q in questions]
+
+def ingest_answers(schedule, dsn, batch_size=DEFAULT_BATCH_SIZE, window=timedelta(minutes=DEFAULT_WINDOW_MINUTES)):
+    """Stream new answers (re-reading the safety window) into the schedule. Returns the number ingested."""
+    if schedule.applied is None:
+        since, schedule.applied = schedule.high_water, {}
+    else:
+        since = schedule.high_water - window
+
+    total = 0
+    with psycopg.connect(dsn) as conn:
+        with conn.cursor(name='review_scheduler_answers') as cur:
+            cur.itersize = batch_size
+            cur.execute(ANSWERS_SQL, (since,))
+
+            while rows := cur.fetchmany(batch_size):
+                rows = [row for row in rows if row[6] not in schedule.applied]
+                if not rows:
+                    continue
+                user_ids, question_ids, correct, hinted, days = list(zip(*rows))[:5]
+                schedule.ingest(user_ids, question_ids, np.array(correct, dtype=bool),
+                                np.array(hinted, dtype=bool), np.array(days, dtype=np.int32))
+                schedule.applied.update((row[6], row[5]) for row in rows)
+                schedule.high_water = max(schedule.high_water, rows[-1][5])
+                total += len(rows)
+                print(f"   ... {total} answers, {len(schedule.keys)} cards")
+
+    # Only ids inside the next run's window can come back
+    schedule.applied = {i: at for i, at in schedule.applied.items() if at > schedule.high_water - window}
+    return total
+
+def run(dsn=DEFAULT_DSN, state_file=DEFAULT_STATE_FILE, output_file=DEFAULT_OUTPUT_FILE,
+        today=None, limit=DEFAULT_QUEUE_LIMIT, batch_size=DEFAULT_BATCH_SIZE, rebuild=False,
+        window_minutes=DEFAULT_WINDOW_MINUTES):
+    today = today or datetime.now(timezone.utc).date()
+    started = time.perf_counter()
+
+    if os.path.exists(state_file) and not rebuild:
+        schedule = ReviewSchedule.load(state_file)
+        print(f"📂 Loaded {len(schedule.keys)} cards, answers up to {schedule.high_water:%Y-%m-%d %H:%M:%S}")
+    else:
+        schedule = ReviewSchedule()
+        print("🆕 Starting a new schedule")
+
+    ingested = ingest_answers(schedule, dsn, batch_size, timedelta(minutes=window_minutes))
+    schedule.save(state_file)
+    ingest_done = time.perf_counter()
+    print(f"\n📥 Ingested {ingested} answers in {ingest_done - started:.2f}s, saved '{state_file}'")
+
+    users = cards = 0
+    with open(output_file, 'w', encoding='utf-8') as f:
+        for user_id, questions in schedule.due_queues(day_number(today), limit):
+            f.write(json.dumps({'user_id': user_id, 'date': today.isoformat(), 'question_ids': questions}) + '\n')
+            users += 1
+            cards += len(questions)
+
+    print(f"🗓️  {users} users have {cards} reviews due on {today} "
+          f"({time.perf_counter() - ingest_done:.2f}s) -> '{output_file}'")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SM-2 review queues from user_answers")
+    parser.add_argument("--dsn", default=DEFAULT_DSN)
+    parser.add_argument("--state", default=DEFAULT_STATE_FILE)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_FILE, help="One JSON line per user with reviews due")
+    parser.add_argument("--today", type=date.fromisoformat, help="Build queues for this date (default: today, UTC)")
+    parser.add_argument("--limit", type=int, default=DEFAULT_QUEUE_LIMIT, help="Reviews per user")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--rebuild", action="store_true", help="Replay all answers instead of loading the state")
+    parser.add_argument("--window-minutes", type=float, default=DEFAULT_WINDOW_MINUTES,
+                        help="Re-read answers this far before the high-water mark, for late commits")
+    args = parser.parse_args()
+
+    print("\n" + "="*80)
+    print("  🔁 Spaced Repetition Scheduler")
+    print("="*80 + "\n")
+
+    run(args.dsn, args.state, args.output, args.today, args.limit, args.batch_size, args.rebuild, args.window_minutes)
+
+    print("\n" + "="*80 + "\n")
@@ -0,0 +1,171 @@
+"""
+Delta sync: make interview_questions match the local questions CSVs.
+
+Re-uploading the whole corpus after every merge sends every row again.
+This script only sends what changed:
+1. Pulls (content_hash, fields_hash) pairs from the table with keyset
+   pagination (WHERE content_hash > last ORDER BY content_hash LIMIT n),
+   so every page is an index range scan however deep it is
+2. Hash-joins them against the local rows, whose fields_hash is computed
+   the same way as the generated column in supabase/setup.sql
+3. Upserts new and changed rows, and with --delete deletes rows that are
+   no longer local
+
+Local files are the source of truth: rows are sent with every question
+column, so a column a CSV doesn't have is cleared remotely. Rows without a
+content_hash (uploaded before the column existed) would look missing and be
+inserted again, so the sync refuses to run until supabase/setup.sql has
+backfilled them.
+
+⚠️  Deleting a question also deletes its user_answers (ON DELETE CASCADE),
+   so deletes only happen with --delete. Check the plan with --dry-run first.
+
+HOW TO USE:
+1. Run supabase/setup.sql (adds content_hash and fields_hash)
+
+2. Sync (same backends as upload_questions.py):
+   python sync_questions.py --dry-run
+   python sync_questions.py --dry-run --delete
+   python sync_questions.py collected_questions/final_interview_questions.csv collected_questions/source_files/coding_questions.csv
+   python sync_questions.py --dsn postgresql://postgres@localhost/postgres
+"""
+
+import os
+import sys
+import time
+import argparse
+
+from question_keys import DEFAULT_QUESTIONS_FILE
+from upload_questions import (QUESTION_COLUMNS, DEFAULT_BATCH_SIZE, DEFAULT_CONCURRENCY, DEFAULT_RETRIES,
+                              fields_hash, open_backend, read_question_rows, run_batches)
+
+# Supabase returns at most 1000 rows per request by default (API max rows)
+DEFAULT_PAGE_SIZE = 1000
+
+# Deletes go in the URL as content_hash=in.(...), so keep them short
+DELETE_BATCH_SIZE = 100
+
+def load_local_rows(csv_files):
+    """{content_hash: row} over all files, first file wins on duplicates. Every row has every column."""
+    rows = {}
+
+    for csv_file in csv_files:
+        file_rows, _, _ = read_question_rows(csv_file)
+        added = 0
+        for row in file_rows:
+            if row['content_hash'] in rows:
+                continue
+            for column in QUESTION_COLUMNS:
+                row.setdefault(column, None)
+            rows[row['content_hash']] = row
+            added += 1
+        print(f"   - {csv_file}: {added} questions")
+
+    return rows
+
+def fetch_remote_keys(backend, page_size=DEFAULT_PAGE_SIZE):
+    """{content_hash: fields_hash} for every keyed remote row, one keyset page at a time."""
+    remote = {}
+    after = None
+
+    while True:
+        page = backend.fetch_keys(after, page_size)
+        remote.update(page)
+        if len(page) < page_size:
+            return remote
+        after = page[-1][0]
+
+def diff_rows(local, remote):
+    """Hash join local rows against remote key pairs: (inserts, updates, deletes)."""
+    inserts, updates = [], []
+
+    for key, row in local.items():
+        remote_hash = remote.get(key)
+        if remote_hash is None:
+            inserts.append(row)
+        elif remote_hash != fields_hash(row):
+            updates.append(row)
+
+    deletes = [key for key in remote if key not in local]
+    return inserts, updates, deletes
+
+def sync_questions(csv_files, backend, delete=False, dry_run=False, page_size=DEFAULT_PAGE_SIZE,
+                   batch_size=DEFAULT_BATCH_SIZE, concurrency=DEFAULT_CONCURRENCY, retries=DEFAULT_RETRIES):
+    """Bring interview_questions in line with csv_files. Returns the number of rows that failed."""
+    started = time.perf_counter()
+
+    print(f"📂 Reading local questions...")
+    local = load_local_rows(csv_files)
+
+    unkeyed = backend.count_unkeyed()
+    if unkeyed:
+        print(f"\n❌ {unkeyed} remote questions have no content_hash yet. They would all be inserted")
+        print("   again: run supabase/setup.sql (it backfills the hashes) and sync again")
+        return unkeyed
+
+    print(f"\n📥 Pulling remote keys ({page_size} per page)...")
+    remote = fetch_remote_keys(backend, page_size)
+    pulled = time.perf_counter()
+    print(f"✅ {len(local)} local vs {len(remote)} remote questions "
+          f"(read + pull {pulled - started:.2f}s)")
+
+    inserts, updates, deletes = diff_rows(local, remote)
+    missing = len(deletes)
+    if not delete:
+        deletes = []
+
+    print(f"\n📊 Plan: {len(inserts)} inserts, {len(updates)} updates, {len(deletes)} deletes")
+    if not delete and missing:
+        print(f"   ({missing} remote questions are missing locally, pass --delete to delete them)")
+    if dry_run or not (inserts or updates or deletes):
+        print(f"\n✅ Nothing sent ({'dry run' if dry_run else 'already in sync'}) "
+              f"in {time.perf_counter() - started:.2f}s")
+        return 0
+
+    columns = QUESTION_COLUMNS + ['content_hash']
+    upserted, upsert_failed, _ = run_batches(lambda batch: backend.upsert(batch, columns), inserts + updates,
+                                             batch_size, concurrency, retries)
+    deleted, delete_failed, _ = run_batches(backend.delete, deletes, DELETE_BATCH_SIZE, concurrency, retries)
+
+    print(f"\n✅ Upserted {upserted} and deleted {deleted} rows in {time.perf_counter() - started:.2f}s")
+    failed = upsert_failed + delete_failed
+    if failed:
+        print(f"   ❌ {failed} rows failed, re-run to try them again")
+
+    return failed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Send only inserts, updates and deletes to interview_questions")
+    parser.add_argument("csv_files", nargs="*", default=[DEFAULT_QUESTIONS_FILE])
+    parser.add_argument("--dsn", help="Sync straight into this Postgres database instead of Supabase")
+    parser.add_argument("--dry-run", action="store_true", help="Print the plan without sending anything")
+    parser.add_argument("--delete", action="store_true",
+                        help="Delete remote rows missing from the CSVs (cascades to their user_answers)")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES)
+    args = parser.parse_args()
+
+    for csv_file in args.csv_files:
+        if not os.path.exists(csv_file):
+            print(f"❌ Error: {csv_file} not found!")
+            sys.exit(1)
+
+    backend = open_backend(args.dsn)
+    if backend is None:
+        print("❌ Set SUPABASE_URL and SUPABASE_KEY (service_role key), or use --dsn")
+        sys.exit(1)
+
+    print("\n" + "="*80)
+    print("  🔄 Question Delta Sync")
+    print("="*80 + "\n")
+
+    try:
+        failed = sync_questions(args.csv_files, backend, args.delete, args.dry_run, args.page_size,
+                                args.batch_size, args.concurrency, args.retries)
+    finally:
+        backend.close()
+
+    print("\n" + "="*80 + "\n")
+    sys.exit(1 if failed else 0)
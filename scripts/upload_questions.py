@@ -0,0 +1,287 @@
+"""
+Upload any questions CSV to interview_questions: batched, concurrent and
+safe to re-run.
+
+upload_coding_questions.py inserts everything in one call, so a single
+duplicate fails the whole upload. This uploader:
+1. Gives every question a stable content_hash key (see question_keys.py)
+   and drops repeats within the file
+2. Sends bounded batches as upserts on content_hash, so re-running it
+   updates rows instead of duplicating them
+3. Runs several batches at once and retries failed batches with
+   exponential backoff
+
+Two backends:
+- Supabase / PostgREST (default). Upserts need UPDATE rights, so use the
+  service_role key: SUPABASE_URL=... SUPABASE_KEY=... python upload_questions.py
+- Postgres directly (--dsn), e.g. a local database with supabase/setup.sql
+  applied, for testing without touching the real project
+
+HOW TO USE:
+1. Run supabase/setup.sql (adds the content_hash column + unique index)
+
+2. Upload:
+   python upload_questions.py collected_questions/final_interview_questions.csv
+   python upload_questions.py collected_questions/source_files/coding_questions.csv --batch-size 200
+   python upload_questions.py collected_questions/final_interview_questions.csv --dsn postgresql://postgres@localhost/postgres
+"""
+
+import os
+import csv
+import sys
+import time
+import random
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from question_keys import DEFAULT_QUESTIONS_FILE, question_hash
+
+# Columns we upload when the CSV has them (created_at and id are left to the database)
+QUESTION_COLUMNS = ['question_text', 'company', 'difficulty', 'question_type', 'topics', 'source',
+                    'answer_text', 'category', 'tags', 'constraints', 'examples', 'hints']
+
+# Some sources name the question column differently
+COLUMN_ALIASES = {'question': 'question_text'}
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RETRIES = 5
+
+def fields_hash(row):
+    """md5 of the question fields, the same as the fields_hash column in supabase/setup.sql."""
+    return hashlib.md5('\x1f'.join(row.get(c) or '' for c in QUESTION_COLUMNS).encode('utf-8')).hexdigest()
+
+def iter_question_rows(f):
+    """Read an open questions CSV: (upload columns, iterator of cleaned rows with content_hash).
+
+    Rows without question text are skipped; duplicates are not.
+    """
+    reader = csv.DictReader(f)
+    columns = {COLUMN_ALIASES.get(name, name): name for name in reader.fieldnames or []}
+    upload_columns = [c for c in QUESTION_COLUMNS if c in columns]
+
+    if 'question_text' not in upload_columns:
+        raise ValueError(f"{getattr(f, 'name', 'CSV')} has no question_text (or question) column")
+
+    def rows():
+        for raw in reader:
+            row = {}
+            for column in upload_columns:
+                value = (raw.get(columns[column]) or '').strip()
+                row[column] = value or None
+
+            if row['question_text']:
+                row['content_hash'] = question_hash(row['question_text'])
+                yield row
+
+    return upload_columns + ['content_hash'], rows()
+
+def read_question_rows(csv_file):
+    """Read a questions CSV into upload rows keyed by content_hash (later duplicates are dropped)."""
+    rows = {}
+    duplicates = 0
+
+    with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+        columns, question_rows = iter_question_rows(f)
+        for row in question_rows:
+            if row['content_hash'] in rows:
+                duplicates += 1
+                continue
+            rows[row['content_hash']] = row
+
+    return list(rows.values()), columns, duplicates
+
+class SupabaseBackend:
+    """Upserts through PostgREST with supabase-py."""
+
+    def __init__(self, url, key):
+        from supabase import create_client
+        self.client = create_client(url, key)
+
+    def upsert(self, rows, columns):
+        self.client.table('interview_questions').upsert(rows, on_conflict='content_hash').execute()
+
+    def fetch_keys(self, after, limit):
+        """One keyset page of (content_hash, fields_hash) with content_hash > after."""
+        query = (self.client.table('interview_questions').select('content_hash,fields_hash')
+                 .not_.is_('content_hash', 'null').order('content_hash').limit(limit))
+        if after is not None:
+            query = query.gt('content_hash', after)
+        return [(row['content_hash'], row['fields_hash']) for row in query.execute().data]
+
+    def delete(self, content_hashes):
+        self.client.table('interview_questions').delete().in_('content_hash', content_hashes).execute()
+
+    def count_unkeyed(self):
+        """Rows without a content_hash (uploaded before the column, not backfilled yet)."""
+        return (self.client.table('interview_questions').select('id', count='exact', head=True)
+                .is_('content_hash', 'null').execute().count)
+
+    def close(self):
+        pass
+
+class PostgresBackend:
+    """Upserts straight into Postgres, one connection per worker thread."""
+
+    def __init__(self, dsn):
+        import psycopg
+        self.psycopg = psycopg
+        self.dsn = dsn
+        self.local = threading.local()
+        self.connections = []
+        self.lock = threading.Lock()
+
+    def connection(self):
+        if getattr(self.local, 'conn', None) is None:
+            self.local.conn = self.psycopg.connect(self.dsn)
+            with self.lock:
+                self.connections.append(self.local.conn)
+        return self.local.conn
+
+    def upsert(self, rows, columns):
+        # One statement per batch, one array per column: the sample rank trigger
+        # (supabase/setup.sql) then fires once and locks the batch's buckets in
+        # sorted order. One INSERT per row locked them in row order, and
+        # concurrent batches deadlocked on each other.
+        updates = ', '.join(f"{c} = EXCLUDED.{c}" for c in columns if c != 'content_hash')
+        sql = (f"INSERT INTO interview_questions ({', '.join(columns)}) "
+               f"SELECT * FROM unnest({', '.join(['%s::text[]'] * len(columns))}) "
+               f"ON CONFLICT (content_hash) DO UPDATE SET {updates}")
+
+        self.run(lambda cur: cur.execute(sql, [[row[c] for row in rows] for c in columns]))
+
+    def fetch_keys(self, after, limit):
+        """One keyset page of (content_hash, fields_hash) with content_hash > after."""
+        def page(cur):
+            cur.execute("SELECT content_hash, fields_hash FROM interview_questions "
+                        "WHERE content_hash > %s ORDER BY content_hash LIMIT %s", (after or '', limit))
+            return cur.fetchall()
+        return self.run(page)
+
+    def delete(self, content_hashes):
+        self.run(lambda cur: cur.execute("DELETE FROM interview_questions WHERE content_hash = ANY(%s)",
+                                         (list(content_hashes),)))
+
+    def count_unkeyed(self):
+        """Rows without a content_hash (uploaded before the column, not backfilled yet)."""
+        def count(cur):
+            cur.execute("SELECT COUNT(*) FROM interview_questions WHERE content_hash IS NULL")
+            return cur.fetchone()[0]
+        return self.run(count)
+
+    def run(self, work):
+        """Run work(cursor) in its own transaction."""
+        conn = self.connection()
+        try:
+            with conn.cursor() as cur:
+                result = work(cur)
+            conn.commit()
+            return result
+        except Exception:
+            conn.rollback()
+            raise
+
+    def close(self):
+        for conn in self.connections:
+            conn.close()
+
+def open_backend(dsn=None):
+    """PostgresBackend for a DSN, otherwise Supabase from SUPABASE_URL / SUPABASE_KEY (None if unset)."""
+    if dsn:
+        return PostgresBackend(dsn)
+
+    url, key = os.environ.get('SUPABASE_URL'), os.environ.get('SUPABASE_KEY')
+    if not url or not key:
+        return None
+    return SupabaseBackend(url, key)
+
+def with_retry(call, retries=DEFAULT_RETRIES, base_delay=0.5):
+    """Run call(), retrying with exponential backoff and jitter. Returns attempts used."""
+    for attempt in range(1, retries + 1):
+        try:
+            call()
+            return attempt
+        except Exception as e:
+            if attempt == retries:
+                raise
+            delay = base_delay * 2 ** (attempt - 1) * (1 + random.random())
+            print(f"    ⚠️  Batch failed ({str(e)[:80]}), retry {attempt}/{retries - 1} in {delay:.1f}s")
+            time.sleep(delay)
+
+def run_batches(send, items, batch_size=DEFAULT_BATCH_SIZE, concurrency=DEFAULT_CONCURRENCY,
+                retries=DEFAULT_RETRIES):
+    """Call send(batch) for bounded batches of items, concurrently, with retries.
+
+    Returns (items sent, items failed, batches retried).
+    """
+    batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+    sent = failed = retried = 0
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {pool.submit(with_retry, lambda batch=batch: send(batch), retries): batch for batch in batches}
+        for future in as_completed(futures):
+            batch = futures[future]
+            try:
+                attempts = future.result()
+                sent += len(batch)
+                retried += attempts > 1
+            except Exception as e:
+                failed += len(batch)
+                print(f"    ✗ Batch of {len(batch)} rows gave up: {str(e)[:200]}")
+
+    return sent, failed, retried
+
+def upload_questions(csv_file, backend, batch_size=DEFAULT_BATCH_SIZE, concurrency=DEFAULT_CONCURRENCY,
+                     retries=DEFAULT_RETRIES):
+    """Upsert every question in csv_file. Returns (rows uploaded, rows failed)."""
+    print(f"📂 Reading questions from {csv_file}...")
+    rows, columns, duplicates = read_question_rows(csv_file)
+    print(f"✅ Parsed {len(rows)} unique questions ({duplicates} duplicates skipped)")
+
+    batch_count = (len(rows) + batch_size - 1) // batch_size
+    print(f"\n🚀 Upserting {batch_count} batches of up to {batch_size} rows, {concurrency} at a time...")
+
+    started = time.perf_counter()
+    uploaded, failed, retried = run_batches(lambda batch: backend.upsert(batch, columns), rows,
+                                            batch_size, concurrency, retries)
+
+    elapsed = time.perf_counter() - started
+    print(f"\n✅ Upserted {uploaded} rows in {elapsed:.2f}s ({uploaded / max(elapsed, 1e-9):.0f} rows/s)")
+    if retried:
+        print(f"   - {retried} batches needed a retry")
+    if failed:
+        print(f"   ❌ {failed} rows failed, re-run to try them again (upserts are idempotent)")
+
+    return uploaded, failed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batched, idempotent upsert of questions into interview_questions")
+    parser.add_argument("csv_file", nargs="?", default=DEFAULT_QUESTIONS_FILE)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES)
+    parser.add_argument("--dsn", help="Upsert straight into this Postgres database instead of Supabase")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.csv_file):
+        print(f"❌ Error: {args.csv_file} not found!")
+        sys.exit(1)
+
+    backend = open_backend(args.dsn)
+    if backend is None:
+        print("❌ Set SUPABASE_URL and SUPABASE_KEY (service_role key), or use --dsn")
+        sys.exit(1)
+
+    print("\n" + "="*80)
+    print("  📤 Batched Question Upsert")
+    print("="*80 + "\n")
+
+    try:
+        _, failed = upload_questions(args.csv_file, backend, args.batch_size, args.concurrency, args.retries)
+    finally:
+        backend.close()
+
+    print("\n" + "="*80 + "\n")
+    sys.exit(1 if failed else 0)
@@ -27,6 +27,93 @@ CREATE INDEX IF NOT EXISTS idx_difficulty ON interview_questions(difficulty);
 CREATE INDEX IF NOT EXISTS idx_question_type ON interview_questions(question_type);
 CREATE INDEX IF NOT EXISTS idx_topics ON interview_questions USING gin(to_tsvector('english', topics));
 
+-- Coding question fields (same columns as backups/complete_setup.sql)
+ALTER TABLE interview_questions ADD COLUMN IF NOT EXISTS category TEXT;
+ALTER TABLE interview_questions ADD COLUMN IF NOT EXISTS tags TEXT;
+ALTER TABLE interview_questions ADD COLUMN IF NOT EXISTS constraints TEXT;
+ALTER TABLE interview_questions ADD COLUMN IF NOT EXISTS examples TEXT;
+ALTER TABLE interview_questions ADD COLUMN IF NOT EXISTS hints TEXT;
+
+-- Stable key for re-runnable uploads: sha256 of the normalized question text,
+-- first 32 hex chars (scripts/question_keys.py). scripts/upload_questions.py
+-- upserts on it.
+ALTER TABLE interview_questions ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+-- question_hash() from scripts/question_keys.py in SQL: lowercase, collapse
+-- whitespace (the characters Python's str.split() splits on) and trim. Same
+-- key for every question in backups/interview_questions_data.csv; only
+-- special case mappings (dotted capital I, final sigma) lower differently.
+CREATE OR REPLACE FUNCTION question_content_hash(p_question_text TEXT)
+RETURNS TEXT AS $$
+    SELECT left(encode(sha256(convert_to(btrim(regexp_replace(
+        lower(p_question_text), '[[:space:]\u0085\u00a0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000\u001c-\u001f]+', ' ', 'g'
+    )), 'UTF8')), 'hex'), 32);
+$$ LANGUAGE sql IMMUTABLE STRICT;
+
+-- Rows uploaded before content_hash existed have none, and the same question
+-- may be in the table more than once. Keep the oldest row of each question,
+-- move the others' answers onto it (deleting a question cascades to its
+-- user_answers), drop the others, then hash the rest. Only after that can
+-- the unique index exist; until then the first hashed upload would insert
+-- every old question again.
+DO $$
+BEGIN
+    CREATE TEMP TABLE question_duplicates AS
+    SELECT id, keep_id
+    FROM (
+        SELECT
+            id,
+            first_value(id) OVER (
+                PARTITION BY COALESCE(content_hash, question_content_hash(question_text))
+                ORDER BY created_at NULLS LAST, id
+            ) AS keep_id
+        FROM interview_questions
+    ) ranked
+    WHERE id <> keep_id;
+
+    IF to_regclass('user_answers') IS NOT NULL THEN  -- Not created yet on a fresh install
+        UPDATE user_answers ua
+        SET question_id = d.keep_id
+        FROM question_duplicates d
+        WHERE ua.question_id = d.id;
+    END IF;
+
+    DELETE FROM interview_questions iq
+    USING question_duplicates d
+    WHERE iq.id = d.id;
+
+    DROP TABLE question_duplicates;
+END;
+$$;
+
+UPDATE interview_questions
+SET content_hash = question_content_hash(question_text)
+WHERE content_hash IS NULL;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_questions_content_hash ON interview_questions(content_hash);
+
+-- md5 of the uploadable fields joined by a unit separator, NULL as ''.
+-- scripts/sync_questions.py computes the same hash locally, so a sync only
+-- downloads (content_hash, fields_hash) pairs to find changed rows.
+ALTER TABLE interview_questions ADD COLUMN IF NOT EXISTS fields_hash TEXT GENERATED ALWAYS AS (md5(
+    coalesce(question_text, '') || E'\x1f' || coalesce(company, '') || E'\x1f' ||
+    coalesce(difficulty, '') || E'\x1f' || coalesce(question_type, '') || E'\x1f' ||
+    coalesce(topics, '') || E'\x1f' || coalesce(source, '') || E'\x1f' ||
+    coalesce(answer_text, '') || E'\x1f' || coalesce(category, '') || E'\x1f' ||
+    coalesce(tags, '') || E'\x1f' || coalesce(constraints, '') || E'\x1f' ||
+    coalesce(examples, '') || E'\x1f' || coalesce(hints, '')
+)) STORED;
+
+-- Item response theory calibration from user_answers
+-- (scripts/calibrate_difficulty.py). irt_difficulty is on the user ability
+-- scale (abilities ~ N(0, 1)): a user of ability theta answers correctly
+-- with probability 1 / (1 + exp(-irt_discrimination * (theta - irt_difficulty))).
+-- Kept apart from the heuristic difficulty label, which uploads and syncs own.
+ALTER TABLE interview_questions ADD COLUMN IF NOT EXISTS irt_difficulty REAL;
+ALTER TABLE interview_questions ADD COLUMN IF NOT EXISTS irt_discrimination REAL;  -- 1 for the 1PL (Rasch) model
+ALTER TABLE interview_questions ADD COLUMN IF NOT EXISTS irt_responses INT;  -- Answers the estimate is based on
+ALTER TABLE interview_questions ADD COLUMN IF NOT EXISTS irt_calibrated_at TIMESTAMPTZ;
+
 -- ============================================
 -- 2. USER PROFILES TABLE
 -- ============================================
@@ -45,9 +132,13 @@ CREATE TABLE IF NOT EXISTS user_profiles (
 -- ============================================
 -- 3. USER ANSWERS TABLE (Performance Tracking)
 -- ============================================
--- Tracks every question a user answers
+-- Tracks every question a user answers. Partitioned by month of created_at:
+-- queries over a recent window only scan the partitions it overlaps, and old
+-- months can be archived by detaching their partition instead of a huge
+-- DELETE (scripts/partition_user_answers.py). Installs that predate the
+-- partitioning keep their plain table until that script's migrate command runs.
 CREATE TABLE IF NOT EXISTS user_answers (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
     user_id UUID,  -- References user_profiles.id (NULL for anonymous users)
     session_id UUID,  -- Groups answers from the same practice session
     question_id UUID REFERENCES interview_questions(id) ON DELETE CASCADE,
@@ -56,17 +147,77 @@ CREATE TABLE IF NOT EXISTS user_answers (
     time_spent_seconds INT,  -- How long did they take?
     hints_used INT DEFAULT 0,  -- How many hints did they use?
     difficulty_at_time TEXT,  -- What difficulty was this question when answered?
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+
+    -- The partition key has to be part of the primary key
+    PRIMARY KEY (id, created_at),
 
     -- Foreign key (optional, for later when we add auth)
     CONSTRAINT fk_user FOREIGN KEY (user_id) REFERENCES user_profiles(id) ON DELETE CASCADE
-);
+) PARTITION BY RANGE (created_at);
+
+-- Create the partition holding p_month (UTC calendar month) if it's missing.
+-- Rows for that month already sitting in the default partition are moved
+-- into it, so a late partition never fails on them. Returns its name.
+CREATE OR REPLACE FUNCTION create_user_answers_partition(p_month DATE, p_parent TEXT DEFAULT 'user_answers')
+RETURNS TEXT AS $$
+DECLARE
+    v_start TIMESTAMP WITH TIME ZONE := date_trunc('month', p_month)::TIMESTAMP AT TIME ZONE 'UTC';
+    v_end TIMESTAMP WITH TIME ZONE := (date_trunc('month', p_month) + INTERVAL '1 month')::TIMESTAMP AT TIME ZONE 'UTC';
+    v_name TEXT := 'user_answers_' || to_char(p_month, '"p"YYYY_MM');
+    v_default REGCLASS;
+    v_stray BOOLEAN := FALSE;
+BEGIN
+    IF to_regclass(v_name) IS NOT NULL THEN
+        RETURN v_name;
+    END IF;
+
+    SELECT partdefid::REGCLASS INTO v_default
+    FROM pg_partitioned_table
+    WHERE partrelid = p_parent::REGCLASS AND partdefid <> 0;
+
+    IF v_default IS NOT NULL THEN
+        EXECUTE format('SELECT EXISTS (SELECT 1 FROM %s WHERE created_at >= %L AND created_at < %L)',
+                       v_default, v_start, v_end)
+        INTO v_stray;
+    END IF;
+
+    IF v_stray THEN
+        EXECUTE format('ALTER TABLE %I DETACH PARTITION %s', p_parent, v_default);
+    END IF;
+
+    EXECUTE format('CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                   v_name, p_parent, v_start, v_end);
+
+    IF v_stray THEN
+        -- Straight into the partitions, so the parent's statement triggers
+        -- don't count these answers a second time
+        EXECUTE format('INSERT INTO %I SELECT * FROM %s WHERE created_at >= %L AND created_at < %L',
+                       v_name, v_default, v_start, v_end);
+        EXECUTE format('DELETE FROM %s WHERE created_at >= %L AND created_at < %L', v_default, v_start, v_end);
+        EXECUTE format('ALTER TABLE %I ATTACH PARTITION %s DEFAULT', p_parent, v_default);
+    END IF;
+
+    RETURN v_name;
+END;
+$$ LANGUAGE plpgsql;
+
+-- This month and the next three, plus a default partition for anything outside them
+DO $$
+BEGIN
+    IF (SELECT relkind FROM pg_class WHERE oid = 'user_answers'::REGCLASS) = 'p' THEN
+        CREATE TABLE IF NOT EXISTS user_answers_default PARTITION OF user_answers DEFAULT;
+        PERFORM create_user_answers_partition((date_trunc('month', NOW() AT TIME ZONE 'UTC') + m * INTERVAL '1 month')::DATE)
+        FROM generate_series(0, 3) m;
+    END IF;
+END $$;
 
 -- Indexes for analytics
 CREATE INDEX IF NOT EXISTS idx_user_answers_user ON user_answers(user_id);
 CREATE INDEX IF NOT EXISTS idx_user_answers_session ON user_answers(session_id);
 CREATE INDEX IF NOT EXISTS idx_user_answers_question ON user_answers(question_id);
 CREATE INDEX IF NOT EXISTS idx_user_answers_created ON user_answers(created_at);
+CREATE INDEX IF NOT EXISTS idx_user_answers_user_created ON user_answers(user_id, created_at);
 
 -- ============================================
 -- 4. MOCK INTERVIEWS TABLE (Phase 3 prep)
@@ -94,26 +245,359 @@ CREATE INDEX IF NOT EXISTS idx_mock_interviews_user ON mock_interviews(user_id);
 CREATE INDEX IF NOT EXISTS idx_mock_interviews_created ON mock_interviews(created_at);
 
 -- ============================================
--- 5. USER PERFORMANCE STATS (Materialized View)
+-- 5. USER PERFORMANCE STATS (Summary Table + View)
 -- ============================================
--- This view calculates aggregate performance stats for each user
-CREATE OR REPLACE VIEW user_performance_stats AS
+-- Running per-user totals, kept up to date by triggers on user_answers, so
+-- reading a user's stats costs one row however many answers they have.
+-- scripts/reconcile_performance_stats.py checks (and repairs) them
+-- against a full recount.
+CREATE TABLE IF NOT EXISTS user_performance_summary (
+    user_id UUID PRIMARY KEY,
+    total_answered BIGINT NOT NULL DEFAULT 0,
+    total_correct BIGINT NOT NULL DEFAULT 0,
+    timed_answers BIGINT NOT NULL DEFAULT 0,  -- Answers with time_spent_seconds (the average's denominator)
+    total_time_seconds BIGINT NOT NULL DEFAULT 0,
+    easy_answered BIGINT NOT NULL DEFAULT 0,
+    easy_correct BIGINT NOT NULL DEFAULT 0,
+    medium_answered BIGINT NOT NULL DEFAULT 0,
+    medium_correct BIGINT NOT NULL DEFAULT 0,
+    hard_answered BIGINT NOT NULL DEFAULT 0,
+    hard_correct BIGINT NOT NULL DEFAULT 0,
+    last_practice_date TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Monthly user_answers partitions that were archived to files and dropped
+-- (scripts/partition_user_answers.py), and what their answers added up to
+-- per user. Stats keep counting archived answers through these totals.
+CREATE TABLE IF NOT EXISTS user_answers_archives (
+    partition_name TEXT PRIMARY KEY,
+    range_start TIMESTAMP WITH TIME ZONE NOT NULL,
+    range_end TIMESTAMP WITH TIME ZONE NOT NULL,
+    row_count BIGINT NOT NULL,
+    archive_file TEXT,  -- NULL until the export has been written
+    sha256 TEXT,  -- Of the uncompressed CSV
+    archived_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS user_answers_archived_totals (
+    user_id UUID PRIMARY KEY,
+    total_answered BIGINT NOT NULL DEFAULT 0,
+    total_correct BIGINT NOT NULL DEFAULT 0,
+    timed_answers BIGINT NOT NULL DEFAULT 0,
+    total_time_seconds BIGINT NOT NULL DEFAULT 0,
+    easy_answered BIGINT NOT NULL DEFAULT 0,
+    easy_correct BIGINT NOT NULL DEFAULT 0,
+    medium_answered BIGINT NOT NULL DEFAULT 0,
+    medium_correct BIGINT NOT NULL DEFAULT 0,
+    hard_answered BIGINT NOT NULL DEFAULT 0,
+    hard_correct BIGINT NOT NULL DEFAULT 0,
+    last_practice_date TIMESTAMP WITH TIME ZONE
+);
+
+-- Per-user totals of all answers, live and archived (the summary's columns, in order)
+-- Used to seed the summary and by the reconciliation job
+DROP VIEW IF EXISTS user_performance_recount;
+CREATE VIEW user_performance_recount AS
 SELECT
     user_id,
-    COUNT(*) as total_questions_answered,
-    SUM(CASE WHEN is_correct THEN 1 ELSE 0 END) as total_correct,
-    ROUND(AVG(CASE WHEN is_correct THEN 1 ELSE 0 END) * 100, 2) as overall_accuracy_percent,
-    AVG(time_spent_seconds) as avg_time_per_question,
-    MAX(created_at) as last_practice_date,
+    SUM(total_answered)::BIGINT as total_answered,
+    SUM(total_correct)::BIGINT as total_correct,
+    SUM(timed_answers)::BIGINT as timed_answers,
+    SUM(total_time_seconds)::BIGINT as total_time_seconds,
+    SUM(easy_answered)::BIGINT as easy_answered,
+    SUM(easy_correct)::BIGINT as easy_correct,
+    SUM(medium_answered)::BIGINT as medium_answered,
+    SUM(medium_correct)::BIGINT as medium_correct,
+    SUM(hard_answered)::BIGINT as hard_answered,
+    SUM(hard_correct)::BIGINT as hard_correct,
+    MAX(last_practice_date) as last_practice_date
+FROM (
+    SELECT
+        user_id,
+        COUNT(*) as total_answered,
+        COUNT(*) FILTER (WHERE is_correct) as total_correct,
+        COUNT(time_spent_seconds) as timed_answers,
+        COALESCE(SUM(time_spent_seconds), 0) as total_time_seconds,
+        COUNT(*) FILTER (WHERE difficulty_at_time = 'easy') as easy_answered,
+        COUNT(*) FILTER (WHERE difficulty_at_time = 'easy' AND is_correct) as easy_correct,
+        COUNT(*) FILTER (WHERE difficulty_at_time = 'medium') as medium_answered,
+        COUNT(*) FILTER (WHERE difficulty_at_time = 'medium' AND is_correct) as medium_correct,
+        COUNT(*) FILTER (WHERE difficulty_at_time = 'hard') as hard_answered,
+        COUNT(*) FILTER (WHERE difficulty_at_time = 'hard' AND is_correct) as hard_correct,
+        MAX(created_at) as last_practice_date
+    FROM user_answers
+    WHERE user_id IS NOT NULL
+    GROUP BY user_id
 
-    -- Performance by difficulty
-    ROUND(AVG(CASE WHEN difficulty_at_time = 'easy' AND is_correct THEN 1.0 ELSE 0.0 END) * 100, 2) as easy_accuracy,
-    ROUND(AVG(CASE WHEN difficulty_at_time = 'medium' AND is_correct THEN 1.0 ELSE 0.0 END) * 100, 2) as medium_accuracy,
-    ROUND(AVG(CASE WHEN difficulty_at_time = 'hard' AND is_correct THEN 1.0 ELSE 0.0 END) * 100, 2) as hard_accuracy
-FROM user_answers
-WHERE user_id IS NOT NULL
+    UNION ALL
+
+    SELECT
+        user_id, total_answered, total_correct, timed_answers, total_time_seconds,
+        easy_answered, easy_correct, medium_answered, medium_correct, hard_answered, hard_correct,
+        last_practice_date
+    FROM user_answers_archived_totals
+) t
 GROUP BY user_id;
 
+-- Statement-level trigger: one summary upsert per user per statement, even
+-- for bulk inserts. Deleted/updated rows are subtracted; their users'
+-- last_practice_date is recomputed since a MAX can't be decremented.
+CREATE OR REPLACE FUNCTION apply_user_answer_changes()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE user_performance_summary s SET
+            total_answered = s.total_answered - d.total_answered,
+            total_correct = s.total_correct - d.total_correct,
+            timed_answers = s.timed_answers - d.timed_answers,
+            total_time_seconds = s.total_time_seconds - d.total_time_seconds,
+            easy_answered = s.easy_answered - d.easy_answered,
+            easy_correct = s.easy_correct - d.easy_correct,
+            medium_answered = s.medium_answered - d.medium_answered,
+            medium_correct = s.medium_correct - d.medium_correct,
+            hard_answered = s.hard_answered - d.hard_answered,
+            hard_correct = s.hard_correct - d.hard_correct,
+            updated_at = NOW()
+        FROM (
+            SELECT
+                user_id,
+                COUNT(*) as total_answered,
+                COUNT(*) FILTER (WHERE is_correct) as total_correct,
+                COUNT(time_spent_seconds) as timed_answers,
+                COALESCE(SUM(time_spent_seconds), 0) as total_time_seconds,
+                COUNT(*) FILTER (WHERE difficulty_at_time = 'easy') as easy_answered,
+                COUNT(*) FILTER (WHERE difficulty_at_time = 'easy' AND is_correct) as easy_correct,
+                COUNT(*) FILTER (WHERE difficulty_at_time = 'medium') as medium_answered,
+                COUNT(*) FILTER (WHERE difficulty_at_time = 'medium' AND is_correct) as medium_correct,
+                COUNT(*) FILTER (WHERE difficulty_at_time = 'hard') as hard_answered,
+                COUNT(*) FILTER (WHERE difficulty_at_time = 'hard' AND is_correct) as hard_correct
+            FROM old_rows
+            WHERE user_id IS NOT NULL
+            GROUP BY user_id
+        ) d
+        WHERE s.user_id = d.user_id;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO user_performance_summary AS s (
+            user_id, total_answered, total_correct, timed_answers, total_time_seconds,
+            easy_answered, easy_correct, medium_answered, medium_correct, hard_answered, hard_correct,
+            last_practice_date
+        )
+        SELECT
+            user_id,
+            COUNT(*),
+            COUNT(*) FILTER (WHERE is_correct),
+            COUNT(time_spent_seconds),
+            COALESCE(SUM(time_spent_seconds), 0),
+            COUNT(*) FILTER (WHERE difficulty_at_time = 'easy'),
+            COUNT(*) FILTER (WHERE difficulty_at_time = 'easy' AND is_correct),
+            COUNT(*) FILTER (WHERE difficulty_at_time = 'medium'),
+            COUNT(*) FILTER (WHERE difficulty_at_time = 'medium' AND is_correct),
+            COUNT(*) FILTER (WHERE difficulty_at_time = 'hard'),
+            COUNT(*) FILTER (WHERE difficulty_at_time = 'hard' AND is_correct),
+            MAX(created_at)
+        FROM new_rows
+        WHERE user_id IS NOT NULL
+        GROUP BY user_id
+        ORDER BY user_id  -- Same lock order in every statement, so concurrent inserts can't deadlock
+        ON CONFLICT (user_id) DO UPDATE SET
+            total_answered = s.total_answered + EXCLUDED.total_answered,
+            total_correct = s.total_correct + EXCLUDED.total_correct,
+            timed_answers = s.timed_answers + EXCLUDED.timed_answers,
+            total_time_seconds = s.total_time_seconds + EXCLUDED.total_time_seconds,
+            easy_answered = s.easy_answered + EXCLUDED.easy_answered,
+            easy_correct = s.easy_correct + EXCLUDED.easy_correct,
+            medium_answered = s.medium_answered + EXCLUDED.medium_answered,
+            medium_correct = s.medium_correct + EXCLUDED.medium_correct,
+            hard_answered = s.hard_answered + EXCLUDED.hard_answered,
+            hard_correct = s.hard_correct + EXCLUDED.hard_correct,
+            last_practice_date = GREATEST(s.last_practice_date, EXCLUDED.last_practice_date),
+            updated_at = NOW();
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        DELETE FROM user_performance_summary
+        WHERE user_id IN (SELECT user_id FROM old_rows) AND total_answered <= 0;
+
+        UPDATE user_performance_summary s
+        SET last_practice_date = GREATEST(
+            (SELECT MAX(ua.created_at) FROM user_answers ua WHERE ua.user_id = s.user_id),
+            (SELECT a.last_practice_date FROM user_answers_archived_totals a WHERE a.user_id = s.user_id)
+        )
+        WHERE s.user_id IN (SELECT user_id FROM old_rows);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;  -- anon inserts answers but can't write the summary
+
+-- Transition tables allow only one event per trigger
+DROP TRIGGER IF EXISTS user_answers_summary_insert ON user_answers;
+CREATE TRIGGER user_answers_summary_insert
+AFTER INSERT ON user_answers
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION apply_user_answer_changes();
+
+DROP TRIGGER IF EXISTS user_answers_summary_update ON user_answers;
+CREATE TRIGGER user_answers_summary_update
+AFTER UPDATE ON user_answers
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION apply_user_answer_changes();
+
+DROP TRIGGER IF EXISTS user_answers_summary_delete ON user_answers;
+CREATE TRIGGER user_answers_summary_delete
+AFTER DELETE ON user_answers
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION apply_user_answer_changes();
+
+-- Seed from answers recorded before the triggers existed
+INSERT INTO user_performance_summary (
+    user_id, total_answered, total_correct, timed_answers, total_time_seconds,
+    easy_answered, easy_correct, medium_answered, medium_correct, hard_answered, hard_correct,
+    last_practice_date
+)
+SELECT * FROM user_performance_recount
+ON CONFLICT (user_id) DO NOTHING;
+
+-- Same columns and values as the old aggregate-on-read view. Note the
+-- per-difficulty accuracies are correct answers at that difficulty as a
+-- share of ALL the user's answers, as before.
+DROP VIEW IF EXISTS user_performance_stats;
+CREATE VIEW user_performance_stats AS
+SELECT
+    user_id,
+    total_answered as total_questions_answered,
+    total_correct,
+    ROUND(total_correct * 100.0 / total_answered, 2) as overall_accuracy_percent,
+    total_time_seconds::NUMERIC / NULLIF(timed_answers, 0) as avg_time_per_question,
+    last_practice_date,
+
+    -- Performance by difficulty
+    ROUND(easy_correct * 100.0 / total_answered, 2) as easy_accuracy,
+    ROUND(medium_correct * 100.0 / total_answered, 2) as medium_accuracy,
+    ROUND(hard_correct * 100.0 / total_answered, 2) as hard_accuracy
+FROM user_performance_summary
+WHERE total_answered > 0;
+
+-- Daily per-user tallies by question type and difficulty (UTC days).
+-- get_recommended_difficulty() sums the last 7 days of these instead of
+-- scanning the user's answers, so its cost doesn't grow with history.
+-- Inserts add to the day's rows. Updates and deletes (including cascades
+-- from deleted questions) recount the affected user-days from user_answers.
+-- question_type is the question's type when the day was last counted: inserts
+-- use its type at that moment, while recounts (and backfill_daily_stats.py)
+-- use the question's current question_type.
+-- The table is seeded from history once triggers are in place (below);
+-- scripts/backfill_daily_stats.py rebuilds it, e.g. after a bulk load with
+-- triggers disabled.
+CREATE TABLE IF NOT EXISTS user_daily_stats (
+    user_id UUID NOT NULL,
+    day DATE NOT NULL,
+    question_type TEXT NOT NULL DEFAULT '',  -- '' if unknown
+    difficulty TEXT NOT NULL DEFAULT '',  -- difficulty_at_time, '' if unknown
+    answered INT NOT NULL DEFAULT 0,
+    correct INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, day, question_type, difficulty)
+);
+
+CREATE OR REPLACE FUNCTION apply_user_answer_daily_changes()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_users UUID[];
+    v_days DATE[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO user_daily_stats AS s (user_id, day, question_type, difficulty, answered, correct)
+        SELECT
+            n.user_id,
+            (n.created_at AT TIME ZONE 'UTC')::DATE,
+            COALESCE(iq.question_type, ''),
+            COALESCE(n.difficulty_at_time, ''),
+            COUNT(*),
+            COUNT(*) FILTER (WHERE n.is_correct)
+        FROM new_rows n
+        LEFT JOIN interview_questions iq ON iq.id = n.question_id
+        WHERE n.user_id IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+        ORDER BY 1, 2, 3, 4  -- Consistent lock order across concurrent inserts
+        ON CONFLICT (user_id, day, question_type, difficulty) DO UPDATE SET
+            answered = s.answered + EXCLUDED.answered,
+            correct = s.correct + EXCLUDED.correct;
+        RETURN NULL;
+    END IF;
+
+    -- UPDATE / DELETE: the old rows' question may be gone already (cascade),
+    -- so recount every touched user-day instead of subtracting
+    SELECT array_agg(user_id), array_agg(day) INTO v_users, v_days
+    FROM (SELECT DISTINCT user_id, (created_at AT TIME ZONE 'UTC')::DATE as day
+          FROM old_rows WHERE user_id IS NOT NULL) o;
+
+    IF TG_OP = 'UPDATE' THEN
+        SELECT v_users || array_agg(user_id), v_days || array_agg(day) INTO v_users, v_days
+        FROM (SELECT DISTINCT user_id, (created_at AT TIME ZONE 'UTC')::DATE as day
+              FROM new_rows WHERE user_id IS NOT NULL) n;
+    END IF;
+
+    DELETE FROM user_daily_stats s
+    USING unnest(v_users, v_days) a(user_id, day)
+    WHERE s.user_id = a.user_id AND s.day = a.day;
+
+    INSERT INTO user_daily_stats (user_id, day, question_type, difficulty, answered, correct)
+    SELECT
+        ua.user_id,
+        a.day,
+        COALESCE(iq.question_type, ''),
+        COALESCE(ua.difficulty_at_time, ''),
+        COUNT(*),
+        COUNT(*) FILTER (WHERE ua.is_correct)
+    FROM (SELECT DISTINCT user_id, day FROM unnest(v_users, v_days) u(user_id, day)) a
+    JOIN user_answers ua
+        ON ua.user_id = a.user_id
+        AND ua.created_at >= a.day::TIMESTAMP AT TIME ZONE 'UTC'
+        AND ua.created_at < (a.day + 1)::TIMESTAMP AT TIME ZONE 'UTC'
+    LEFT JOIN interview_questions iq ON iq.id = ua.question_id
+    GROUP BY 1, 2, 3, 4
+    ORDER BY 1, 2, 3, 4;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+DROP TRIGGER IF EXISTS user_answers_daily_insert ON user_answers;
+CREATE TRIGGER user_answers_daily_insert
+AFTER INSERT ON user_answers
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION apply_user_answer_daily_changes();
+
+DROP TRIGGER IF EXISTS user_answers_daily_update ON user_answers;
+CREATE TRIGGER user_answers_daily_update
+AFTER UPDATE ON user_answers
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION apply_user_answer_daily_changes();
+
+DROP TRIGGER IF EXISTS user_answers_daily_delete ON user_answers;
+CREATE TRIGGER user_answers_daily_delete
+AFTER DELETE ON user_answers
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION apply_user_answer_daily_changes();
+
+-- Seed from answers recorded before the triggers existed
+INSERT INTO user_daily_stats (user_id, day, question_type, difficulty, answered, correct)
+SELECT
+    ua.user_id,
+    (ua.created_at AT TIME ZONE 'UTC')::DATE,
+    COALESCE(iq.question_type, ''),
+    COALESCE(ua.difficulty_at_time, ''),
+    COUNT(*),
+    COUNT(*) FILTER (WHERE ua.is_correct)
+FROM user_answers ua
+LEFT JOIN interview_questions iq ON iq.id = ua.question_id
+WHERE ua.user_id IS NOT NULL
+GROUP BY 1, 2, 3, 4
+ON CONFLICT (user_id, day, question_type, difficulty) DO NOTHING;
+
 -- ============================================
 -- 6. ROW LEVEL SECURITY (RLS) - ENABLE PUBLIC READ
 -- ============================================
@@ -122,8 +606,13 @@ ALTER TABLE interview_questions ENABLE ROW LEVEL SECURITY;
 ALTER TABLE user_profiles ENABLE ROW LEVEL SECURITY;
 ALTER TABLE user_answers ENABLE ROW LEVEL SECURITY;
 ALTER TABLE mock_interviews ENABLE ROW LEVEL SECURITY;
+ALTER TABLE user_performance_summary ENABLE ROW LEVEL SECURITY;  -- Read through user_performance_stats
+ALTER TABLE user_daily_stats ENABLE ROW LEVEL SECURITY;
+ALTER TABLE user_answers_archives ENABLE ROW LEVEL SECURITY;  -- Maintenance bookkeeping, no anon access
+ALTER TABLE user_answers_archived_totals ENABLE ROW LEVEL SECURITY;
 
 -- Allow public read access to interview questions (everyone can see questions)
+DROP POLICY IF EXISTS "Allow public read access to questions" ON interview_questions;
 CREATE POLICY "Allow public read access to questions"
 ON interview_questions
 FOR SELECT
@@ -131,6 +620,7 @@ TO anon
 USING (true);
 
 -- Allow public insert to questions (for scrapers/admin)
+DROP POLICY IF EXISTS "Allow public insert to questions" ON interview_questions;
 CREATE POLICY "Allow public insert to questions"
 ON interview_questions
 FOR INSERT
@@ -138,6 +628,7 @@ TO anon
 WITH CHECK (true);
 
 -- Allow anonymous users to insert their answers (for now)
+DROP POLICY IF EXISTS "Allow anonymous users to insert answers" ON user_answers;
 CREATE POLICY "Allow anonymous users to insert answers"
 ON user_answers
 FOR INSERT
@@ -145,13 +636,23 @@ TO anon
 WITH CHECK (true);
 
 -- Allow anonymous users to read their own answers (by session_id)
+DROP POLICY IF EXISTS "Allow users to read their own answers" ON user_answers;
 CREATE POLICY "Allow users to read their own answers"
 ON user_answers
 FOR SELECT
 TO anon
 USING (true);  -- Later: restrict to user_id = auth.uid()
 
+-- Daily stats are readable like the answers they summarize
+DROP POLICY IF EXISTS "Allow users to read their own daily stats" ON user_daily_stats;
+CREATE POLICY "Allow users to read their own daily stats"
+ON user_daily_stats
+FOR SELECT
+TO anon
+USING (true);  -- Later: restrict to user_id = auth.uid()
+
 -- Allow anonymous users to insert mock interview data
+DROP POLICY IF EXISTS "Allow anonymous users to insert mock interviews" ON mock_interviews;
 CREATE POLICY "Allow anonymous users to insert mock interviews"
 ON mock_interviews
 FOR INSERT
@@ -159,6 +660,7 @@ TO anon
 WITH CHECK (true);
 
 -- Allow users to read their own mock interviews
+DROP POLICY IF EXISTS "Allow users to read their own mock interviews" ON mock_interviews;
 CREATE POLICY "Allow users to read their own mock interviews"
 ON mock_interviews
 FOR SELECT
@@ -176,14 +678,14 @@ DECLARE
     v_accuracy FLOAT;
     v_total_answered INT;
 BEGIN
-    -- Get user's overall accuracy
+    -- Get user's overall accuracy from the daily tallies
     SELECT
-        AVG(CASE WHEN is_correct THEN 1.0 ELSE 0.0 END),
-        COUNT(*)
+        SUM(correct)::FLOAT / NULLIF(SUM(answered), 0),
+        COALESCE(SUM(answered), 0)
     INTO v_accuracy, v_total_answered
-    FROM user_answers
+    FROM user_daily_stats
     WHERE user_id = p_user_id
-        AND created_at > NOW() - INTERVAL '7 days';  -- Last 7 days only
+        AND day > (NOW() AT TIME ZONE 'UTC')::DATE - 7;  -- Last 7 days only (today + 6 previous UTC days)
 
     -- If not enough data, start with easy
     IF v_total_answered < 5 THEN
@@ -213,6 +715,7 @@ BEGIN
     JOIN interview_questions iq ON ua.question_id = iq.id
     WHERE ua.user_id = p_user_id
         AND ua.created_at > NOW() - INTERVAL '14 days'
+        AND ua.created_at <= NOW()  -- Upper bound lets the planner skip future and default partitions
     GROUP BY iq.question_type
     HAVING COUNT(*) >= 3  -- At least 3 questions answered
     ORDER BY accuracy ASC
@@ -221,7 +724,382 @@ END;
 $$ LANGUAGE plpgsql;
 
 -- ============================================
--- 8. VERIFICATION QUERIES
+-- 8. BOOK PASSAGES (documents)
+-- ============================================
+-- Textbook content used to answer questions. Same table as in
+-- backups/complete_setup.sql, plus passage columns written by
+-- scripts/chunk_book_pages.py (one row per passage instead of per page)
+CREATE TABLE IF NOT EXISTS documents (
+    id BIGSERIAL PRIMARY KEY,
+    book_name TEXT NOT NULL,
+    page_number INTEGER,
+    content TEXT NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS chunk_id TEXT;  -- Stable passage ID (NULL for whole-page rows)
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS chunk_index INTEGER;  -- Passage position within its page
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS char_start INTEGER;  -- Passage offsets within the page text
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS char_end INTEGER;
+
+-- Stored tsvector: search_documents() ranks with ts_rank_cd, which would
+-- otherwise re-run to_tsvector(content) on every matching row.
+-- On an existing table, adding the column rewrites the whole table under
+-- an ACCESS EXCLUSIVE lock (search is down until it finishes), so run this
+-- section at a quiet time.
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS content_tsv tsvector
+    GENERATED ALWAYS AS (to_tsvector('english', content)) STORED;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_documents_chunk_id ON documents(chunk_id);
+CREATE INDEX IF NOT EXISTS idx_documents_content_tsv ON documents USING gin(content_tsv);
+-- Replaced by idx_documents_content_tsv: backups/complete_setup.sql's
+-- expression index would be a second GIN index to maintain on every write
+DROP INDEX IF EXISTS idx_documents_content;
+CREATE INDEX IF NOT EXISTS idx_documents_book ON documents(book_name);
+CREATE INDEX IF NOT EXISTS idx_documents_page ON documents(page_number);
+
+ALTER TABLE documents ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Allow public read access to documents" ON documents;
+CREATE POLICY "Allow public read access to documents"
+ON documents
+FOR SELECT
+TO anon
+USING (true);
+
+-- ============================================
+-- 9. PRECOMPUTED QUESTION -> PASSAGE MAP
+-- ============================================
+-- Best book passages for each question, written by
+-- scripts/precompute_question_passages.py. The app looks a question up here
+-- instead of downloading and scoring the whole documents table.
+CREATE TABLE IF NOT EXISTS question_passages (
+    content_hash TEXT PRIMARY KEY,  -- scripts/question_keys.py hash of the question text
+    passage_ids TEXT[] NOT NULL,  -- documents.chunk_id values, best first
+    scores REAL[] NOT NULL,  -- Matching relevance scores
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+ALTER TABLE question_passages ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Allow public read access to question passages" ON question_passages;
+CREATE POLICY "Allow public read access to question passages"
+ON question_passages
+FOR SELECT
+TO anon
+USING (true);
+
+-- ============================================
+-- 10. RANKED DOCUMENT SEARCH (RPC)
+-- ============================================
+-- One round trip instead of one ILIKE scan per keyword: search_documents()
+-- extracts keywords exactly like extractKeywords() in the app, finds matches
+-- through the GIN index on documents.content_tsv and ranks them with ts_rank_cd.
+
+-- Keyword expansions (same entries as semanticExpansions in the app)
+CREATE TABLE IF NOT EXISTS search_expansions (
+    term TEXT PRIMARY KEY,
+    related TEXT[] NOT NULL  -- Related terms/phrases, best first
+);
+
+INSERT INTO search_expansions (term, related) VALUES
+    ('neural', ARRAY['network', 'neuron', 'deep learning', 'backpropagation']),
+    ('gradient', ARRAY['descent', 'backpropagation', 'optimization']),
+    ('decision', ARRAY['tree', 'forest', 'classification']),
+    ('machine', ARRAY['learning', 'ml', 'model', 'algorithm']),
+    ('deep', ARRAY['learning', 'neural', 'network']),
+    ('regression', ARRAY['linear', 'logistic', 'prediction']),
+    ('classification', ARRAY['supervised', 'model', 'predict'])
+ON CONFLICT (term) DO NOTHING;
+
+ALTER TABLE search_expansions ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Allow public read access to search expansions" ON search_expansions;
+CREATE POLICY "Allow public read access to search expansions"
+ON search_expansions
+FOR SELECT
+TO anon
+USING (true);
+
+-- Function: Query words minus stop words, then their expansions (like extractKeywords)
+CREATE OR REPLACE FUNCTION extract_search_keywords(p_query TEXT)
+RETURNS TEXT[] AS $$
+    WITH words AS (
+        SELECT word, position
+        FROM regexp_split_to_table(lower(regexp_replace(p_query, '[?.,!;:]', '', 'g')), '\s+')
+             WITH ORDINALITY AS t(word, position)
+        WHERE length(word) > 2
+          AND word <> ALL (ARRAY[
+              'what', 'is', 'are', 'the', 'a', 'an', 'how', 'why', 'when', 'where',
+              'who', 'which', 'does', 'do', 'can', 'could', 'would', 'should',
+              'tell', 'me', 'about', 'explain', 'describe', 'define', 'of', 'in', 'on'
+          ])
+    ),
+    keywords AS (
+        -- Query words keep their order and come first...
+        SELECT word AS keyword, ARRAY[0, position::INT, 0, 0] AS sort_key
+        FROM words
+        UNION ALL
+        -- ...followed by the words of each expansion phrase
+        SELECT t.term, ARRAY[1, w.position::INT, r.position::INT, t.position::INT]
+        FROM words w
+        JOIN search_expansions e ON e.term = w.word
+        CROSS JOIN LATERAL unnest(e.related) WITH ORDINALITY AS r(phrase, position)
+        CROSS JOIN LATERAL regexp_split_to_table(r.phrase, '\s+') WITH ORDINALITY AS t(term, position)
+        WHERE length(t.term) > 2
+    )
+    SELECT array_agg(keyword ORDER BY sort_key)
+    FROM (
+        SELECT keyword, MIN(sort_key) AS sort_key
+        FROM keywords
+        GROUP BY keyword
+    ) first_seen;
+$$ LANGUAGE sql STABLE;
+
+-- Function: OR of the keywords as an English tsquery (NULL if nothing searchable).
+-- Only the first p_max_keywords count: a pasted paragraph would otherwise
+-- become a huge OR that matches and ranks most of the table.
+CREATE OR REPLACE FUNCTION search_tsquery(p_query TEXT, p_max_keywords INT DEFAULT 16)
+RETURNS tsquery AS $$
+DECLARE
+    v_keyword TEXT;
+    v_part tsquery;
+    v_query tsquery;
+BEGIN
+    FOREACH v_keyword IN ARRAY COALESCE((extract_search_keywords(p_query))[1:p_max_keywords], ARRAY[]::TEXT[]) LOOP
+        v_part := plainto_tsquery('english', v_keyword);
+        IF numnode(v_part) > 0 THEN
+            v_query := CASE WHEN v_query IS NULL THEN v_part ELSE v_query || v_part END;
+        END IF;
+    END LOOP;
+
+    RETURN v_query;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Function: Top passages for a free-text query, best first
+CREATE OR REPLACE FUNCTION search_documents(p_query TEXT, p_limit INT DEFAULT 20)
+RETURNS TABLE(id BIGINT, book_name TEXT, page_number INT, chunk_id TEXT, content TEXT, rank REAL) AS $$
+    SELECT
+        d.id,
+        d.book_name,
+        d.page_number,
+        d.chunk_id,
+        d.content,
+        ts_rank_cd(d.content_tsv, q.query, 1) AS rank  -- 1 = damp long passages
+    FROM search_tsquery(p_query) AS q(query)
+    JOIN documents d ON d.content_tsv @@ q.query
+    ORDER BY rank DESC, d.id
+    LIMIT p_limit;
+$$ LANGUAGE sql STABLE;
+
+-- ============================================
+-- 11. RANDOM QUESTION SAMPLING (RPC)
+-- ============================================
+-- sample_questions() returns uniformly random questions without sorting the
+-- table. Questions are grouped into buckets by (category, question_type,
+-- difficulty), NULL as ''. Within a bucket every question has a
+-- sample_rank, a dense random position 0..size-1, so a draw is: pick a
+-- bucket in proportion to its size, pick a random rank in it, and look that
+-- rank up through idx_questions_sample (one index probe each).
+--
+-- New questions are appended to their bucket by a trigger, and questions
+-- that change bucket get a new rank there. Deleted questions leave a gap
+-- that draws skip. Questions stored before this section existed are ranked
+-- at its end. scripts/reshuffle_questions.py periodically reshuffles the
+-- ranks, which also closes the gaps.
+ALTER TABLE interview_questions ADD COLUMN IF NOT EXISTS sample_rank INT;
+
+CREATE INDEX IF NOT EXISTS idx_questions_sample ON interview_questions (
+    (COALESCE(category, '')), (COALESCE(question_type, '')), (COALESCE(difficulty, '')), sample_rank
+);
+
+CREATE TABLE IF NOT EXISTS question_sample_buckets (
+    category TEXT NOT NULL,  -- '' for NULL, same for the next two
+    question_type TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    size INT NOT NULL,  -- Ranks handed out so far (questions + gaps)
+    PRIMARY KEY (category, question_type, difficulty)
+);
+
+ALTER TABLE question_sample_buckets ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Allow public read access to question sample buckets" ON question_sample_buckets;
+CREATE POLICY "Allow public read access to question sample buckets"
+ON question_sample_buckets
+FOR SELECT
+TO anon
+USING (true);
+
+-- Statement-level, so an upsert only ranks the rows it really inserted
+-- (a BEFORE INSERT row trigger also fires for rows that end up as updates).
+-- Bulk writers should send a batch as one multi-row statement, like
+-- scripts/upload_questions.py: one INSERT per row inside a transaction locks
+-- the buckets in row order, and concurrent batches deadlock.
+CREATE OR REPLACE FUNCTION assign_question_sample_ranks()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_ids UUID[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(id) INTO v_ids FROM new_rows;
+    ELSE
+        -- Most updates keep the bucket, including the rank update below
+        -- (which fires this trigger again)
+        SELECT array_agg(n.id) INTO v_ids
+        FROM new_rows n
+        JOIN old_rows o ON o.id = n.id
+        WHERE (COALESCE(n.category, ''), COALESCE(n.question_type, ''), COALESCE(n.difficulty, ''))
+              IS DISTINCT FROM (COALESCE(o.category, ''), COALESCE(o.question_type, ''), COALESCE(o.difficulty, ''));
+    END IF;
+
+    IF v_ids IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    WITH added AS (
+        SELECT
+            id,
+            COALESCE(category, '') as category,
+            COALESCE(question_type, '') as question_type,
+            COALESCE(difficulty, '') as difficulty
+        FROM new_rows
+        WHERE id = ANY(v_ids)
+    ),
+    numbered AS (
+        SELECT
+            a.*,
+            row_number() OVER (PARTITION BY category, question_type, difficulty ORDER BY random()) as position,
+            COUNT(*) OVER (PARTITION BY category, question_type, difficulty) as added_count
+        FROM added a
+    ),
+    grown AS (
+        INSERT INTO question_sample_buckets AS b (category, question_type, difficulty, size)
+        SELECT category, question_type, difficulty, COUNT(*)
+        FROM added
+        GROUP BY 1, 2, 3
+        ORDER BY 1, 2, 3  -- Same lock order in every statement: send a batch as one statement
+        ON CONFLICT (category, question_type, difficulty) DO UPDATE SET size = b.size + EXCLUDED.size
+        RETURNING b.category, b.question_type, b.difficulty, b.size
+    )
+    UPDATE interview_questions q
+    SET sample_rank = g.size - n.added_count + n.position - 1
+    FROM numbered n
+    JOIN grown g USING (category, question_type, difficulty)
+    WHERE q.id = n.id;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;  -- anon inserts questions but can't write the buckets
+
+-- Transition tables can't be combined with UPDATE OF <columns>
+DROP TRIGGER IF EXISTS interview_questions_sample_insert ON interview_questions;
+CREATE TRIGGER interview_questions_sample_insert
+AFTER INSERT ON interview_questions
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION assign_question_sample_ranks();
+
+DROP TRIGGER IF EXISTS interview_questions_sample_update ON interview_questions;
+CREATE TRIGGER interview_questions_sample_update
+AFTER UPDATE ON interview_questions
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION assign_question_sample_ranks();
+
+-- Function: p_count distinct questions, uniformly at random, from the
+-- buckets matching the filters (NULL = any). Each draw is an index probe;
+-- draws that hit a gap or a question already picked are redrawn, which
+-- keeps the sample uniform. Returns fewer rows if the buckets run out.
+CREATE OR REPLACE FUNCTION sample_questions(
+    p_count INT DEFAULT 5,
+    p_question_type TEXT DEFAULT NULL,
+    p_difficulty TEXT DEFAULT NULL,
+    p_category TEXT DEFAULT NULL
+)
+RETURNS SETOF interview_questions AS $$
+DECLARE
+    v_buckets question_sample_buckets[];
+    v_bucket question_sample_buckets;
+    v_total BIGINT;
+    v_pick BIGINT;
+    v_row interview_questions;
+    v_picked UUID[] := ARRAY[]::UUID[];
+    v_draws INT := 0;
+BEGIN
+    SELECT array_agg(b ORDER BY b.category, b.question_type, b.difficulty), SUM(b.size)
+    INTO v_buckets, v_total
+    FROM question_sample_buckets b
+    WHERE b.size > 0
+      AND (p_question_type IS NULL OR b.question_type = p_question_type)
+      AND (p_difficulty IS NULL OR b.difficulty = p_difficulty)
+      AND (p_category IS NULL OR b.category = p_category);
+
+    IF v_total IS NULL THEN
+        RETURN;
+    END IF;
+
+    -- The draw limit only matters when the buckets hold fewer than p_count questions
+    WHILE cardinality(v_picked) < p_count AND v_draws < p_count * 10 + 100 LOOP
+        v_draws := v_draws + 1;
+
+        v_pick := floor(random() * v_total);
+        FOREACH v_bucket IN ARRAY v_buckets LOOP
+            EXIT WHEN v_pick < v_bucket.size;
+            v_pick := v_pick - v_bucket.size;
+        END LOOP;
+
+        SELECT * INTO v_row
+        FROM interview_questions q
+        WHERE COALESCE(q.category, '') = v_bucket.category
+          AND COALESCE(q.question_type, '') = v_bucket.question_type
+          AND COALESCE(q.difficulty, '') = v_bucket.difficulty
+          AND q.sample_rank = v_pick;
+
+        IF FOUND AND NOT v_row.id = ANY(v_picked) THEN
+            v_picked := v_picked || v_row.id;
+            RETURN NEXT v_row;
+        END IF;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql VOLATILE;
+
+-- Seed ranks for questions stored before sample_rank existed: append them
+-- to their buckets in random order, like the insert trigger does. Ranked
+-- questions are left alone, so re-running this is a no-op.
+-- scripts/reshuffle_questions.py can deal a fresh permutation later.
+WITH unranked AS (
+    SELECT
+        id,
+        COALESCE(category, '') as category,
+        COALESCE(question_type, '') as question_type,
+        COALESCE(difficulty, '') as difficulty,
+        row_number() OVER (
+            PARTITION BY COALESCE(category, ''), COALESCE(question_type, ''), COALESCE(difficulty, '')
+            ORDER BY random()
+        ) as position
+    FROM interview_questions
+    WHERE sample_rank IS NULL
+),
+added AS (
+    SELECT category, question_type, difficulty, COUNT(*) as added_count
+    FROM unranked
+    GROUP BY 1, 2, 3
+),
+grown AS (
+    INSERT INTO question_sample_buckets AS b (category, question_type, difficulty, size)
+    SELECT category, question_type, difficulty, added_count
+    FROM added
+    ON CONFLICT (category, question_type, difficulty) DO UPDATE SET size = b.size + EXCLUDED.size
+    RETURNING b.category, b.question_type, b.difficulty, b.size
+)
+UPDATE interview_questions q
+SET sample_rank = g.size - a.added_count + u.position - 1
+FROM unranked u
+JOIN added a USING (category, question_type, difficulty)
+JOIN grown g USING (category, question_type, difficulty)
+WHERE q.id = u.id;
+
+-- ============================================
+-- 12. VERIFICATION QUERIES
 -- ============================================
 -- Run these after uploading data to verify everything works
 
@@ -0,0 +1,43 @@
+"""
+Checks Table.like in scripts/question_api_server.py against the plain regex scan.
+
+HOW TO USE:
+   pip install numpy pytest
+   python -m pytest -q tests
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from question_api_server import Table, like_regex, write_table
+
+VALUES = ['abXab', 'ab', 'abab', 'aba', 'aa', 'a', 'xaba', 'abax', 'Random Forest',
+          'random forests', 'forest', 'A/B test', 'Ab', None, '']
+
+PATTERNS = ['ab%ab', 'a_a', 'ab', '%ab', 'ab%', '%ab%', '*forest*', 'random%', '_b%',
+            '%_', '%', 'a%a%a', 'abXab', '%ba', 'a_%b', '%st']
+
+@pytest.fixture(scope='module')
+def table(tmp_path_factory):
+    index_dir = str(tmp_path_factory.mktemp('index'))
+    meta = write_table(index_dir, 'values', ['value'], {}, [{'value': v} for v in VALUES])
+    return Table(index_dir, 'values', meta)
+
+@pytest.mark.parametrize('ignore_case', [False, True])
+@pytest.mark.parametrize('pattern', PATTERNS)
+def test_like_matches_regex_scan(table, pattern, ignore_case):
+    expected = table.scan('value', like_regex(pattern, ignore_case))
+    assert np.array_equal(table.like('value', pattern, ignore_case), expected)
+
+def rows(table, bits):
+    return [table.value('value', i) for i in np.flatnonzero(np.unpackbits(bits.view(np.uint8), bitorder='little')[:table.size])]
+
+def test_repeated_literal_is_anchored_by_position(table):
+    # The longest piece equals the first and last pieces, but only one end is anchored
+    assert rows(table, table.like('value', 'ab%ab', False)) == ['abXab', 'abab']
+    assert rows(table, table.like('value', 'a_a', False)) == ['aba']